@@ -1,6 +1,11 @@
+import math
+import tkinter as tk
+from typing import Callable, Iterable
 from graphics import color_rgb
-from graphics import Rectangle, GraphWin, Point, Image
+from graphics import GraphWin, Point, Image
 from Minesweeper.MinesweeperBoard import Tile, MinesweeperBoard
+from Minesweeper.MinesweeperTile import MinesweeperTile
+from Renderer import Renderer
 
 # the height and width of the window to draw onto
 WINDOW_WIDTH = 600
@@ -16,475 +21,739 @@ ODD_TILE_COLOR = color_rgb(238, 217, 196)
 REVEALED_TILE_COLOR = color_rgb(204, 204, 204)
 BACKGROUND_COLOR = color_rgb(100, 100, 100)
 
-# create the minesweeper window and make the background grey
-win = GraphWin("Minesweeper", WINDOW_WIDTH, WINDOW_HEIGHT, False)
-win.setBackground(BACKGROUND_COLOR)
+# the smallest and biggest tiles can be drawn on the window, in pixels
+# (boards too big to fit in the window at the smallest size can be panned around)
+MIN_TILE_SIZE = 16
+MAX_TILE_SIZE = 100
 
+# how much bigger tiles get with each step of the mouse wheel
+ZOOM_STEP = 1.25
 
-def create_tile_board(minesweeper_board: MinesweeperBoard) -> list:
-    """
-    Create a board of square tiles for drawing onto the window based on the given minesweeper board.
+# how many pixels the arrow keys pan the board by
+PAN_STEP = 50
 
-    Parameters
-    ----------
-    minesweeper_board : MinesweeperBoard
-        The minesweeper board to draw.
+# colors of tiles on the overview image the board is drawn as when zoomed out past MIN_TILE_SIZE
+# (revealed tiles get darker the further their value is from 0)
+OVERVIEW_FLAG_COLOR = color_rgb(220, 60, 60)
+OVERVIEW_NEGATIVE_FLAG_COLOR = color_rgb(60, 90, 220)
+OVERVIEW_MINE_COLOR = color_rgb(0, 0, 0)
+OVERVIEW_VALUE_COLORS = [color_rgb(204 - 16 * i, 204 - 16 * i, 204 - 8 * i) for i in range(9)]
 
-    Returns
-    -------
-    list
-        The 2D array of tiles.
-    """
+# the tag given to every canvas item belonging to the board, so they can all be moved or deleted at once
+BOARD_TAG = "board"
 
-    tile_size = min(
-        (WINDOW_HEIGHT - WINDOW_BORDERS) / minesweeper_board.board_height,
-        (WINDOW_WIDTH - WINDOW_BORDERS) / minesweeper_board.board_width,
-    )
-
-    # create a 2D array of buttons representing tiles on the chess board
-    button_board = []
-    is_dark_tile = False
-    y_coord = (WINDOW_HEIGHT - tile_size * minesweeper_board.board_height) / 2
-
-    for i in range(minesweeper_board.board_height):
-        x_coord = (WINDOW_WIDTH - tile_size * minesweeper_board.board_width) / 2
-        button_board.append([])
-
-        for j in range(minesweeper_board.board_width):
-            button_board[i].append(
-                Rectangle(
-                    Point(x_coord, y_coord + tile_size),
-                    Point(x_coord + tile_size, y_coord),
-                )
-            )
+# the minesweeper window, which isn't created until something is drawn onto it
+win = None
 
-            if minesweeper_board.board[i][j].revealed:
-                button_board[i][j].setFill(REVEALED_TILE_COLOR)
-            elif is_dark_tile:
-                button_board[i][j].setFill(ODD_TILE_COLOR)
-            else:
-                button_board[i][j].setFill(EVEN_TILE_COLOR)
-            is_dark_tile = not is_dark_tile
+# every tile value image composed so far, keyed by the glyphs it's made of (which also pins down the tile size)
+value_image_atlas: dict[tuple, tk.PhotoImage] = {}
+
+
+def get_window() -> GraphWin:
+    """
+    Get the minesweeper window, creating it and making the background grey the first time it's needed.
 
-            x_coord += tile_size
-        y_coord += tile_size
-        is_dark_tile = not is_dark_tile
+    Returns
+    -------
+    GraphWin
+        The minesweeper window.
+    """
 
-    return button_board
+    global win
+    if win is None:
+        win = GraphWin("Minesweeper", WINDOW_WIDTH, WINDOW_HEIGHT, False)
+        win.setBackground(BACKGROUND_COLOR)
+    return win
 
 
-def get_value_images(
-    row: int,
-    col: int,
-    tile_size: float,
-    tile_board: list,
-    minesweeper_board: MinesweeperBoard,
-):
+def get_value_glyphs(tile: MinesweeperTile, tile_size: float) -> list[tuple[str, float, float, int, int]]:
     """
-    Get the image(s) corresponding to the tile value at the given row and column.
+    Get the image(s) needed to draw the given tile's value, and where to draw them relative to the tile's center.
 
     Parameters
     ----------
-    row : int
-        The row where the value is located.
-
-    col : int
-        The column where the value is located.
+    tile : MinesweeperTile
+        The tile whose value is being drawn.
 
     tile_size : float
         The size of the tile on the window that the value will be drawn on.
 
-    tile_board : list
-        The 2D array of squares representing the tiles on the minesweeper board.
-
-    minesweeper_board : MinesweeperBoard
-        The minesweeper board to draw the values from.
-
     Returns
     -------
-    Image
-        The value image corresponding to the tile value at the given row and column.
+    list[tuple[str, float, float, int, int]]
+        The glyphs to draw, each in the form (image file, x offset, y offset, width, height).
+        An empty list means nothing is drawn on the tile.
     """
 
     # if the tile is not revealed, check if there is a flag planted on it
-    if not minesweeper_board.board[row][col].revealed:
+    if not tile.revealed:
 
         # if a positive flag is planted, draw it
-        if minesweeper_board.board[row][col].flag_planted == 1:
-            return [
-                Image(
-                    Point(
-                        (tile_board[row][col].getP1().getX() + tile_board[row][col].getP2().getX()) / 2,
-                        (tile_board[row][col].getP1().getY() + tile_board[row][col].getP2().getY()) / 2,
-                    ),
-                    "images/flag.png",
-                    int(tile_size / 2),
-                    int(tile_size / 2),
-                )
-            ]
-
-        elif minesweeper_board.board[row][col].flag_planted == 2:
-            return [
-                Image(
-                    Point(
-                        (tile_board[row][col].getP1().getX() + tile_board[row][col].getP2().getX()) / 2,
-                        (tile_board[row][col].getP1().getY() + tile_board[row][col].getP2().getY()) / 2,
-                    ),
-                    "images/negative_flag.png",
-                    int(tile_size / 2),
-                    int(tile_size / 2),
-                )
-            ]
+        if tile.flag_planted == 1:
+            return [("images/flag.png", 0, 0, int(tile_size / 2), int(tile_size / 2))]
+
+        # if a negative flag is planted, draw it
+        elif tile.flag_planted == 2:
+            return [("images/negative_flag.png", 0, 0, int(tile_size / 2), int(tile_size / 2))]
 
         # else, draw nothing
-        else:
-            return [
-                Image(
-                    Point(
-                        (tile_board[row][col].getP1().getX() + tile_board[row][col].getP2().getX()) / 2,
-                        (tile_board[row][col].getP1().getY() + tile_board[row][col].getP2().getY()) / 2,
-                    ),
-                    "images/empty.png",
-                    int(tile_size / 2),
-                    int(tile_size / 2),
-                )
-            ]
+        return []
 
     # if the tile is empty, draw nothing
-    if minesweeper_board.board[row][col].type == Tile.EMPTY:
-        return [
-            Image(
-                Point(
-                    (tile_board[row][col].getP1().getX() + tile_board[row][col].getP2().getX()) / 2,
-                    (tile_board[row][col].getP1().getY() + tile_board[row][col].getP2().getY()) / 2,
-                ),
-                "images/empty.png",
-                int(tile_size / 2),
-                int(tile_size / 2),
-            )
-        ]
+    if tile.type == Tile.EMPTY:
+        return []
 
     # if the tile is a mine, draw a mine
-    if minesweeper_board.board[row][col].type == Tile.MINE:
-        return [
-            Image(
-                Point(
-                    (tile_board[row][col].getP1().getX() + tile_board[row][col].getP2().getX()) / 2,
-                    (tile_board[row][col].getP1().getY() + tile_board[row][col].getP2().getY()) / 2,
-                ),
-                "images/bomb.png",
-                int(tile_size / 2),
-                int(tile_size / 2),
-            )
-        ]
+    if tile.type == Tile.MINE:
+        return [("images/bomb.png", 0, 0, int(tile_size / 2), int(tile_size / 2))]
 
     # if the tile is a negative mine, draw a negative mine
-    if minesweeper_board.board[row][col].type == Tile.NEGATIVE_MINE:
-        return [
-            Image(
-                Point(
-                    (tile_board[row][col].getP1().getX() + tile_board[row][col].getP2().getX()) / 2,
-                    (tile_board[row][col].getP1().getY() + tile_board[row][col].getP2().getY()) / 2,
-                ),
-                "images/negative_bomb.png",
-                int(tile_size / 2),
-                int(tile_size / 2),
-            )
-        ]
+    if tile.type == Tile.NEGATIVE_MINE:
+        return [("images/negative_bomb.png", 0, 0, int(tile_size / 2), int(tile_size / 2))]
 
     # if the tile's value is an integer, draw that number
-    if isinstance(minesweeper_board.board[row][col].value, int):
+    if isinstance(tile.value, int):
 
         # if it's positive, just draw the number
-        if minesweeper_board.board[row][col].value >= 0:
-            image_name = "images/" + str(minesweeper_board.board[row][col].value) + ".png"
-            return [
-                Image(
-                    Point(
-                        (tile_board[row][col].getP1().getX() + tile_board[row][col].getP2().getX()) / 2,
-                        (tile_board[row][col].getP1().getY() + tile_board[row][col].getP2().getY()) / 2,
-                    ),
-                    image_name,
-                    int(tile_size / 2),
-                    int(tile_size / 2),
-                )
-            ]
+        if tile.value >= 0:
+            return [("images/" + str(tile.value) + ".png", 0, 0, int(tile_size / 2), int(tile_size / 2))]
 
         # if it's negative, draw a minus sign before the number
-        else:
-            images = []
-
-            images.append(
-                Image(
-                    Point(
-                        (tile_board[row][col].getP1().getX() + tile_board[row][col].getP2().getX()) / 2 - tile_size / 4,
-                        (tile_board[row][col].getP1().getY() + tile_board[row][col].getP2().getY()) / 2,
-                    ),
-                    "images/minus.png",
-                    int(tile_size / 6),
-                    int(tile_size / 3),
-                )
-            )
-
-            image_name = "images/" + str(abs(minesweeper_board.board[row][col].value)) + ".png"
-            images.append(
-                Image(
-                    Point(
-                        (tile_board[row][col].getP1().getX() + tile_board[row][col].getP2().getX()) / 2 + tile_size / 8,
-                        (tile_board[row][col].getP1().getY() + tile_board[row][col].getP2().getY()) / 2,
-                    ),
-                    image_name,
-                    int(tile_size / 3),
-                    int(tile_size / 2),
-                )
-            )
+        return [
+            ("images/minus.png", -tile_size / 4, 0, int(tile_size / 6), int(tile_size / 3)),
+            ("images/" + str(abs(tile.value)) + ".png", tile_size / 8, 0, int(tile_size / 3), int(tile_size / 2)),
+        ]
 
     # else, we can assume the value is a float and draw it to one decimal place
+    if tile.value > 0:
+        value_string = str(round(tile.value, 3)).split(".")
     else:
-        images = []
-
-        # if it's positive, just draw the decimal
-        if minesweeper_board.board[row][col].value > 0:
-            value_string = str(round(minesweeper_board.board[row][col].value, 3)).split(".")
-
-            # add the value before the decimal
-            image_name = "images/" + str(value_string[0]) + ".png"
-            images.append(
-                Image(
-                    Point(
-                        (tile_board[row][col].getP1().getX() + tile_board[row][col].getP2().getX()) / 2 - tile_size / 4,
-                        (tile_board[row][col].getP1().getY() + tile_board[row][col].getP2().getY()) / 2,
-                    ),
-                    image_name,
-                    int(tile_size / 4),
-                    int(tile_size / 2),
-                )
-            )
+        value_string = str(round(tile.value, 3))[1:].split(".")
 
-            # add the decimal point
-            images.append(
-                Image(
-                    Point(
-                        (tile_board[row][col].getP1().getX() + tile_board[row][col].getP2().getX()) / 2,
-                        (tile_board[row][col].getP1().getY() + tile_board[row][col].getP2().getY()) / 2 + tile_size / 6,
-                    ),
-                    "images/dot.png",
-                    int(tile_size / 6),
-                    int(tile_size / 6),
-                )
-            )
+    return [
+        # the value before the decimal
+        ("images/" + value_string[0] + ".png", -tile_size / 4, 0, int(tile_size / 4), int(tile_size / 2)),
+        # the decimal point
+        ("images/dot.png", 0, tile_size / 6, int(tile_size / 6), int(tile_size / 6)),
+        # the value after the decimal
+        ("images/" + value_string[1][0] + ".png", tile_size / 4, 0, int(tile_size / 4), int(tile_size / 2)),
+    ]
 
-            # add the value after the decimal
-            image_name = "images/" + str(value_string[1][0]) + ".png"
-            images.append(
-                Image(
-                    Point(
-                        (tile_board[row][col].getP1().getX() + tile_board[row][col].getP2().getX()) / 2 + tile_size / 4,
-                        (tile_board[row][col].getP1().getY() + tile_board[row][col].getP2().getY()) / 2,
-                    ),
-                    image_name,
-                    int(tile_size / 4),
-                    int(tile_size / 2),
-                )
-            )
 
-        # if it's negative, draw a minus sign before the decimal
-        else:
-            value_string = str(round(minesweeper_board.board[row][col].value, 3))[1:].split(".")
-
-            # add the value before the decimal
-            image_name = "images/" + str(value_string[0]) + ".png"
-            images.append(
-                Image(
-                    Point(
-                        (tile_board[row][col].getP1().getX() + tile_board[row][col].getP2().getX()) / 2 - tile_size / 4,
-                        (tile_board[row][col].getP1().getY() + tile_board[row][col].getP2().getY()) / 2,
-                    ),
-                    image_name,
-                    int(tile_size / 4),
-                    int(tile_size / 2),
-                )
-            )
-
-            # add the decimal point
-            images.append(
-                Image(
-                    Point(
-                        (tile_board[row][col].getP1().getX() + tile_board[row][col].getP2().getX()) / 2,
-                        (tile_board[row][col].getP1().getY() + tile_board[row][col].getP2().getY()) / 2 + tile_size / 6,
-                    ),
-                    "images/dot.png",
-                    int(tile_size / 6),
-                    int(tile_size / 6),
-                )
-            )
-
-            # add the value after the decimal
-            image_name = "images/" + str(value_string[1][0]) + ".png"
-            images.append(
-                Image(
-                    Point(
-                        (tile_board[row][col].getP1().getX() + tile_board[row][col].getP2().getX()) / 2 + tile_size / 4,
-                        (tile_board[row][col].getP1().getY() + tile_board[row][col].getP2().getY()) / 2,
-                    ),
-                    image_name,
-                    int(tile_size / 4),
-                    int(tile_size / 2),
-                )
-            )
-
-    return images
-
-
-def create_value_board(tile_board: list, minesweeper_board: MinesweeperBoard) -> list:
+def get_value_image(tile: MinesweeperTile, tile_size: float) -> tk.PhotoImage | None:
     """
-    Create a board of images representing tile values for drawing onto the window based on the given minesweeper board.
+    Get a single image of the given tile's value, with all of its glyphs already composed onto it.
+    Each distinct value is only composed once per tile size and is then shared by every tile showing it.
 
     Parameters
     ----------
-    tile_board : list
-        The 2D array of squares representing the tiles on the minesweeper board.
+    tile : MinesweeperTile
+        The tile whose value is being drawn.
 
-    minesweeper_board : MinesweeperBoard
-        The minesweeper board to draw the values from.
+    tile_size : float
+        The size of the tile on the window that the value will be drawn on.
 
     Returns
     -------
-    list
-        The 2D array of images.
+    tk.PhotoImage | None
+        A tile-sized image of the value to draw centered on the tile, or None if nothing is drawn on the tile.
     """
 
-    tile_size = min(
-        (WINDOW_HEIGHT - WINDOW_BORDERS) / minesweeper_board.board_height,
-        (WINDOW_WIDTH - WINDOW_BORDERS) / minesweeper_board.board_width,
-    )
-
-    # create a 2D array of image lists representing values on the board
-    value_board = []
-    for i in range(len(minesweeper_board.board)):
-        value_board.append([])
-        for j in range(len(minesweeper_board.board[i])):
-            value_board[i].append(get_value_images(i, j, tile_size, tile_board, minesweeper_board))
+    glyphs = tuple(get_value_glyphs(tile, tile_size))
+    if not glyphs:
+        return None
+
+    if glyphs not in value_image_atlas:
+        image_size = int(tile_size)
+        value_image = tk.PhotoImage(master=get_window(), width=image_size, height=image_size)
+
+        # copy each glyph onto the (transparent) value image so that it's centered at its offset from the middle
+        for image_file, x_offset, y_offset, width, height in glyphs:
+            glyph_image = Image.getPhotoImage(image_file, width, height)
+            value_image.tk.call(
+                value_image,
+                "copy",
+                glyph_image,
+                "-to",
+                int(image_size / 2 + x_offset - glyph_image.width() / 2),
+                int(image_size / 2 + y_offset - glyph_image.height() / 2),
+            )
 
-    return value_board
+        value_image_atlas[glyphs] = value_image
 
+    return value_image_atlas[glyphs]
 
-def draw_tile_board(tile_board: list):
-    """
-    Draw the given board of rectangular tiles onto the window.
 
-    Parameters
-    ----------
-    tile_board : list
-        The board of tiles to draw onto the window.
+class BoardRenderer(Renderer):
     """
+    Draws the part of a minesweeper board that can be seen through the window onto the window, and passes on the
+    player's clicks on its tiles.
 
-    for row in tile_board:
-        for button in row:
-            button.draw(win)
+    Only tiles that are at least partly inside the window get canvas items (one rectangle and one image item each).
+    When the board is panned or zoomed, the items of tiles that leave the window are hidden and reused for the tiles
+    that enter it, and changed tiles are redrawn by reconfiguring their items in place, so the number of items on the
+    canvas never grows past what fits in the window, no matter how big the board is.
 
+    Boards too big to fit in the window at `MIN_TILE_SIZE` can be zoomed out further, into a level of detail where
+    tiles are only a few pixels wide. At that level no tile items are drawn at all: the whole window is a single
+    image with one colored block of pixels per tile, and only the pixel rows showing changed tiles are repainted.
 
-def draw_value_board(value_board: list):
-    """
-    Draw the given board of tile values onto the window.
+    The board is panned with the arrow keys or by dragging it with the middle mouse button, and zoomed with the
+    mouse wheel.
 
-    Parameters
+    Attributes
     ----------
-    value_board: list
-        The board of tile values to draw on top of the tiles.
-    """
-
-    for row in value_board:
-        for value in row:
-            for image in value:
-                image.draw(win)
-
-
-def update_tile_board(tile_board: list, minesweeper_board: MinesweeperBoard):
-    """
-    Redraw all tiles that changed last move.
-
-    Parameters
-    ----------
-    tile_board : list
-        The board of tiles to redraw.
+    minesweeper_board : MinesweeperBoard
+        The minesweeper board to draw.
 
-    minesweeper_board : list
-        The minesweeper board to draw from.
-    """
+    click_handler : Callable[[int, int, str], None], optional
+        Called with the row and column of the clicked tile and the mouse button ("left" or "right") whenever the player
+        clicks a tile. Clicks are mapped to tiles as soon as they happen, so panning or zooming afterwards can't change
+        which tile they land on.
 
-    for i in range(minesweeper_board.board_height):
-        for j in range(minesweeper_board.board_width):
+    win : GraphWin
+        The window the board is drawn onto.
 
-            # if the tile was updated last move, redraw the tile
-            if minesweeper_board.board[i][j].changed_last_move and minesweeper_board.board[i][j].revealed:
-                tile_board[i][j].undraw()
-                tile_board[i][j].setFill(REVEALED_TILE_COLOR)
-                tile_board[i][j].draw(win)
+    base_tile_size : float
+        The width and height of a single tile at zoom level 0, where the board starts.
+        This is the size that fits the whole board in the window, unless that would be smaller than `MIN_TILE_SIZE`.
 
+    zoom_level : int
+        How many zoom steps the board is zoomed in from `base_tile_size`.
+        Negative zoom levels are drawn as a single image instead of with tile items.
 
-def update_value_board(value_board: list, tile_board: list, minesweeper_board: MinesweeperBoard):
-    """
-    Redraw all tile values on tiles that changed last move.
+    min_zoom_level : int
+        The most zoom steps the board can be zoomed out, which is just far enough to fit the whole board in the window.
 
-    Parameters
-    ----------
-    value_board : list
-        The board of tile values to redraw.
+    max_zoom_level : int
+        The most zoom steps the board can be zoomed in before tiles would be bigger than `MAX_TILE_SIZE`.
 
-    tile_board : list
-        The 2D array of squares representing the tiles on the minesweeper board.
-
-    minesweeper_board : list
-        The minesweeper board to draw from.
-    """
+    tile_size : float
+        The width and height of a single tile on the window.
 
-    tile_size = min(
-        (WINDOW_HEIGHT - WINDOW_BORDERS) / minesweeper_board.board_height,
-        (WINDOW_WIDTH - WINDOW_BORDERS) / minesweeper_board.board_width,
-    )
+    origin_x : float
+        The x coordinate of the board's top left corner on the window.
 
-    for i in range(minesweeper_board.board_height):
-        for j in range(minesweeper_board.board_width):
+    origin_y : float
+        The y coordinate of the board's top left corner on the window.
 
-            # if the tile was updated last move, redraw the tile value
-            if minesweeper_board.board[i][j].changed_last_move:
-                for image in value_board[i][j]:
-                    image.undraw()
+    tile_items : dict[tuple[int, int], tuple[int, int]]
+        The canvas item ids of each tile drawn on the window, in the form (rectangle, value image),
+        keyed by the tile's (row, col).
 
-                value_board[i][j] = get_value_images(i, j, tile_size, tile_board, minesweeper_board)
+    free_items : list[tuple[int, int]]
+        Hidden canvas items that aren't drawing any tile and are waiting to be reused, in the form (rectangle, value
+        image).
 
-                for image in value_board[i][j]:
-                    image.draw(win)
+    drag_point : tuple[int, int] | None
+        Where the board was last dragged to with the middle mouse button, or None if it isn't being dragged.
 
+    overview_image : tk.PhotoImage | None
+        The window-sized image the board is painted onto at negative zoom levels, or None if it can't zoom out that far.
 
-def get_clicked_tile_coords(point: Point, minesweeper_board: MinesweeperBoard):
+    overview_item : int | None
+        The canvas item id of the overview image, or None if the board can't zoom out that far.
     """
-    Find the coordinates of the tile that was clicked, based on the tile size.
-
-    Parameters
-    ----------
-    point : Point
-        The mouse point to check the position of.
 
-    minesweeper_board : MinesweeperBoard
-        The game object representation of the board holding the tile information.
-
-    Returns
-    -------
-    tuple
-        The row and column of the tile that was clicked, in the form (row, col).
-
-    Notes
-    -----
-    The row and column values are calculated by taking the point's x and y coordinates, subtracting the window borders, and dividing by the tile size.
-    """
+    def __init__(self, minesweeper_board: MinesweeperBoard, click_handler: Callable[[int, int, str], None] = None):
+        super().__init__(minesweeper_board, click_handler)
+        self.win = get_window()
+
+        fitted_tile_size = min(
+            (WINDOW_HEIGHT - WINDOW_BORDERS) / minesweeper_board.board_height,
+            (WINDOW_WIDTH - WINDOW_BORDERS) / minesweeper_board.board_width,
+        )
+        self.base_tile_size = min(max(fitted_tile_size, MIN_TILE_SIZE), MAX_TILE_SIZE)
+        self.zoom_level = 0
+        self.min_zoom_level = min(0, math.floor(math.log(fitted_tile_size / self.base_tile_size) / math.log(ZOOM_STEP)))
+        self.max_zoom_level = int(math.log(MAX_TILE_SIZE / self.base_tile_size) / math.log(ZOOM_STEP))
+        self.tile_size = self.base_tile_size
+
+        # start with the board centered in the window
+        self.origin_x = (WINDOW_WIDTH - self.tile_size * minesweeper_board.board_width) / 2
+        self.origin_y = (WINDOW_HEIGHT - self.tile_size * minesweeper_board.board_height) / 2
+
+        self.tile_items = {}
+        self.free_items = []
+        self.drag_point = None
+        self.overview_image = None
+        self.overview_item = None
+
+    def get_tile_center(self, row: int, col: int) -> tuple[float, float]:
+        """
+        Find the center of the tile at the given row and column on the window.
+
+        Parameters
+        ----------
+        row : int
+            The row of the tile.
+
+        col : int
+            The column of the tile.
+
+        Returns
+        -------
+        tuple[float, float]
+            The x and y coordinates of the tile's center.
+        """
+
+        return (
+            self.origin_x + self.tile_size * col + self.tile_size / 2,
+            self.origin_y + self.tile_size * row + self.tile_size / 2,
+        )
+
+    def get_tile_color(self, row: int, col: int) -> str:
+        """
+        Get the color the tile at the given row and column should be filled with.
+
+        Parameters
+        ----------
+        row : int
+            The row of the tile.
+
+        col : int
+            The column of the tile.
+
+        Returns
+        -------
+        str
+            The tile's fill color.
+        """
+
+        if self.minesweeper_board.board[row][col].revealed:
+            return REVEALED_TILE_COLOR
+        elif (row + col) % 2:
+            return ODD_TILE_COLOR
+        return EVEN_TILE_COLOR
+
+    def get_visible_tiles(self) -> set[tuple[int, int]]:
+        """
+        Find every tile that is at least partly inside the window.
+
+        Returns
+        -------
+        set[tuple[int, int]]
+            The (row, col) coordinates of the visible tiles.
+        """
+
+        first_row = max(0, int(-self.origin_y // self.tile_size))
+        last_row = min(self.minesweeper_board.board_height - 1, int((WINDOW_HEIGHT - self.origin_y) // self.tile_size))
+        first_col = max(0, int(-self.origin_x // self.tile_size))
+        last_col = min(self.minesweeper_board.board_width - 1, int((WINDOW_WIDTH - self.origin_x) // self.tile_size))
+
+        return {(row, col) for row in range(first_row, last_row + 1) for col in range(first_col, last_col + 1)}
+
+    def clamp_origin(self):
+        """
+        Keep the board centered along any axis it fits inside the window on, and keep it from being panned
+        past its edges along any axis it doesn't.
+        """
+
+        board_width = self.tile_size * self.minesweeper_board.board_width
+        if board_width <= WINDOW_WIDTH - WINDOW_BORDERS:
+            self.origin_x = (WINDOW_WIDTH - board_width) / 2
+        else:
+            self.origin_x = min(WINDOW_BORDERS / 2, max(WINDOW_WIDTH - WINDOW_BORDERS / 2 - board_width, self.origin_x))
 
-    tile_size = min(
-        (WINDOW_HEIGHT - WINDOW_BORDERS) / minesweeper_board.board_height,
-        (WINDOW_WIDTH - WINDOW_BORDERS) / minesweeper_board.board_width,
-    )
-    row = (point.getY() - (WINDOW_HEIGHT - tile_size * minesweeper_board.board_height) / 2) // tile_size
-    col = (point.getX() - (WINDOW_WIDTH - tile_size * minesweeper_board.board_width) / 2) // tile_size
+        board_height = self.tile_size * self.minesweeper_board.board_height
+        if board_height <= WINDOW_HEIGHT - WINDOW_BORDERS:
+            self.origin_y = (WINDOW_HEIGHT - board_height) / 2
+        else:
+            self.origin_y = min(
+                WINDOW_BORDERS / 2, max(WINDOW_HEIGHT - WINDOW_BORDERS / 2 - board_height, self.origin_y)
+            )
 
-    return (int(row), int(col))
+    def draw(self):
+        """
+        Draw every visible tile onto the window and start listening for the player panning and zooming the board.
+        """
+
+        # boards that can be zoomed out past tile items get an overview image to paint onto at those zoom levels
+        if self.min_zoom_level < 0:
+            self.overview_image = tk.PhotoImage(master=self.win, width=WINDOW_WIDTH, height=WINDOW_HEIGHT)
+            self.overview_item = self.win.create_image(0, 0, image=self.overview_image, anchor="nw", state="hidden")
+
+        self.clamp_origin()
+        self.refresh_viewport()
+
+        self.win.setMouseHandler(self._on_click)
+        self.win.master.bind("<Left>", self._on_arrow_key)
+        self.win.master.bind("<Right>", self._on_arrow_key)
+        self.win.master.bind("<Up>", self._on_arrow_key)
+        self.win.master.bind("<Down>", self._on_arrow_key)
+        self.win.bind("<Button-2>", self._on_drag_start)
+        self.win.bind("<B2-Motion>", self._on_drag)
+        self.win.bind("<ButtonRelease-2>", self._on_drag_end)
+        self.win.bind("<MouseWheel>", self._on_mouse_wheel)
+        self.win.bind("<Button-4>", self._on_mouse_wheel)
+        self.win.bind("<Button-5>", self._on_mouse_wheel)
+
+    def refresh_viewport(self, relayout: bool = False):
+        """
+        Hide the items of tiles that have left the window so they can be reused, and draw the tiles that have entered
+        it.
+
+        Parameters
+        ----------
+        relayout : bool, default: False
+            Whether tiles that stayed inside the window need to be moved and redrawn as well (ex. after zooming).
+        """
+
+        # zoomed out too far for tile items, so repaint the whole overview image instead
+        if self.zoom_level < 0:
+            self.paint_overview_rows(range(WINDOW_HEIGHT))
+            return
+
+        visible_tiles = self.get_visible_tiles()
+        self.release_tile_items([tile for tile in self.tile_items if tile not in visible_tiles])
+
+        for row, col in visible_tiles:
+            if (row, col) not in self.tile_items:
+
+                # reuse hidden items if there are any, otherwise make new ones
+                if self.free_items:
+                    self.tile_items[(row, col)] = self.free_items.pop()
+                else:
+                    self.tile_items[(row, col)] = (
+                        self.win.create_rectangle(0, 0, 0, 0, outline="black", width=1, tags=BOARD_TAG),
+                        self.win.create_image(0, 0, state="hidden", tags=BOARD_TAG),
+                    )
+                self.place_tile(row, col)
+
+            elif relayout:
+                self.place_tile(row, col)
+
+    def release_tile_items(self, tiles: list[tuple[int, int]]):
+        """
+        Hide the canvas items of the given tiles and put them aside to be reused.
+
+        Parameters
+        ----------
+        tiles : list[tuple[int, int]]
+            The (row, col) coordinates of the tiles that are no longer being drawn with tile items.
+        """
+
+        for tile in tiles:
+            items = self.tile_items.pop(tile)
+            self.win.itemconfigure(items[0], state="hidden")
+            self.win.itemconfigure(items[1], state="hidden")
+            self.free_items.append(items)
+
+    def get_overview_color(self, row: int, col: int) -> str:
+        """
+        Get the color the tile at the given row and column is painted in on the overview image.
+
+        Parameters
+        ----------
+        row : int
+            The row of the tile.
+
+        col : int
+            The column of the tile.
+
+        Returns
+        -------
+        str
+            The tile's overview color.
+        """
+
+        tile = self.minesweeper_board.board[row][col]
+        if not tile.revealed:
+            if tile.flag_planted == 1:
+                return OVERVIEW_FLAG_COLOR
+            elif tile.flag_planted == 2:
+                return OVERVIEW_NEGATIVE_FLAG_COLOR
+            return self.get_tile_color(row, col)
+
+        if tile.type == Tile.MINE or tile.type == Tile.NEGATIVE_MINE:
+            return OVERVIEW_MINE_COLOR
+
+        # the further a revealed tile's value is from 0, the darker its color
+        return OVERVIEW_VALUE_COLORS[min(int(abs(tile.value)), len(OVERVIEW_VALUE_COLORS) - 1)]
+
+    def paint_overview_rows(self, pixel_rows: Iterable[int]):
+        """
+        Repaint the given rows of pixels of the overview image.
+
+        Parameters
+        ----------
+        pixel_rows : Iterable[int]
+            The y coordinates of the rows of pixels to repaint.
+        """
+
+        # find which column of the board each column of pixels shows (or None if it's off the board)
+        pixel_cols = [int((x - self.origin_x) // self.tile_size) for x in range(WINDOW_WIDTH)]
+        pixel_cols = [col if 0 <= col < self.minesweeper_board.board_width else None for col in pixel_cols]
+
+        # every row of pixels showing the same row of the board is painted with the same colors
+        row_colors = {}
+
+        def get_row_colors(y: int) -> str:
+            row = int((y - self.origin_y) // self.tile_size)
+            if not 0 <= row < self.minesweeper_board.board_height:
+                row = None
+            if row not in row_colors:
+                row_colors[row] = (
+                    "{"
+                    + " ".join(
+                        BACKGROUND_COLOR if row is None or col is None else self.get_overview_color(row, col)
+                        for col in pixel_cols
+                    )
+                    + "}"
+                )
+            return row_colors[row]
+
+        # paint each run of consecutive rows of pixels with a single call
+        run = []
+        for y in sorted(pixel_rows):
+            if run and y != run[-1] + 1:
+                self.overview_image.put(" ".join(get_row_colors(run_y) for run_y in run), to=(0, run[0]))
+                run = []
+            run.append(y)
+        if run:
+            self.overview_image.put(" ".join(get_row_colors(run_y) for run_y in run), to=(0, run[0]))
+
+    def place_tile(self, row: int, col: int):
+        """
+        Move the canvas items of the tile at the given row and column to where the tile is on the window, and redraw it.
+
+        Parameters
+        ----------
+        row : int
+            The row of the tile.
+
+        col : int
+            The column of the tile.
+        """
+
+        rectangle, value_image = self.tile_items[(row, col)]
+        x_center, y_center = self.get_tile_center(row, col)
+        self.win.coords(
+            rectangle,
+            x_center - self.tile_size / 2,
+            y_center - self.tile_size / 2,
+            x_center + self.tile_size / 2,
+            y_center + self.tile_size / 2,
+        )
+        self.win.itemconfigure(rectangle, state="normal")
+        self.win.coords(value_image, x_center, y_center)
+        self.redraw_tile(row, col)
+
+    def redraw_tile(self, row: int, col: int):
+        """
+        Reconfigure the canvas items of the tile at the given row and column to match its current state.
+
+        Parameters
+        ----------
+        row : int
+            The row of the tile.
+
+        col : int
+            The column of the tile.
+        """
+
+        rectangle, value_item = self.tile_items[(row, col)]
+        self.win.itemconfigure(rectangle, fill=self.get_tile_color(row, col))
+
+        # hide the value image item if there's nothing to draw on the tile
+        value_image = get_value_image(self.minesweeper_board.board[row][col], self.tile_size)
+        if value_image is None:
+            self.win.itemconfigure(value_item, state="hidden")
+        else:
+            self.win.itemconfigure(value_item, image=value_image, state="normal")
+
+    def update(self, changed_tiles: Iterable[tuple[int, int]] = None):
+        """
+        Redraw all visible tiles that changed last move. Tiles outside the window are drawn when they're panned to.
+
+        Parameters
+        ----------
+        changed_tiles : Iterable[tuple[int, int]], optional
+            The (row, col) coordinates of the tiles to redraw, defaults to the board's `changed_tiles`.
+        """
+
+        if changed_tiles is None:
+            changed_tiles = self.minesweeper_board.changed_tiles
+
+        # on the overview image, only repaint the rows of pixels showing the rows of the board that changed
+        if self.zoom_level < 0:
+            pixel_rows = set()
+            for row in {tile[0] for tile in changed_tiles}:
+                pixel_rows.update(
+                    range(
+                        max(0, math.ceil(self.origin_y + self.tile_size * row)),
+                        min(WINDOW_HEIGHT, math.ceil(self.origin_y + self.tile_size * (row + 1))),
+                    )
+                )
+            self.paint_overview_rows(pixel_rows)
+            return
+
+        for tile in changed_tiles:
+            if tile in self.tile_items:
+                self.redraw_tile(tile[0], tile[1])
+
+    def pan(self, x_change: float, y_change: float):
+        """
+        Move the board across the window by the given number of pixels, as far as its edges allow.
+
+        Parameters
+        ----------
+        x_change : float
+            How many pixels to move the board right (negative moves it left).
+
+        y_change : float
+            How many pixels to move the board down (negative moves it up).
+        """
+
+        old_x, old_y = self.origin_x, self.origin_y
+        self.origin_x += x_change
+        self.origin_y += y_change
+        self.clamp_origin()
+
+        if (self.origin_x, self.origin_y) != (old_x, old_y):
+            if self.zoom_level >= 0:
+                self.win.move(BOARD_TAG, self.origin_x - old_x, self.origin_y - old_y)
+            self.refresh_viewport()
+
+    def zoom(self, zoom_change: int, x: float, y: float):
+        """
+        Zoom the board in or out, keeping the point under the given window coordinates in place.
+
+        Parameters
+        ----------
+        zoom_change : int
+            How many zoom steps to zoom in (negative zooms out).
+
+        x : float
+            The x coordinate on the window to zoom around.
+
+        y : float
+            The y coordinate on the window to zoom around.
+        """
+
+        zoom_level = min(self.max_zoom_level, max(self.min_zoom_level, self.zoom_level + zoom_change))
+        if zoom_level == self.zoom_level:
+            return
+
+        # find where the point is on the board before zooming, so it can be put back under the same window coordinates
+        board_x = (x - self.origin_x) / self.tile_size
+        board_y = (y - self.origin_y) / self.tile_size
+
+        was_overview = self.zoom_level < 0
+        self.zoom_level = zoom_level
+        self.tile_size = self.base_tile_size * ZOOM_STEP**zoom_level
+        self.origin_x = x - board_x * self.tile_size
+        self.origin_y = y - board_y * self.tile_size
+        self.clamp_origin()
+
+        # swap between drawing tile items and painting the overview image if the zoom crossed between them
+        if self.zoom_level < 0 and not was_overview:
+            self.release_tile_items(list(self.tile_items))
+            self.win.itemconfigure(self.overview_item, state="normal")
+        elif self.zoom_level >= 0 and was_overview:
+            self.win.itemconfigure(self.overview_item, state="hidden")
+
+        self.refresh_viewport(relayout=True)
+
+    def show_message(self, message: str):
+        """
+        Show the player a message about the game (ex. that it's been won).
+
+        Parameters
+        ----------
+        message : str
+            The message to show.
+        """
+
+        print(message)  # TODO Have a status message in a UI section next to the game board display this
+
+    def schedule(self, callback: Callable[[], None]):
+        """
+        Call the given function once Tk has handled every event that's waiting (ex. a burst of clicks).
+
+        Parameters
+        ----------
+        callback : Callable[[], None]
+            The function to call.
+        """
+
+        self.win.after_idle(callback)
+
+    def _on_click(self, point: Point, mouse_button: str):
+        if self.click_handler is not None:
+            row, col = self.get_clicked_tile_coords(point)
+            self.click_handler(row, col, mouse_button)
+
+    def _on_arrow_key(self, event):
+        match event.keysym:
+            case "Left":
+                self.pan(PAN_STEP, 0)
+            case "Right":
+                self.pan(-PAN_STEP, 0)
+            case "Up":
+                self.pan(0, PAN_STEP)
+            case "Down":
+                self.pan(0, -PAN_STEP)
+
+    def _on_drag_start(self, event):
+        self.drag_point = (event.x, event.y)
+
+    def _on_drag(self, event):
+        if self.drag_point is not None:
+            self.pan(event.x - self.drag_point[0], event.y - self.drag_point[1])
+            self.drag_point = (event.x, event.y)
+
+    def _on_drag_end(self, event):
+        self.drag_point = None
+
+    def _on_mouse_wheel(self, event):
+        # Windows and MacOS report the wheel's direction in the event's delta, X11 reports it as mouse button 4 or 5
+        if event.num == 4 or event.delta > 0:
+            self.zoom(1, event.x, event.y)
+        elif event.num == 5 or event.delta < 0:
+            self.zoom(-1, event.x, event.y)
+
+    def undraw(self):
+        """
+        Delete every canvas item belonging to the board from the window and stop listening for panning and zooming.
+        """
+
+        self.win.delete(BOARD_TAG)
+        self.tile_items = {}
+        self.free_items = []
+
+        if self.overview_item is not None:
+            self.win.delete(self.overview_item)
+            self.overview_image = None
+            self.overview_item = None
+
+        self.win.setMouseHandler(None)
+        for sequence in ("<Left>", "<Right>", "<Up>", "<Down>"):
+            self.win.master.unbind(sequence)
+        for sequence in ("<Button-2>", "<B2-Motion>", "<ButtonRelease-2>", "<MouseWheel>", "<Button-4>", "<Button-5>"):
+            self.win.unbind(sequence)
+
+    def get_clicked_tile_coords(self, point: Point) -> tuple[int, int]:
+        """
+        Find the coordinates of the tile that was clicked, based on where the board is on the window and the tile size.
+
+        Parameters
+        ----------
+        point : Point
+            The mouse point to check the position of.
+
+        Returns
+        -------
+        tuple
+            The row and column of the tile that was clicked, in the form (row, col).
+
+        Notes
+        -----
+        The row and column values are calculated by taking the point's x and y coordinates, subtracting the position of
+        the board's top left corner, and dividing by the tile size.
+        """
+
+        row = (point.getY() - self.origin_y) // self.tile_size
+        col = (point.getX() - self.origin_x) // self.tile_size
+
+        return (int(row), int(col))
@@ -0,0 +1,521 @@
+import random
+from collections import deque
+from datetime import datetime
+from typing import Callable
+from Minesweeper.MinesweeperBoard import Tile, MinesweeperTile, MinesweeperBoard
+from Minesweeper.MinesweeperVBoard import MinesweeperVBoard
+from Minesweeper.DistanceMinesweeperBoard import DistanceMinesweeperBoard
+from Minesweeper.WeightedMinesweeperBoard import WeightedMinesweeperBoard
+from Minesweeper.NegativeMinesweeperBoard import NegativeMinesweeperBoard
+from Minesweeper.BoardSnapshot import save_board, load_board
+from MoveLog import MoveLog
+from GameHistory import GameHistory
+from PlayerStats import PlayerStats, MINES_ENCOUNTERED
+from Renderer import Renderer
+from StatsWriter import StatsWriter
+
+
+def create_minesweeper_board(
+    width=16, height=16, num_mines=40, version="Minesweeper", difficulty="medium", stats: PlayerStats = None
+) -> MinesweeperBoard:
+    """
+    Create a blank minesweeper board with the specified settings.
+
+    Parameters
+    ----------
+    width : int, default: 16
+        The number of tiles wide the minesweeper board is.
+
+    height : int, default: 16
+        The number of tiles high the minesweeper board is.
+
+    num_mines : int, default: 40
+        The number of mines to hide in the board.
+
+    version : {"Minesweeper", "Minesweeper V", "Distance Minesweeper", "Weighted Minesweeper",
+               "Negative Minesweeper"}, default: "Minesweeper"
+        Which version of Minesweeper to play.
+
+    difficulty : {'easy', 'medium', 'hard'}
+        How difficult the game should be (ONLY affects certain gamemodes, such as Distance Minesweeper)
+
+    stats : PlayerStats, optional
+        Stats for the board to update throughout the game.
+
+    Returns
+    -------
+    MinesweeperBoard
+        The board object for the selected Minesweeper mode.
+    """
+
+    match version:
+        case "Minesweeper":
+            return MinesweeperBoard(width=width, height=height, num_mines=num_mines, stats=stats)
+        case "Minesweeper V":
+            return MinesweeperVBoard(width=width, height=height, num_mines=num_mines, stats=stats)
+        case "Distance Minesweeper":
+            match difficulty:
+                case "easy":
+                    distance_weight = 3
+                case "medium":
+                    distance_weight = 2
+                case "hard":
+                    distance_weight = 1
+                case _:
+                    raise Exception("Invalid difficulty setting")
+            return DistanceMinesweeperBoard(
+                width=width, height=height, num_mines=num_mines, stats=stats, distance_weight=distance_weight
+            )
+        case "Weighted Minesweeper":
+            match difficulty:
+                case "easy":
+                    distance_weight = 3
+                case "medium":
+                    distance_weight = 2
+                case "hard":
+                    distance_weight = 1
+                case _:
+                    raise Exception("Invalid difficulty setting")
+            return WeightedMinesweeperBoard(
+                width=width, height=height, num_mines=num_mines, stats=stats, distance_weight=distance_weight
+            )
+        case "Negative Minesweeper":
+            match difficulty:
+                case "easy":
+                    num_negative_mines = num_mines // 4
+                case "medium":
+                    num_negative_mines = num_mines // 3
+                case "hard":
+                    num_negative_mines = num_mines // 2
+                case _:
+                    raise Exception("Invalid difficulty setting")
+            return NegativeMinesweeperBoard(
+                width=width,
+                height=height,
+                num_positive_mines=num_mines - num_negative_mines,
+                num_negative_mines=num_negative_mines,
+                stats=stats,
+            )
+        case _:
+            raise Exception("Invalid Minesweeper Version")
+
+
+class GameController:
+    """
+    Runs games of Minesweeper one after another, making moves for the clicks the renderer passes on.
+
+    The controller only deals in tile coordinates and mouse buttons, never windows, so headless games can be run with
+    the base `Renderer` (which draws nothing) by calling `handle_click` directly, without importing Tk at all.
+
+    Attributes
+    ----------
+    width : int, default: 16
+        The number of tiles wide the minesweeper board is.
+
+    height : int, default: 16
+        The number of tiles high the minesweeper board is.
+
+    num_mines : int, default: 40
+        The number of mines to hide in the board.
+
+    version : {"Minesweeper", "Minesweeper V", "Distance Minesweeper", "Weighted Minesweeper",
+               "Negative Minesweeper"}, default: "Minesweeper"
+        Which version of Minesweeper to play.
+
+    difficulty : {'easy', 'medium', 'hard'}
+        How difficult the game should be (ONLY affects certain gamemodes, such as Distance Minesweeper)
+
+    stats : PlayerStats
+        Stats to update throughout every game and save whenever one ends.
+
+    create_renderer : Callable[[MinesweeperBoard, Callable[[int, int, str], None]], Renderer], default: Renderer
+        Creates the renderer for each new board, given the board and the function to pass the player's clicks to.
+
+    move_log_file : str, optional
+        The file every game's moves are appended to as they're made, so they can be replayed later. Moves are only kept
+        in `move_log` if left empty.
+
+    stats_writer : StatsWriter, optional
+        Saves the stats on a background thread whenever a game ends, so the next game doesn't wait on the disk. The
+        stats are saved straight away if left empty.
+
+    history : GameHistory, optional
+        The history every finished game is added to, if there is one.
+
+    minesweeper_board : MinesweeperBoard
+        The board of the game currently being played.
+
+    renderer : Renderer
+        The renderer showing the current board to the player.
+
+    move_log : MoveLog
+        The seed and moves of the current game, or None if it was loaded partway through by `load_game` (since its
+        earlier moves were never logged).
+
+    first_move_made : bool
+        Whether the first left click of the current game has happened (and the board has been generated).
+
+    flagged_before_first_move : set[tuple[int, int]]
+        The (row, col) coordinates of every tile a flag was planted on (or removed from) before the first left click.
+
+    game_running : bool
+        Whether the current game is still being played.
+
+    game_won : bool
+        Whether the current game has been won (only ever True once it's over).
+
+    start_time : datetime
+        When the current game started.
+
+    click_queue : deque[tuple[int, int, str]]
+        The clicks waiting to be made as moves, oldest first, in the form (row, col, button).
+
+    clicks_scheduled : bool
+        Whether the queued clicks are already scheduled to be processed.
+    """
+
+    def __init__(
+        self,
+        width=16,
+        height=16,
+        num_mines=40,
+        version="Minesweeper",
+        difficulty="medium",
+        stats: PlayerStats = None,
+        create_renderer: Callable[[MinesweeperBoard, Callable[[int, int, str], None]], Renderer] = Renderer,
+        move_log_file: str = None,
+        stats_writer: StatsWriter = None,
+        history: GameHistory = None,
+    ):
+        self.width = width
+        self.height = height
+        self.num_mines = num_mines
+        self.version = version
+
+        # difficulty doesn't affect these versions, so it isn't part of their stat names
+        self.difficulty = "" if version in ("Minesweeper", "Minesweeper V") else difficulty
+
+        self.stats = stats if stats is not None else PlayerStats()
+        self.create_renderer = create_renderer
+        self.move_log_file = move_log_file
+        self.stats_writer = stats_writer
+        self.history = history
+        self.minesweeper_board = None
+        self.renderer = None
+        self.move_log = None
+        self.first_move_made = False
+        self.flagged_before_first_move = set()
+        self.game_running = False
+        self.game_won = False
+        self.start_time = None
+        self.click_queue = deque()
+        self.clicks_scheduled = False
+
+    def new_game(self):
+        """
+        Clear the previous game away (if there was one) and start a new one.
+        """
+
+        if self.renderer is not None:
+            self.renderer.undraw()
+
+        # create the initial boardstate and draw it
+        self.minesweeper_board = create_minesweeper_board(
+            self.width, self.height, self.num_mines, self.version, self.difficulty, self.stats
+        )
+        self.renderer = self.create_renderer(self.minesweeper_board, self.handle_click)
+        self.renderer.draw()
+
+        # the board is generated from a seed of its own, so the logged moves can be replayed on the same board
+        seed = random.getrandbits(64)
+        self.minesweeper_board.rng.seed(seed)
+        if self.move_log is not None:
+            self.move_log.close()
+        self.move_log = MoveLog(
+            self.version, self.width, self.height, self.num_mines, self.difficulty, seed, file_name=self.move_log_file
+        )
+
+        self.first_move_made = False
+        self.flagged_before_first_move = set()
+        self.game_running = True
+        self.game_won = False
+        self.start_time = datetime.now()
+        self.renderer.show_message(f"START TIME: {self.start_time}")
+        self.stats.increment_stat(self.version, MINES_ENCOUNTERED, self.num_mines)
+
+    def save_game(self, file_name: str):
+        """
+        Save the current game's board to a snapshot file so it can be picked back up later with `load_game`.
+
+        Parameters
+        ----------
+        file_name : str
+            The file to save the game to.
+        """
+
+        save_board(self.minesweeper_board, file_name, self.first_move_made)
+
+    def load_game(self, file_name: str):
+        """
+        Clear the current game away and pick up a game saved by `save_game` where it left off.
+        The game should have been saved by a controller with the same settings, since they decide which stats it counts
+        towards.
+
+        Parameters
+        ----------
+        file_name : str
+            The file to load the game from.
+        """
+
+        minesweeper_board, self.first_move_made = load_board(file_name, self.stats)
+        if self.renderer is not None:
+            self.renderer.undraw()
+
+        self.minesweeper_board = minesweeper_board
+        if self.move_log is not None:
+            self.move_log.close()
+        self.move_log = None
+        self.renderer = self.create_renderer(self.minesweeper_board, self.handle_click)
+        self.renderer.draw()
+
+        self.flagged_before_first_move = set()
+        if not self.first_move_made:
+            self.flagged_before_first_move = {
+                (r, c)
+                for r, tiles in enumerate(self.minesweeper_board.board)
+                for c, tile in enumerate(tiles)
+                if tile.flag_planted
+            }
+
+        self.game_running = True
+        self.game_won = False
+        self.start_time = datetime.now()
+        self.click_queue.clear()
+
+    def handle_click(self, row: int, col: int, mouse_button: str):
+        """
+        Queue a click on a tile to be made as a move once the renderer has no more input waiting.
+        Every click that arrives before then is queued too, so none of them are lost while a slow move is running.
+
+        Parameters
+        ----------
+        row : int
+            The row of the clicked tile.
+
+        col : int
+            The column of the clicked tile.
+
+        mouse_button : {"left", "right"}
+            Which mouse button the player clicked with.
+        """
+
+        self.click_queue.append((row, col, mouse_button))
+        if not self.clicks_scheduled:
+            self.clicks_scheduled = True
+            self.renderer.schedule(self.process_clicks)
+
+    def process_clicks(self):
+        """
+        Make a move for every queued click in the order they were clicked, then redraw every tile they changed at once.
+        """
+
+        self.clicks_scheduled = False
+
+        # once a game is over, the next click starts a new one
+        if not self.game_running:
+            self.click_queue.popleft()
+            self.new_game()
+
+        changed_tiles = {}
+        while self.click_queue and self.game_running:
+            row, col, mouse_button = self.click_queue.popleft()
+
+            # left clicks in a row on hidden tiles are revealed together in one pass over the board, judging each one by
+            # the board the player clicked it on (so a tile revealed by an earlier click in the run isn't chorded)
+            if mouse_button == "left" and self.first_move_made and self.is_hidden_tile(row, col):
+                reveal_coords = [(row, col)]
+                while (
+                    self.click_queue
+                    and self.click_queue[0][2] == "left"
+                    and self.is_hidden_tile(*self.click_queue[0][:2])
+                ):
+                    reveal_coords.append(self.click_queue.popleft()[:2])
+                self.make_reveal_moves(reveal_coords)
+            else:
+                self.make_click_move(row, col, mouse_button)
+
+            # dictionary keys keep the tiles in the order they first changed without redrawing any of them twice
+            changed_tiles.update(dict.fromkeys(self.minesweeper_board.changed_tiles))
+
+        # the rest of the clicks were made before the player could see the game had ended
+        if not self.game_running:
+            self.click_queue.clear()
+
+        # redraw the board
+        self.renderer.update(changed_tiles)
+
+    def make_click_move(self, row: int, col: int, mouse_button: str):
+        """
+        Make the move for a single click on the board.
+
+        Parameters
+        ----------
+        row : int
+            The row of the clicked tile.
+
+        col : int
+            The column of the clicked tile.
+
+        mouse_button : {"left", "right"}
+            Which mouse button the player clicked with.
+        """
+
+        # ignore clicks that aren't on the board
+        if not (0 <= row < self.minesweeper_board.board_height and 0 <= col < self.minesweeper_board.board_width):
+            return
+
+        # a left click on a revealed number chords it, revealing every tile around it without a flag
+        if mouse_button == "left" and self.minesweeper_board.board[row][col].revealed:
+            mouse_button = "chord"
+        if self.move_log is not None:
+            self.move_log.add_move(mouse_button, row, col)
+
+        # if the clicked button was left, make a move on the clicked tile (if that tile doesn't have a flag)
+        if mouse_button == "left":
+
+            # create a random board where the first clicked tile is guaranteed to be empty
+            if not self.first_move_made:
+                self.minesweeper_board.board = self.minesweeper_board.get_random_board((row, col))
+                self.first_move_made = True
+
+                # flags planted before the first click don't carry over to the generated board, so clear them away
+                self.renderer.update(self.flagged_before_first_move)
+            self.end_game_if_over([self.minesweeper_board.make_move(row, col)])
+
+        elif mouse_button == "chord":
+            self.end_game_if_over(self.minesweeper_board.chord(row, col))
+
+        # if the clicked button was right, plant a flag on the clicked tile
+        elif mouse_button == "right":
+            self.minesweeper_board.plant_flag_on_tile(row, col)
+
+            # the tiles flagged before the board is generated are remembered, so huge boards never have to be searched
+            # for them
+            if not self.first_move_made:
+                self.flagged_before_first_move.add((row, col))
+
+    def make_reveal_moves(self, coords: list[tuple[int, int]]):
+        """
+        Make the moves for many left clicks on the board at once, revealing every clicked tile in a single move (see
+        `MinesweeperBoard.make_moves`) instead of one move per click. The board has to have been generated already.
+
+        Parameters
+        ----------
+        coords : list[tuple[int, int]]
+            The (row, col) coordinates of the clicked tiles, in the order they were clicked.
+        """
+
+        # ignore clicks that aren't on the board
+        coords = [
+            (row, col)
+            for row, col in coords
+            if 0 <= row < self.minesweeper_board.board_height and 0 <= col < self.minesweeper_board.board_width
+        ]
+
+        # the clicks after one on a mine were made before the player could see the game had ended, so they're dropped
+        board = self.minesweeper_board.board
+        for index, (row, col) in enumerate(coords):
+            if not board[row][col].flag_planted and (
+                board[row][col].type == Tile.MINE or board[row][col].type == Tile.NEGATIVE_MINE
+            ):
+                coords = coords[: index + 1]
+                break
+
+        if self.move_log is not None:
+            for row, col in coords:
+                self.move_log.add_move("left", row, col)
+        self.end_game_if_over(self.minesweeper_board.make_moves(coords))
+
+    def end_game_if_over(self, activated_tiles: list[MinesweeperTile]):
+        """
+        End the game if a move just lost it by revealing a mine or won it by completing the board.
+
+        Parameters
+        ----------
+        activated_tiles : list[MinesweeperTile]
+            The tiles the move was made on.
+        """
+
+        # if any of the moved on tiles was a mine, the game is lost
+        if any(tile.type == Tile.MINE or tile.type == Tile.NEGATIVE_MINE for tile in activated_tiles):
+            self.renderer.show_message("YOU LOST :(")
+            self.minesweeper_board.reveal_all_tiles()
+            self.end_game(False)
+
+        # if the board has been completed, the game is won
+        elif self.minesweeper_board.board_finished():
+            self.renderer.show_message("YOU WON!!!")
+            self.end_game(True)
+
+    def is_hidden_tile(self, row: int, col: int) -> bool:
+        """
+        Check whether the tile at the given row and column is on the board and hasn't been revealed.
+
+        Parameters
+        ----------
+        row : int
+            The row of the tile.
+
+        col : int
+            The column of the tile.
+
+        Returns
+        -------
+        bool
+            Whether the tile is hidden or not.
+        """
+
+        return (
+            0 <= row < self.minesweeper_board.board_height
+            and 0 <= col < self.minesweeper_board.board_width
+            and not self.minesweeper_board.board[row][col].revealed
+        )
+
+    def end_game(self, won: bool):
+        """
+        Stop the current game and record it in the player's stats (and history, if there is one).
+
+        Parameters
+        ----------
+        won : bool
+            Whether the player won the game or not.
+        """
+
+        self.game_running = False
+        self.game_won = won
+        time_played = datetime.now() - self.start_time
+        seconds_played = time_played.seconds
+        if won:
+            self.stats.increment_stat(self.version, f"{self.difficulty} Wins".strip())
+            self.stats.increment_stat(self.version, f"Total Win Time {self.difficulty}".strip(), seconds_played)
+        else:
+            self.stats.increment_stat(self.version, f"{self.difficulty} Losses".strip())
+            self.stats.increment_stat(self.version, f"Total Loss Time {self.difficulty}".strip(), seconds_played)
+        if self.history is not None:
+            self.history.add_game(
+                self.version,
+                self.difficulty,
+                self.width,
+                self.height,
+                self.num_mines,
+                time_played.total_seconds(),
+                won,
+                self.minesweeper_board.num_tiles_revealed,
+            )
+
+        if self.stats_writer is not None:
+            self.stats_writer.save()
+            if self.stats_writer.last_error is not None:
+                self.renderer.show_message(f"Failed to save stats, trying again later: {self.stats_writer.last_error}")
+        else:
+            self.stats.save_player_stats()
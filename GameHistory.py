@@ -0,0 +1,457 @@
+"""
+A history of every finished game, one row per game, with aggregates (win rates, mean and percentile win times) that are
+kept up to date as each game is added, so querying them never has to go back over the whole history.
+
+Rows are appended to the history file as fixed-size little-endian records: version and difficulty (u8 each, as indexes
+into `VERSIONS` and `DIFFICULTIES`), width, height and number of mines (u32 each), seconds played (f64), whether the
+game was won (u8) and the number of tiles revealed (u32). In memory each field is kept as its own column.
+"""
+
+import os
+import struct
+from array import array
+from bisect import insort
+from collections import Counter
+from itertools import compress
+from math import ceil
+from operator import not_
+from typing import Sequence
+
+VERSIONS = ("Minesweeper", "Minesweeper V", "Distance Minesweeper", "Weighted Minesweeper", "Negative Minesweeper")
+DIFFICULTIES = ("", "easy", "medium", "hard")
+
+GAME = struct.Struct("<BBIIIdBI")
+
+# the column each field of a game is kept in, in the same order as the fields of its record
+COLUMN_TYPES = {
+    "version": "B",
+    "difficulty": "B",
+    "width": "I",
+    "height": "I",
+    "num_mines": "I",
+    "seconds_played": "d",
+    "won": "B",
+    "tiles_revealed": "I",
+}
+
+# how many ranges mine densities (mines per tile) from 0 to 1 are split into when finding win rates by density, and so
+# how wide each range is
+NUM_DENSITY_RANGES = 20
+DENSITY_STEP = 1 / NUM_DENSITY_RANGES
+
+
+def get_density_range(width: int, height: int, num_mines: int) -> int:
+    """
+    Get which range of mine densities a board is in, as the number of `DENSITY_STEP`s below its density.
+
+    Parameters
+    ----------
+    width : int
+        The number of tiles wide the board is.
+
+    height : int
+        The number of tiles high the board is.
+
+    num_mines : int
+        The number of mines hidden in the board.
+
+    Returns
+    -------
+    int
+        The board's density range.
+    """
+
+    # worked out in whole numbers, since dividing the density by a float step rounds densities on the edge of a range
+    # (ex. 0.15) down into the range below
+    return num_mines * NUM_DENSITY_RANGES // (width * height) if width * height else 0
+
+
+class GameAggregates:
+    """
+    Running totals over a group of games, updated as each game is added.
+
+    Attributes
+    ----------
+    num_games : int
+        The number of games in the group.
+
+    num_wins : int
+        The number of those games that were won.
+
+    total_win_time : float
+        The total number of seconds played across every won game.
+
+    total_loss_time : float
+        The total number of seconds played across every lost game.
+
+    total_tiles_revealed : int
+        The total number of tiles revealed across every game.
+
+    win_times : list[float]
+        The seconds played in every won game, kept sorted so any percentile can be looked up straight away.
+
+    games_by_density : dict[int, list[int]]
+        The number of games and the number of wins for each range of mine densities, by which range they're in (see
+        `get_density_range`).
+    """
+
+    def __init__(self):
+        self.num_games = 0
+        self.num_wins = 0
+        self.total_win_time = 0.0
+        self.total_loss_time = 0.0
+        self.total_tiles_revealed = 0
+        self.win_times = []
+        self.games_by_density = {}
+
+    def add_game(self, density_range: int, seconds_played: float, won: bool, tiles_revealed: int):
+        """
+        Add a game to the running totals.
+
+        Parameters
+        ----------
+        density_range : int
+            Which range of mine densities the game's board is in (see `get_density_range`).
+
+        seconds_played : float
+            How many seconds the game lasted.
+
+        won : bool
+            Whether the game was won or not.
+
+        tiles_revealed : int
+            The number of tiles revealed in the game.
+        """
+
+        self.num_games += 1
+        self.total_tiles_revealed += tiles_revealed
+        if won:
+            self.num_wins += 1
+            self.total_win_time += seconds_played
+            insort(self.win_times, seconds_played)
+        else:
+            self.total_loss_time += seconds_played
+
+        density_counts = self.games_by_density.setdefault(density_range, [0, 0])
+        density_counts[0] += 1
+        density_counts[1] += won
+
+    def add_games(
+        self,
+        density_ranges: Sequence[int],
+        seconds_played: Sequence[float],
+        won: Sequence[bool],
+        tiles_revealed: Sequence[int],
+    ):
+        """
+        Add many games to the running totals at once, which is much quicker than adding them one at a time.
+
+        Parameters
+        ----------
+        density_ranges : Sequence[int]
+            Which range of mine densities each game's board is in (see `get_density_range`).
+
+        seconds_played : Sequence[float]
+            How many seconds each game lasted.
+
+        won : Sequence[bool]
+            Whether each game was won or not.
+
+        tiles_revealed : Sequence[int]
+            The number of tiles revealed in each game.
+        """
+
+        win_times = list(compress(seconds_played, won))
+        self.num_games += len(won)
+        self.num_wins += len(win_times)
+        self.total_win_time += sum(win_times)
+        self.total_loss_time += sum(compress(seconds_played, map(not_, won)))
+        self.total_tiles_revealed += sum(tiles_revealed)
+
+        # the win times are sorted once, instead of inserting each one into its place
+        self.win_times = sorted(self.win_times + win_times)
+
+        for density_range, num_games in Counter(density_ranges).items():
+            self.games_by_density.setdefault(density_range, [0, 0])[0] += num_games
+        for density_range, num_wins in Counter(compress(density_ranges, won)).items():
+            self.games_by_density.setdefault(density_range, [0, 0])[1] += num_wins
+
+    def merge(self, other: "GameAggregates"):
+        """
+        Add the running totals of another group of games into these ones.
+
+        Parameters
+        ----------
+        other : GameAggregates
+            The running totals to add.
+        """
+
+        self.num_games += other.num_games
+        self.num_wins += other.num_wins
+        self.total_win_time += other.total_win_time
+        self.total_loss_time += other.total_loss_time
+        self.total_tiles_revealed += other.total_tiles_revealed
+
+        # sorting two sorted lists stuck together only has to merge them
+        self.win_times = sorted(self.win_times + other.win_times)
+        for density_range, (num_games, num_wins) in other.games_by_density.items():
+            density_counts = self.games_by_density.setdefault(density_range, [0, 0])
+            density_counts[0] += num_games
+            density_counts[1] += num_wins
+
+
+class GameHistory:
+    """
+    Every finished game, stored as rows in a history file and as columns in memory, with running aggregates for each
+    version, each version and difficulty, and all games together.
+
+    Attributes
+    ----------
+    file_name : str, default: "history"
+        The file the games are appended to.
+
+    columns : dict[str, array]
+        Each field of every game in the history, in the order they were added, by field name (see `COLUMN_TYPES`).
+
+    aggregates : dict[tuple[str | None, str | None], GameAggregates]
+        The running totals for each group of games, by (version, difficulty). A version or difficulty of None groups
+        together the games of every version or difficulty.
+    """
+
+    def __init__(self, file_name="history"):
+        self.file_name = file_name
+        self.columns = {name: array(type_code) for name, type_code in COLUMN_TYPES.items()}
+        self.aggregates = {}
+
+    def __len__(self):
+        return len(self.columns["won"])
+
+    def load_history(self):
+        """
+        Load every game in the history file (including games added by other processes), if there is one.
+        """
+
+        self.columns = {name: array(type_code) for name, type_code in COLUMN_TYPES.items()}
+        self.aggregates = {}
+        try:
+            with open(self.file_name, "rb") as history_file:
+                data = history_file.read()
+        except FileNotFoundError:
+            return
+
+        # a record left unfinished by a crash is dropped
+        data = data[: len(data) - len(data) % GAME.size]
+        if not data:
+            return
+        records = list(GAME.iter_unpack(data))
+        for column, values in zip(self.columns.values(), zip(*records)):
+            column.extend(values)
+
+        # the games are split up by version and difficulty, and each group is added to its aggregates all at once
+        records_by_group = {}
+        for record in records:
+            records_by_group.setdefault(record[:2], []).append(record)
+
+        for (version_index, difficulty_index), group_records in records_by_group.items():
+            _, _, width, height, num_mines, seconds_played, won, tiles_revealed = zip(*group_records)
+            density_ranges = list(map(get_density_range, width, height, num_mines))
+            group_aggregates = GameAggregates()
+            group_aggregates.add_games(density_ranges, seconds_played, won, tiles_revealed)
+
+            version = VERSIONS[version_index]
+            self.aggregates[(version, DIFFICULTIES[difficulty_index])] = group_aggregates
+            for key in ((version, None), (None, None)):
+                if key not in self.aggregates:
+                    self.aggregates[key] = GameAggregates()
+                self.aggregates[key].merge(group_aggregates)
+
+    def add_game(
+        self,
+        version: str,
+        difficulty: str,
+        width: int,
+        height: int,
+        num_mines: int,
+        seconds_played: float,
+        won: bool,
+        tiles_revealed: int,
+    ):
+        """
+        Add a finished game to the history and append it to the history file.
+
+        Parameters
+        ----------
+        version : {"Minesweeper", "Minesweeper V", "Distance Minesweeper", "Weighted Minesweeper",
+                   "Negative Minesweeper"}
+            Which version of Minesweeper the game was played in.
+
+        difficulty : {"", "easy", "medium", "hard"}
+            How difficult the game was ("" for versions it doesn't affect).
+
+        width : int
+            The number of tiles wide the board was.
+
+        height : int
+            The number of tiles high the board was.
+
+        num_mines : int
+            The number of mines hidden in the board.
+
+        seconds_played : float
+            How many seconds the game lasted.
+
+        won : bool
+            Whether the game was won or not.
+
+        tiles_revealed : int
+            The number of tiles revealed in the game.
+        """
+
+        record = (
+            VERSIONS.index(version),
+            DIFFICULTIES.index(difficulty),
+            width,
+            height,
+            num_mines,
+            seconds_played,
+            won,
+            tiles_revealed,
+        )
+        self._add_row(*record)
+
+        # the record is appended in a single write, so other processes can add games to the same file at the same time
+        history_file = os.open(
+            self.file_name, os.O_WRONLY | os.O_APPEND | os.O_CREAT | getattr(os, "O_BINARY", 0), 0o666
+        )
+        try:
+            os.write(history_file, GAME.pack(*record))
+        finally:
+            os.close(history_file)
+
+    def _add_row(self, *record):
+        for column, value in zip(self.columns.values(), record):
+            column.append(value)
+
+        version_index, difficulty_index, width, height, num_mines, seconds_played, won, tiles_revealed = record
+        version = VERSIONS[version_index]
+        difficulty = DIFFICULTIES[difficulty_index]
+        density_range = get_density_range(width, height, num_mines)
+        for key in ((version, difficulty), (version, None), (None, None)):
+            if key not in self.aggregates:
+                self.aggregates[key] = GameAggregates()
+            self.aggregates[key].add_game(density_range, seconds_played, bool(won), tiles_revealed)
+
+    def get_aggregates(self, version: str = None, difficulty: str = None) -> GameAggregates:
+        """
+        Get the running totals for a group of games.
+
+        Parameters
+        ----------
+        version : str, optional
+            The version of Minesweeper to get the totals for, or every version if left empty.
+
+        difficulty : str, optional
+            The difficulty to get the totals for, or every difficulty if left empty. Only used if a version is given.
+
+        Returns
+        -------
+        GameAggregates
+            The running totals (all 0s if no games in the group have been played).
+        """
+
+        key = (version, difficulty if version is not None else None)
+        return self.aggregates.get(key, GameAggregates())
+
+    def win_rate(self, version: str = None, difficulty: str = None) -> float:
+        """
+        Get the fraction of games won.
+
+        Parameters
+        ----------
+        version : str, optional
+            The version of Minesweeper to get the win rate for, or every version if left empty.
+
+        difficulty : str, optional
+            The difficulty to get the win rate for, or every difficulty if left empty. Only used if a version is given.
+
+        Returns
+        -------
+        float
+            The fraction of games won, or 0.0 if none have been played.
+        """
+
+        aggregates = self.get_aggregates(version, difficulty)
+        return aggregates.num_wins / aggregates.num_games if aggregates.num_games else 0.0
+
+    def mean_win_time(self, version: str = None, difficulty: str = None) -> float:
+        """
+        Get the mean number of seconds it took to win a game.
+
+        Parameters
+        ----------
+        version : str, optional
+            The version of Minesweeper to get the mean win time for, or every version if left empty.
+
+        difficulty : str, optional
+            The difficulty to get the mean win time for, or every difficulty if left empty. Only used if a version is
+            given.
+
+        Returns
+        -------
+        float
+            The mean number of seconds, or 0.0 if no games have been won.
+        """
+
+        aggregates = self.get_aggregates(version, difficulty)
+        return aggregates.total_win_time / aggregates.num_wins if aggregates.num_wins else 0.0
+
+    def win_time_percentile(self, percentile: float, version: str = None, difficulty: str = None) -> float:
+        """
+        Get the number of seconds within which the given percentage of games were won (ex. 50 for the median).
+
+        Parameters
+        ----------
+        percentile : float
+            The percentage of won games, from 0 to 100.
+
+        version : str, optional
+            The version of Minesweeper to get the win time for, or every version if left empty.
+
+        difficulty : str, optional
+            The difficulty to get the win time for, or every difficulty if left empty. Only used if a version is given.
+
+        Returns
+        -------
+        float
+            The number of seconds (using the nearest-rank method), or 0.0 if no games have been won.
+        """
+
+        win_times = self.get_aggregates(version, difficulty).win_times
+        if not win_times:
+            return 0.0
+        return win_times[max(ceil(percentile / 100 * len(win_times)), 1) - 1]
+
+    def win_rate_by_density(self, version: str = None, difficulty: str = None) -> dict[float, float]:
+        """
+        Get the fraction of games won for each range of mine densities (mines per tile) that games have been played at.
+
+        Parameters
+        ----------
+        version : str, optional
+            The version of Minesweeper to get the win rates for, or every version if left empty.
+
+        difficulty : str, optional
+            The difficulty to get the win rates for, or every difficulty if left empty. Only used if a version is given.
+
+        Returns
+        -------
+        dict[float, float]
+            The fraction of games won, by the lowest density of each range (each range is `DENSITY_STEP` wide), in
+            order.
+        """
+
+        games_by_density = self.get_aggregates(version, difficulty).games_by_density
+        return {
+            round(density_range * DENSITY_STEP, 6): num_wins / num_games
+            for density_range, (num_games, num_wins) in sorted(games_by_density.items())
+        }
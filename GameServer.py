@@ -0,0 +1,745 @@
+"""
+A network server hosting many games of Minesweeper at once, so a whole room of players can play from one machine.
+
+Clients connect over TCP and send one JSON request per line, and get one JSON response per line back, in order:
+- {"op": "new", "version": ..., "width": ..., "height": ..., "mines": ..., "difficulty": ...} starts a game (every
+  setting is optional, defaulting to the game controller's) and responds with {"session": id, "width": ...,
+  "height": ...}
+- {"op": "move", "session": id, "row": ..., "col": ..., "button": "left" | "right"} makes a move and responds with
+  {"changed": [[row, col, state], ...], "game_over": bool, "won": bool}, where each changed tile's state is "#" if it's
+  hidden, "F" or "f" if it has a flag or negative flag, "B" or "b" if it's a revealed mine or negative mine, or its
+  value if it's any other revealed tile (a left click on a revealed number chords it, revealing every tile around it
+  without a flag in one move)
+- {"op": "snapshot", "session": id} responds with the whole board as {"tiles": [[state, ...], ...], "game_over": bool,
+  "won": bool}, for a player reconnecting to a game
+- {"op": "close", "session": id} ends a game and responds with {"closed": id}
+Any request that can't be handled responds with {"error": message} instead. A request's "id", if it has one, is copied
+into its response.
+
+Clients can speak the compact binary format in `WireProtocol` instead, which makes the same requests but sends each
+move's changes as a few bytes per tile (rather than a JSON list per tile), by opening the connection with
+`WireProtocol.HELLO`.
+
+Games aren't tied to the connection that started them, so a player can reconnect and carry on with the same session.
+
+To host thousands of mostly idle games, the boards of the least recently played games are packed into snapshots (see
+`Minesweeper.BoardSnapshot`) whenever the boards in memory go over the server's memory budget, or once a game has been
+left alone for long enough. A snapshot takes up a few bits per tile instead of around a hundred bytes, and the board is
+unpacked again on its next move, which takes time in proportion to the size of the board (not the length of the game).
+"""
+
+import asyncio
+import json
+import sys
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from itertools import count
+from typing import Any, Callable, Iterable
+from GameController import GameController
+from Minesweeper.BoardSnapshot import board_to_bytes, board_from_bytes
+from Minesweeper.MinesweeperBoard import MinesweeperBoard
+from Minesweeper.MinesweeperTile import Tile, MinesweeperTile
+from Renderer import Renderer
+from WireProtocol import (
+    HELLO,
+    decode_request,
+    encode_delta,
+    encode_error,
+    encode_numbers,
+    encode_snapshot,
+    frame,
+    get_value_scale,
+    read_frame,
+)
+
+# the versions whose moves can take long enough to hold up every other player if they were made on the event loop
+SLOW_MOVE_VERSIONS = ("Distance Minesweeper", "Weighted Minesweeper")
+
+# boards with more tiles than this have every move made on the worker threads, since a single reveal can cover the board
+SLOW_MOVE_TILES = 10_000
+
+# the largest board a game can be started on, since the whole board is built as soon as the game starts
+MAX_BOARD_TILES = 1_000_000
+
+# the largest binary request accepted, far more than any request needs
+MAX_REQUEST_SIZE = 4096
+
+# roughly how many bytes of memory each tile of a board in memory takes up
+BYTES_PER_TILE = 100
+
+
+def get_tile_state(tile: MinesweeperTile) -> str | int | float:
+    """
+    Get what a player should be shown for a tile.
+
+    Parameters
+    ----------
+    tile : MinesweeperTile
+        The tile to show.
+
+    Returns
+    -------
+    str | int | float
+        "#" if the tile is hidden, "F" or "f" if it has a flag or negative flag, "B" or "b" if it's a revealed mine or
+        negative mine, or its value if it's any other revealed tile.
+    """
+
+    if not tile.revealed:
+        return ("#", "F", "f")[tile.flag_planted]
+    if tile.type == Tile.MINE:
+        return "B"
+    if tile.type == Tile.NEGATIVE_MINE:
+        return "b"
+    return tile.value
+
+
+class SessionRenderer(Renderer):
+    """
+    Collects the tiles that change in a session's game, for the server to send to the player instead of drawing them.
+
+    Attributes
+    ----------
+    changed_tiles : dict[tuple[int, int], None]
+        The (row, col) coordinates of every tile that changed since they were last taken, in the order they changed.
+    """
+
+    def __init__(self, minesweeper_board: MinesweeperBoard, click_handler=None):
+        super().__init__(minesweeper_board, click_handler)
+        self.changed_tiles = {}
+
+    def update(self, changed_tiles: Iterable[tuple[int, int]] = None):
+        """
+        Collect all tiles that changed last move, to be taken by `take_changed_tiles`.
+
+        Parameters
+        ----------
+        changed_tiles : Iterable[tuple[int, int]], optional
+            The (row, col) coordinates of the changed tiles, defaults to the board's `changed_tiles`.
+        """
+
+        if changed_tiles is None:
+            changed_tiles = self.minesweeper_board.changed_tiles
+        self.changed_tiles.update(dict.fromkeys(changed_tiles))
+
+    def take_changed_tiles(self) -> list[tuple[int, int]]:
+        """
+        Take the tiles that changed since they were last taken.
+
+        Returns
+        -------
+        list[tuple[int, int]]
+            The (row, col) coordinates of every changed tile, in the order they changed.
+        """
+
+        changed_tiles = list(self.changed_tiles)
+        self.changed_tiles = {}
+        return changed_tiles
+
+
+class GameSession:
+    """
+    A single player's game on the server.
+
+    Attributes
+    ----------
+    session_id : int
+        The number identifying the session to the player.
+
+    controller : GameController
+        Runs the session's game, with a `SessionRenderer` collecting the tiles each move changes.
+
+    lock : asyncio.Lock
+        Held while a move is being made or the session is being evicted, so moves sent one after another are always
+        made in order.
+
+    evicted_board : bytes
+        The snapshot of the session's board while it's evicted from memory, or None while the board is in memory.
+
+    last_used : float
+        When the session was last played (by `time.monotonic`).
+    """
+
+    def __init__(self, session_id: int, controller: GameController):
+        self.session_id = session_id
+        self.controller = controller
+        self.lock = asyncio.Lock()
+        self.evicted_board = None
+        self.last_used = time.monotonic()
+
+    @property
+    def num_tiles(self) -> int:
+        """
+        The number of tiles on the session's board.
+        """
+
+        return self.controller.width * self.controller.height
+
+    def evict(self):
+        """
+        Pack the session's board into a snapshot and let go of the board, so its tiles no longer take up memory.
+        """
+
+        controller = self.controller
+        self.evicted_board = board_to_bytes(controller.minesweeper_board, controller.first_move_made)
+        controller.minesweeper_board = None
+        controller.renderer.minesweeper_board = None
+
+    def rehydrate(self):
+        """
+        Unpack the session's board from its snapshot, to be played on again.
+        """
+
+        controller = self.controller
+        minesweeper_board, _ = board_from_bytes(self.evicted_board, controller.stats)
+
+        # snapshots don't keep the state of the random number generator, which only matters until the board is generated
+        if controller.move_log is not None:
+            minesweeper_board.rng.seed(controller.move_log.seed)
+        controller.minesweeper_board = minesweeper_board
+        controller.renderer.minesweeper_board = minesweeper_board
+        self.evicted_board = None
+
+    def make_move(self, row: int, col: int, mouse_button: str) -> list[tuple[int, int]]:
+        """
+        Make a move in the session's game, which has to be in memory.
+
+        Parameters
+        ----------
+        row : int
+            The row of the tile to move on.
+
+        col : int
+            The column of the tile to move on.
+
+        mouse_button : {"left", "right"}
+            "left" to reveal the tile, or "right" to plant a flag on it.
+
+        Returns
+        -------
+        list[tuple[int, int]]
+            The (row, col) coordinates of every tile the move changed.
+        """
+
+        controller = self.controller
+        if not controller.game_running:
+            raise Exception("The game is over")
+        if mouse_button not in ("left", "right"):
+            raise Exception(f"Invalid button {mouse_button!r}")
+
+        controller.handle_click(row, col, mouse_button)
+        return controller.renderer.take_changed_tiles()
+
+    def is_slow_move(self, mouse_button: str) -> bool:
+        """
+        Check whether a move could take long enough that it should be made on a worker thread.
+
+        Parameters
+        ----------
+        mouse_button : {"left", "right"}
+            The button the move is made with.
+
+        Returns
+        -------
+        bool
+            Whether the move should be made on a worker thread.
+        """
+
+        controller = self.controller
+
+        # the first reveal generates the whole board
+        return (
+            controller.version in SLOW_MOVE_VERSIONS
+            or controller.width * controller.height > SLOW_MOVE_TILES
+            or (mouse_button == "left" and not controller.first_move_made)
+        )
+
+
+class GameServer:
+    """
+    Hosts many sessions of Minesweeper at once, for players connecting over TCP.
+
+    Moves are made on the asyncio event loop, except for the ones that could take a while (see
+    `GameSession.is_slow_move`), which are handed to a pool of worker threads so the other players never have to wait on
+    them.
+
+    Whenever the boards in memory would take up more than `memory_budget`, the least recently played sessions are
+    evicted until they don't, and any session left alone for `idle_timeout` seconds is evicted too.
+
+    Attributes
+    ----------
+    host : str, default: "127.0.0.1"
+        The address to listen on.
+
+    port : int, default: 8765
+        The port to listen on.
+
+    memory_budget : int, default: 256 MiB
+        How many bytes the boards of the sessions in memory can take up, roughly.
+
+    idle_timeout : float, default: 600
+        How many seconds a session can be left alone before it's evicted.
+
+    executor : ThreadPoolExecutor
+        The worker threads slow moves are made on.
+
+    sessions : OrderedDict[int, GameSession]
+        Every session currently being played, by session id, from least to most recently played.
+
+    resident_tiles : int
+        The total number of tiles on the boards of every session that isn't evicted.
+
+    eviction_task : asyncio.Task
+        Evicting sessions to get back under the memory budget, if it's being done.
+
+    session_ids : Iterator[int]
+        Gives out the id of each new session.
+
+    server : asyncio.Server
+        The listening server, once it's been started.
+    """
+
+    def __init__(
+        self,
+        host="127.0.0.1",
+        port=8765,
+        max_workers: int = None,
+        memory_budget: int = 256 * 1024 * 1024,
+        idle_timeout: float = 600,
+    ):
+        self.host = host
+        self.port = port
+        self.memory_budget = memory_budget
+        self.idle_timeout = idle_timeout
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="GameServer")
+        self.sessions = OrderedDict()
+        self.resident_tiles = 0
+        self.session_ids = count(1)
+        self.server = None
+        self.eviction_task = None
+
+    async def start(self):
+        """
+        Start listening for players.
+        """
+
+        self.server = await asyncio.start_server(self.handle_connection, self.host, self.port)
+
+    async def serve_forever(self):
+        """
+        Start listening for players (if the server hasn't been started yet) and keep serving them until cancelled.
+        """
+
+        if self.server is None:
+            await self.start()
+        idle_eviction_task = asyncio.create_task(self.evict_idle_sessions_forever())
+        try:
+            async with self.server:
+                await self.server.serve_forever()
+        finally:
+            idle_eviction_task.cancel()
+            self.executor.shutdown(wait=False)
+
+    async def evict_session(self, session: GameSession):
+        """
+        Evict a session's board from memory, once any move being made on it is done.
+
+        Parameters
+        ----------
+        session : GameSession
+            The session to evict.
+        """
+
+        async with session.lock:
+            if session.evicted_board is not None or session.session_id not in self.sessions:
+                return
+            if session.num_tiles > SLOW_MOVE_TILES:
+                await asyncio.get_running_loop().run_in_executor(self.executor, session.evict)
+            else:
+                session.evict()
+
+            # a session closed while it was being evicted has already been taken off the resident tiles
+            if self.sessions.get(session.session_id) is session:
+                self.resident_tiles -= session.num_tiles
+
+    async def enforce_memory_budget(self):
+        """
+        Evict the least recently played sessions until the boards in memory fit in the memory budget.
+        """
+
+        try:
+            for session in list(self.sessions.values()):
+                if self.resident_tiles * BYTES_PER_TILE <= self.memory_budget:
+                    break
+                await self.evict_session(session)
+        finally:
+            self.eviction_task = None
+
+    async def evict_idle_sessions_forever(self):
+        """
+        Evict every session that's been left alone for `idle_timeout` seconds, checking every so often until cancelled.
+        """
+
+        while True:
+            await asyncio.sleep(self.idle_timeout / 4)
+            idle_since = time.monotonic() - self.idle_timeout
+            for session in list(self.sessions.values()):
+
+                # the sessions are kept from least to most recently played, so the rest were played more recently
+                if session.last_used > idle_since:
+                    break
+                await self.evict_session(session)
+
+    def use_session(self, session: GameSession):
+        """
+        Mark a session as the most recently played one, and start evicting other sessions if the boards in memory have
+        gone over the memory budget.
+
+        Parameters
+        ----------
+        session : GameSession
+            The session being played.
+        """
+
+        session.last_used = time.monotonic()
+        self.sessions.move_to_end(session.session_id)
+        if self.resident_tiles * BYTES_PER_TILE > self.memory_budget and self.eviction_task is None:
+            self.eviction_task = asyncio.create_task(self.enforce_memory_budget())
+
+    def get_session(self, session_id: int) -> GameSession:
+        """
+        Get a session currently being played.
+
+        Parameters
+        ----------
+        session_id : int
+            The session's id.
+
+        Returns
+        -------
+        GameSession
+            The session.
+        """
+
+        session = self.sessions.get(session_id)
+        if session is None:
+            raise Exception("No such session")
+        return session
+
+    async def create_session(
+        self, width: int, height: int, num_mines: int, version: str, difficulty: str
+    ) -> GameSession:
+        """
+        Start a new session.
+
+        Parameters
+        ----------
+        width : int
+            The number of tiles wide the board is.
+
+        height : int
+            The number of tiles high the board is.
+
+        num_mines : int
+            The number of mines hidden in the board.
+
+        version : {"Minesweeper", "Minesweeper V", "Distance Minesweeper", "Weighted Minesweeper",
+                   "Negative Minesweeper"}
+            Which version of Minesweeper to play.
+
+        difficulty : {"easy", "medium", "hard"}
+            How difficult the game is (ONLY affects certain gamemodes, such as Distance Minesweeper).
+
+        Returns
+        -------
+        GameSession
+            The new session.
+        """
+
+        if width <= 0 or height <= 0 or width * height > MAX_BOARD_TILES or num_mines < 0:
+            raise Exception("Invalid board size or number of mines")
+
+        def create_controller() -> GameController:
+            controller = GameController(width, height, num_mines, version, difficulty, create_renderer=SessionRenderer)
+            controller.new_game()
+            return controller
+
+        # building a big board's tiles would hold up every other player, just like a slow move would
+        if width * height > SLOW_MOVE_TILES:
+            controller = await asyncio.get_running_loop().run_in_executor(self.executor, create_controller)
+        else:
+            controller = create_controller()
+
+        # the tiles kept clear around the first click depend on the version (ex. Minesweeper V keeps a 5x5 area clear)
+        if num_mines > controller.minesweeper_board.get_max_mines():
+            raise Exception("Invalid board size or number of mines")
+
+        session = GameSession(next(self.session_ids), controller)
+        self.sessions[session.session_id] = session
+        self.resident_tiles += session.num_tiles
+        self.use_session(session)
+        return session
+
+    def close_session(self, session_id: int):
+        """
+        End a session.
+
+        Parameters
+        ----------
+        session_id : int
+            The session's id.
+        """
+
+        session = self.sessions.pop(session_id, None)
+        if session is None:
+            raise Exception("No such session")
+        if session.evicted_board is None:
+            self.resident_tiles -= session.num_tiles
+
+    async def run_on_board(self, session: GameSession, function: Callable[[], Any], slow: bool) -> Any:
+        """
+        Run a function that needs a session's board in memory, once any move being made on it is done, unpacking the
+        board first if it's evicted.
+
+        Parameters
+        ----------
+        session : GameSession
+            The session whose board is needed.
+
+        function : Callable[[], Any]
+            The function to run.
+
+        slow : bool
+            Whether to run the function on a worker thread.
+
+        Returns
+        -------
+        Any
+            What the function returned.
+        """
+
+        def run_with_board():
+            if session.evicted_board is not None:
+                session.rehydrate()
+            return function()
+
+        async with session.lock:
+            was_evicted = session.evicted_board is not None
+            try:
+                if slow:
+                    return await asyncio.get_running_loop().run_in_executor(self.executor, run_with_board)
+                return run_with_board()
+            finally:
+
+                # a session closed while the function was running is left alone
+                if self.sessions.get(session.session_id) is session:
+                    if was_evicted and session.evicted_board is None:
+                        self.resident_tiles += session.num_tiles
+                    self.use_session(session)
+
+    async def handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """
+        Answer every request a player sends over their connection, until they disconnect.
+        Connections opening with `WireProtocol.HELLO` speak the binary wire format, and every other connection speaks
+        JSON.
+
+        Parameters
+        ----------
+        reader : asyncio.StreamReader
+            Reads the player's requests.
+
+        writer : asyncio.StreamWriter
+            Writes the responses back to the player.
+        """
+
+        try:
+            first_byte = await reader.read(1)
+            if first_byte == HELLO[:1]:
+                if await reader.readexactly(1) != HELLO[1:]:
+                    writer.write(frame(encode_error("Unsupported wire format version")))
+                    return
+                await self.handle_binary_requests(reader, writer)
+            elif first_byte:
+                await self.handle_json_requests(reader, writer, first_byte)
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    async def handle_json_requests(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter, first_byte: bytes = b""
+    ):
+        """
+        Answer every JSON request a player sends, one per line, until they disconnect.
+
+        Parameters
+        ----------
+        reader : asyncio.StreamReader
+            Reads the player's requests.
+
+        writer : asyncio.StreamWriter
+            Writes the responses back to the player.
+
+        first_byte : bytes, default: b""
+            The start of the first request, if it's already been read.
+        """
+
+        line = first_byte + await reader.readline()
+        while line:
+            request = None
+            try:
+                request = json.loads(line)
+                response = await self.handle_request(request)
+            except (ValueError, TypeError, KeyError, AttributeError) as error:
+                response = {"error": f"Invalid request: {error}"}
+            except Exception as error:
+                response = {"error": str(error)}
+            if isinstance(request, dict) and "id" in request:
+                response["id"] = request["id"]
+            writer.write(json.dumps(response, separators=(",", ":")).encode("utf-8") + b"\n")
+            await writer.drain()
+            line = await reader.readline()
+
+    async def handle_request(self, request: dict) -> dict:
+        """
+        Handle a single JSON request from a player.
+
+        Parameters
+        ----------
+        request : dict
+            The request.
+
+        Returns
+        -------
+        dict
+            The response to send the player.
+        """
+
+        match request["op"]:
+            case "new":
+                session = await self.create_session(
+                    int(request.get("width", 16)),
+                    int(request.get("height", 16)),
+                    int(request.get("mines", 40)),
+                    request.get("version", "Minesweeper"),
+                    request.get("difficulty", "medium"),
+                )
+                controller = session.controller
+                return {"session": session.session_id, "width": controller.width, "height": controller.height}
+            case "move":
+                session = self.get_session(request["session"])
+                row, col, mouse_button = int(request["row"]), int(request["col"]), request.get("button", "left")
+
+                def move():
+                    changed_tiles = session.make_move(row, col, mouse_button)
+                    controller = session.controller
+                    board = controller.minesweeper_board.board
+                    return {
+                        "changed": [[row, col, get_tile_state(board[row][col])] for row, col in changed_tiles],
+                        "game_over": not controller.game_running,
+                        "won": controller.game_won,
+                    }
+
+                return await self.run_on_board(session, move, session.is_slow_move(mouse_button))
+            case "snapshot":
+                session = self.get_session(request["session"])
+
+                def snapshot():
+                    controller = session.controller
+                    return {
+                        "tiles": [
+                            [get_tile_state(tile) for tile in tile_row]
+                            for tile_row in controller.minesweeper_board.board
+                        ],
+                        "game_over": not controller.game_running,
+                        "won": controller.game_won,
+                    }
+
+                return await self.run_on_board(session, snapshot, session.num_tiles > SLOW_MOVE_TILES)
+            case "close":
+                self.close_session(request["session"])
+                return {"closed": request["session"]}
+            case op:
+                return {"error": f"Unknown op {op!r}"}
+
+    async def handle_binary_requests(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """
+        Answer every binary request a player sends, until they disconnect.
+
+        Parameters
+        ----------
+        reader : asyncio.StreamReader
+            Reads the player's requests.
+
+        writer : asyncio.StreamWriter
+            Writes the responses back to the player.
+        """
+
+        while (payload := await read_frame(reader, MAX_REQUEST_SIZE)) is not None:
+            try:
+                response = await self.handle_binary_request(payload)
+            except (ValueError, IndexError) as error:
+                response = encode_error(f"Invalid request: {error}")
+            except Exception as error:
+                response = encode_error(str(error))
+            writer.write(frame(response))
+            await writer.drain()
+
+    async def handle_binary_request(self, payload: bytes) -> bytes:
+        """
+        Handle a single binary request from a player.
+
+        Parameters
+        ----------
+        payload : bytes
+            The request's payload.
+
+        Returns
+        -------
+        bytes
+            The payload of the response to send the player.
+        """
+
+        match decode_request(payload):
+            case (b"n", width, height, num_mines, version, difficulty):
+                session = await self.create_session(width, height, num_mines, version, difficulty)
+                return encode_numbers(b"N", session.session_id, width, height, get_value_scale(version))
+            case (b"m", session_id, index, mouse_button):
+                session = self.get_session(session_id)
+                controller = session.controller
+                row, col = divmod(index, controller.width)
+
+                def move():
+                    changed_tiles = session.make_move(row, col, mouse_button)
+                    return encode_delta(
+                        controller.minesweeper_board,
+                        changed_tiles,
+                        not controller.game_running,
+                        controller.game_won,
+                        get_value_scale(controller.version),
+                    )
+
+                return await self.run_on_board(session, move, session.is_slow_move(mouse_button))
+            case (b"s", session_id):
+                session = self.get_session(session_id)
+                controller = session.controller
+
+                def snapshot():
+                    return encode_snapshot(
+                        controller.minesweeper_board,
+                        not controller.game_running,
+                        controller.game_won,
+                        get_value_scale(controller.version),
+                    )
+
+                return await self.run_on_board(session, snapshot, session.num_tiles > SLOW_MOVE_TILES)
+            case (b"c", session_id):
+                self.close_session(session_id)
+                return encode_numbers(b"C", session_id)
+
+
+if __name__ == "__main__":
+    try:
+        asyncio.run(GameServer(port=int(sys.argv[1]) if len(sys.argv) > 1 else 8765).serve_forever())
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,368 @@
+"""
+A load generator for the game server, which has many simulated players play against it at once and reports how fast it
+kept up with them.
+
+Each player is a bot with its own connection, speaking the binary wire format (see `WireProtocol`). It plays one game
+after another in its version, keeping track of the board from each move's changes, and makes every move as soon as the
+response to its last one arrives: it reveals a random hidden tile, except for every so often planting a flag instead.
+Players are given versions in turn, so every version is played by about the same number of players.
+
+The time from sending each request to reading its response is recorded by version and by kind of request ("new" for
+starting a game, "left" for reveals and "right" for flags), and reported as the number of requests a second along with
+the 50th, 95th and 99th percentile latencies. By default a server is started in its own process to play against over
+loopback, so the players and the server don't slow each other down by sharing an event loop.
+
+Run it with `python LoadTest.py --players 200 --seconds 30 --versions "Distance Minesweeper" "Minesweeper V"`, and see
+`python LoadTest.py --help` for every option.
+"""
+
+import argparse
+import asyncio
+import multiprocessing
+import random
+import time
+from GameServer import GameServer
+from WireProtocol import (
+    HELLO,
+    decode_delta,
+    decode_numbers,
+    encode_move_request,
+    encode_new_request,
+    encode_session_request,
+    frame,
+    read_frame,
+)
+
+VERSIONS = ("Minesweeper", "Minesweeper V", "Distance Minesweeper", "Weighted Minesweeper", "Negative Minesweeper")
+
+# the kinds of request latencies are recorded for
+REQUEST_KINDS = ("new", "left", "right")
+
+
+class SimulatedPlayer:
+    """
+    A bot playing games against the server over its own connection, one after another, as fast as it can.
+
+    Attributes
+    ----------
+    version : {"Minesweeper", "Minesweeper V", "Distance Minesweeper", "Weighted Minesweeper", "Negative Minesweeper"}
+        Which version of Minesweeper the player plays.
+
+    width : int
+        The number of tiles wide each board is.
+
+    height : int
+        The number of tiles high each board is.
+
+    num_mines : int
+        The number of mines hidden in each board.
+
+    difficulty : str
+        How difficult each game is (ONLY affects certain gamemodes, such as Distance Minesweeper).
+
+    flag_rate : float
+        The chance of each move planting a flag rather than revealing a tile.
+
+    rng : random.Random
+        Picks the player's moves.
+
+    latencies : dict[str, list[float]]
+        How many seconds each request took to be answered, by kind of request.
+
+    games_played : int
+        The number of games the player has finished.
+
+    error : Exception
+        What stopped the player early, if anything did.
+    """
+
+    def __init__(
+        self, version: str, width: int, height: int, num_mines: int, difficulty: str, flag_rate: float, seed: int
+    ):
+        self.version = version
+        self.width = width
+        self.height = height
+        self.num_mines = num_mines
+        self.difficulty = difficulty
+        self.flag_rate = flag_rate
+        self.rng = random.Random(seed)
+        self.latencies = {request_kind: [] for request_kind in REQUEST_KINDS}
+        self.games_played = 0
+        self.error = None
+
+    async def play(self, host: str, port: int, deadline: float):
+        """
+        Play games against the server until the deadline, finishing the game in progress when it passes.
+        Any error stops the player early, and is kept in `error` rather than stopping every other player too.
+
+        Parameters
+        ----------
+        host : str
+            The server's address.
+
+        port : int
+            The server's port.
+
+        deadline : float
+            When to stop starting new games (by `time.perf_counter`).
+        """
+
+        try:
+            reader, writer = await asyncio.open_connection(host, port)
+        except OSError as error:
+            self.error = error
+            return
+        writer.write(HELLO)
+
+        async def request(request_kind: str, payload: bytes) -> bytes:
+            start_time = time.perf_counter()
+            writer.write(frame(payload))
+            await writer.drain()
+            response = await read_frame(reader)
+            self.latencies[request_kind].append(time.perf_counter() - start_time)
+            if response is None:
+                raise ConnectionError("The server closed the connection")
+            if response[:1] == b"E":
+                raise Exception(response[1:].decode("utf-8"))
+            return response
+
+        try:
+            while time.perf_counter() < deadline:
+                response = await request(
+                    "new", encode_new_request(self.width, self.height, self.num_mines, self.version, self.difficulty)
+                )
+                session_id, width, _, value_scale = decode_numbers(response)
+                await self.play_game(request, session_id, width, value_scale)
+                writer.write(frame(encode_session_request(b"c", session_id)))
+                await writer.drain()
+                await read_frame(reader)
+                self.games_played += 1
+        except Exception as error:
+            self.error = error
+        finally:
+            writer.close()
+
+    async def play_game(self, request, session_id: int, width: int, value_scale: int):
+        """
+        Play a single game until it's over.
+
+        Parameters
+        ----------
+        request : Callable[[str, bytes], Awaitable[bytes]]
+            Sends a request, recording its latency under the given kind, and returns the response's payload.
+
+        session_id : int
+            The session the game is being played in.
+
+        width : int
+            The number of tiles wide the board is.
+
+        value_scale : int
+            How much tile values are multiplied by in the game's deltas.
+        """
+
+        # the indexes of the hidden tiles without a flag, as a list to pick from at random and where each one is in it
+        hidden_tiles = list(range(self.width * self.height))
+        hidden_positions = {index: position for position, index in enumerate(hidden_tiles)}
+
+        def remove_hidden_tile(index: int):
+            position = hidden_positions.pop(index, None)
+            if position is not None:
+                last_index = hidden_tiles.pop()
+                if last_index != index:
+                    hidden_tiles[position] = last_index
+                    hidden_positions[last_index] = position
+
+        first_move_made = False
+        while hidden_tiles:
+            index = self.rng.choice(hidden_tiles)
+            mouse_button = "right" if first_move_made and self.rng.random() < self.flag_rate else "left"
+            first_move_made = True
+
+            response = await request(mouse_button, encode_move_request(session_id, index, mouse_button))
+            changed_tiles, game_state = decode_delta(response, width, value_scale)
+            if game_state:
+                return
+
+            for row, col, tile_state in changed_tiles:
+                if tile_state != "#":
+                    remove_hidden_tile(row * width + col)
+
+            # flagged tiles are left alone from then on, so games always end by revealing every other tile or a mine
+            if mouse_button == "right":
+                remove_hidden_tile(index)
+
+
+def get_percentile(sorted_values: list[float], percentile: float) -> float:
+    """
+    Get a percentile of some values, by the nearest-rank method.
+
+    Parameters
+    ----------
+    sorted_values : list[float]
+        The values, sorted from smallest to largest.
+
+    percentile : float
+        The percentile to get, between 0 and 100.
+
+    Returns
+    -------
+    float
+        The value at that percentile, or NaN if there are no values.
+    """
+
+    if not sorted_values:
+        return float("nan")
+    rank = max(1, -int(-percentile * len(sorted_values) // 100))
+    return sorted_values[rank - 1]
+
+
+def report(players: list[SimulatedPlayer], seconds_taken: float):
+    """
+    Print the throughput and latencies of every version and kind of request the players made.
+
+    Parameters
+    ----------
+    players : list[SimulatedPlayer]
+        The players, once they've finished playing.
+
+    seconds_taken : float
+        How many seconds the players were playing for.
+    """
+
+    print(f"{len(players)} players for {seconds_taken:.1f}s")
+    print(f"{'version':<22}{'request':<9}{'count':>9}{'per sec':>10}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}")
+
+    total_requests = 0
+    for version in dict.fromkeys(player.version for player in players):
+        version_players = [player for player in players if player.version == version]
+        games_played = sum(player.games_played for player in version_players)
+        for request_kind in REQUEST_KINDS:
+            latencies = sorted(latency for player in version_players for latency in player.latencies[request_kind])
+            total_requests += len(latencies)
+            percentiles = [get_percentile(latencies, percentile) * 1000 for percentile in (50, 95, 99)]
+            print(
+                f"{version:<22}{request_kind:<9}{len(latencies):>9}{len(latencies) / seconds_taken:>10.1f}"
+                + "".join(f"{latency:>9.2f}" for latency in percentiles)
+            )
+        print(f"{version:<22}{'games':<9}{games_played:>9}{games_played / seconds_taken:>10.1f}")
+    print(f"{'total':<31}{total_requests:>9}{total_requests / seconds_taken:>10.1f}")
+
+    errors = [player.error for player in players if player.error is not None]
+    if errors:
+        print(f"{len(errors)} players stopped early, the first by: {errors[0]!r}")
+
+
+def run_server(port_queue: multiprocessing.Queue, max_workers: int):
+    """
+    Run a game server on any free loopback port, sending the port it's listening on back through a queue.
+    This is run in its own process.
+
+    Parameters
+    ----------
+    port_queue : multiprocessing.Queue
+        Where to send the server's port.
+
+    max_workers : int
+        The number of worker threads the server makes slow moves on.
+    """
+
+    async def serve():
+        server = GameServer(port=0, max_workers=max_workers)
+        await server.start()
+        port_queue.put(server.server.sockets[0].getsockname()[1])
+        await server.serve_forever()
+
+    try:
+        asyncio.run(serve())
+    except KeyboardInterrupt:
+        pass
+
+
+async def run_load_test(
+    host: str, port: int, players: list[SimulatedPlayer], seconds: float, ramp_up: float = 0
+) -> float:
+    """
+    Have every player play against the server for a number of seconds.
+
+    Parameters
+    ----------
+    host : str
+        The server's address.
+
+    port : int
+        The server's port.
+
+    players : list[SimulatedPlayer]
+        The players.
+
+    seconds : float
+        How many seconds the players keep starting new games for.
+
+    ramp_up : float, default: 0
+        How many seconds to spread the players joining over, instead of them all connecting at once.
+
+    Returns
+    -------
+    float
+        How many seconds it took for every player to finish.
+    """
+
+    start_time = time.perf_counter()
+    deadline = start_time + seconds
+
+    async def join(player_number: int, player: SimulatedPlayer):
+        await asyncio.sleep(ramp_up * player_number / len(players))
+        await player.play(host, port, deadline)
+
+    await asyncio.gather(*(join(player_number, player) for player_number, player in enumerate(players)))
+    return time.perf_counter() - start_time
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Load test the game server with simulated players.")
+    parser.add_argument("--players", type=int, default=100, help="the number of players playing at once")
+    parser.add_argument("--seconds", type=float, default=10, help="how long the players keep starting new games")
+    parser.add_argument("--ramp-up", type=float, default=1, help="how many seconds to spread the players joining over")
+    parser.add_argument("--versions", nargs="+", default=VERSIONS, choices=VERSIONS, help="the versions to play")
+    parser.add_argument("--width", type=int, default=16)
+    parser.add_argument("--height", type=int, default=16)
+    parser.add_argument("--mines", type=int, default=40)
+    parser.add_argument("--difficulty", default="medium", choices=("easy", "medium", "hard"))
+    parser.add_argument("--flag-rate", type=float, default=0.1, help="the chance of each move planting a flag")
+    parser.add_argument("--seed", type=int, default=0, help="seeds the players' moves")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, help="the port of a server already running, instead of starting one")
+    parser.add_argument("--max-workers", type=int, help="the worker threads of the server started for the test")
+    arguments = parser.parse_args()
+
+    server_process = None
+    if arguments.port is None:
+        port_queue = multiprocessing.Queue()
+        server_process = multiprocessing.Process(target=run_server, args=(port_queue, arguments.max_workers))
+        server_process.start()
+        arguments.port = port_queue.get()
+
+    simulated_players = [
+        SimulatedPlayer(
+            arguments.versions[player_number % len(arguments.versions)],
+            arguments.width,
+            arguments.height,
+            arguments.mines,
+            arguments.difficulty,
+            arguments.flag_rate,
+            arguments.seed + player_number,
+        )
+        for player_number in range(arguments.players)
+    ]
+    try:
+        report(
+            simulated_players,
+            asyncio.run(
+                run_load_test(arguments.host, arguments.port, simulated_players, arguments.seconds, arguments.ramp_up)
+            ),
+        )
+    finally:
+        if server_process is not None:
+            server_process.terminate()
+            server_process.join()
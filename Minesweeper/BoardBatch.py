@@ -0,0 +1,474 @@
+import random
+from typing import Sequence
+from Minesweeper.BoardSnapshot import DIGITS_TO_BYTES
+
+# how many tiles out in every direction a mine numbers the tiles around it, and a reveal spreads, in each version a
+# batch can be made of (the rest have values that can't be worked out from their neighbours' mines alone)
+REACHES = {"Minesweeper": 1, "Minesweeper V": 2}
+
+# translation table from a byte offset by 128 to the same number as a signed byte
+UNSIGNED_TO_SIGNED = bytes((value - 128) & 0xFF for value in range(256))
+
+
+class BoardBatch:
+    """
+    Many boards of the same version and size played at once, a move on every board per step, for bots to play millions
+    of games on without a tile object (or even a board object) per game.
+
+    Every property of every tile in the batch is a single bit of one big python integer (a bitboard): the mines, the
+    numbered tiles, the revealed tiles and so on. Each board's rows are laid out one after another, with `reach` blank
+    columns between them and `reach` blank rows after the board, so shifting a bitboard by a neighbour's offset lines
+    every tile up with that neighbour without spilling into other rows or boards. That turns a step's work on every
+    board at once into a handful of shifts, ands and ors, which python does on the whole integer in C: a batch of
+    boards is numbered with a counter built out of bitboards (one per bit of the count), and revealed with a flood fill
+    that grows out from every board's click at once.
+
+    Boards play exactly like the version's own board class: each board is generated on its first reveal, keeping the
+    tiles around it clear, and a board whose random number generator is seeded the same as a `MinesweeperBoard`'s gets
+    the same mines. Moves don't update any player stats.
+
+    Attributes
+    ----------
+    minesweeper_version : {"Minesweeper", "Minesweeper V"}
+        The name of the Minesweeper version every board is playing.
+
+    num_boards : int
+        The number of boards in the batch.
+
+    board_width : int
+        The number of tiles wide each board is.
+
+    board_height : int
+        The number of tiles high each board is.
+
+    num_mines : int
+        The number of mines hidden in each board.
+
+    reach : int
+        How many tiles out a tile's neighbours go in every direction.
+
+    row_stride : int
+        The number of bits from the start of one row of a board to the start of the next.
+
+    board_stride : int
+        The number of bits from the start of one board to the start of the next (always a whole number of bytes).
+
+    rngs : list[random.Random]
+        The random number generator each board's mines are placed with.
+
+    generated : list[bool]
+        Whether each board has been generated yet.
+
+    game_over : list[bool]
+        Whether each board's game is over.
+
+    won : list[bool]
+        Whether each board's game was won.
+
+    mines : int
+        The bitboard of every mine.
+
+    empty_tiles : int
+        The bitboard of every tile without a mine or any mines around it.
+
+    mine_counts : list[int]
+        The number of mines around each tile, as one bitboard per bit of the count (least significant first).
+
+    revealed : int
+        The bitboard of every revealed tile.
+
+    flags : int
+        The bitboard of every tile a flag was planted on and not taken off again with another flag. A flag taken off by
+        revealing its tile is left in, since the tiles around it keep the value the flag gave them.
+
+    tile_mask : int
+        The bitboard of every tile on every board, leaving out the blank rows and columns between them.
+    """
+
+    def __init__(
+        self,
+        num_boards: int,
+        width=16,
+        height=16,
+        num_mines=40,
+        minesweeper_version="Minesweeper",
+        seeds: Sequence[int] = None,
+    ):
+        if minesweeper_version not in REACHES:
+            raise Exception(f"Boards of {minesweeper_version} can't be batched")
+        if width <= 0 or height <= 0 or num_boards <= 0:
+            raise Exception("Invalid batch size")
+
+        self.minesweeper_version = minesweeper_version
+        self.num_boards = num_boards
+        self.board_width = width
+        self.board_height = height
+        self.num_mines = num_mines
+        self.reach = REACHES[minesweeper_version]
+        self.row_stride = width + self.reach
+        self.board_stride = -(-(height + self.reach) * self.row_stride // 8) * 8
+
+        # the offset of each of a tile's neighbours, and a single board's tiles repeated onto every board
+        self.neighbour_offsets = [
+            row_offset * self.row_stride + col_offset
+            for row_offset in range(-self.reach, self.reach + 1)
+            for col_offset in range(-self.reach, self.reach + 1)
+            if row_offset or col_offset
+        ]
+        self.board_tile_mask = sum(((1 << width) - 1) << row * self.row_stride for row in range(height))
+        self.tile_mask = self.board_tile_mask * self._board_selector(range(num_boards))
+
+        self.rngs = [random.Random() for _ in range(num_boards)]
+        self.generated = [False] * num_boards
+        self.game_over = [False] * num_boards
+        self.won = [False] * num_boards
+        self.mines = 0
+        self.empty_tiles = 0
+        self.mine_counts = []
+        self.revealed = 0
+        self.flags = 0
+        self.reset(seeds=seeds)
+
+    def reset(self, board_numbers: Sequence[int] = None, seeds: Sequence[int] = None):
+        """
+        Start new games on some of the boards, leaving them blank until their first reveal.
+
+        Parameters
+        ----------
+        board_numbers : Sequence[int], optional
+            The boards to start new games on, defaults to every board.
+
+        seeds : Sequence[int], optional
+            The seed for each board's random number generator, in the same order as `board_numbers`. Each board's
+            generator carries on from where it was if left empty.
+        """
+
+        if board_numbers is None:
+            board_numbers = range(self.num_boards)
+        if seeds is not None:
+            for board_number, seed in zip(board_numbers, seeds):
+                self.rngs[board_number].seed(seed)
+
+        keep_mask = ~(self.board_tile_mask * self._board_selector(board_numbers))
+        self.mines &= keep_mask
+        self.empty_tiles &= keep_mask
+        self.mine_counts = [count_bits & keep_mask for count_bits in self.mine_counts]
+        self.revealed &= keep_mask
+        self.flags &= keep_mask
+        for board_number in board_numbers:
+            self.generated[board_number] = False
+            self.game_over[board_number] = False
+            self.won[board_number] = False
+
+    def generate(self, first_clicks: dict[int, tuple[int, int]]):
+        """
+        Generate random boards around their first clicks, all in one go.
+        Any flags planted on them beforehand are taken off, just as they are when a regular board is generated.
+
+        Parameters
+        ----------
+        first_clicks : dict[int, tuple[int, int]]
+            The (row, col) coordinates of the first click on each board to generate, by board number.
+        """
+
+        if not first_clicks:
+            return
+
+        # the mines are set a byte at a time and turned into a bitboard at the end, since setting a bit of a huge
+        # integer copies the whole integer
+        mine_bytes = bytearray(self.mines.to_bytes(self.num_boards * self.board_stride // 8, "little"))
+        for board_number, first_click_coords in first_clicks.items():
+            board_start = board_number * self.board_stride
+            for row, col in self._get_mine_locations(self.rngs[board_number], first_click_coords):
+                position = board_start + row * self.row_stride + col
+                mine_bytes[position >> 3] |= 1 << (position & 7)
+            self.generated[board_number] = True
+        self.mines = int.from_bytes(mine_bytes, "little")
+        self.flags &= ~(self.board_tile_mask * self._board_selector(first_clicks))
+
+        # number every tile of every board at once, by adding up the mines lined up with each of its neighbours
+        self.mine_counts = []
+        for offset in self.neighbour_offsets:
+            self._add_to_counter(self.mine_counts, self._shift(self.mines, offset) & self.tile_mask)
+        any_mines_around = 0
+        for count_bits in self.mine_counts:
+            any_mines_around |= count_bits
+        self.empty_tiles = self.tile_mask & ~self.mines & ~any_mines_around
+
+    def step(self, moves: Sequence[tuple[str, int, int] | None]):
+        """
+        Make one move on every board, or leave a board alone for the step. Moves on boards whose game is over, and
+        clicks off the board, are ignored.
+
+        Parameters
+        ----------
+        moves : Sequence[tuple[str, int, int] | None]
+            The move to make on each board, as (mouse button, row, col), or None to not move on a board.
+        """
+
+        if len(moves) != self.num_boards:
+            raise Exception(f"Expected a move for each of the {self.num_boards} boards, got {len(moves)}")
+
+        # boards are generated on their first reveal, before anything else is revealed
+        first_clicks = {}
+        for board_number, move in enumerate(moves):
+            if move is not None and move[0] == "left" and not self.generated[board_number]:
+                if not self.game_over[board_number] and self._on_board(move[1], move[2]):
+                    first_clicks[board_number] = (move[1], move[2])
+        self.generate(first_clicks)
+
+        num_bytes = self.num_boards * self.board_stride // 8
+        revealed_bytes = self.revealed.to_bytes(num_bytes, "little")
+        shown_flag_bytes = (self.flags & ~self.revealed).to_bytes(num_bytes, "little")
+        mine_bytes = self.mines.to_bytes(num_bytes, "little")
+
+        click_bytes = bytearray(num_bytes)
+        flag_toggle_bytes = bytearray(num_bytes)
+        clicked_boards = []
+        lost_boards = []
+        for board_number, move in enumerate(moves):
+            if move is None or self.game_over[board_number] or not self._on_board(move[1], move[2]):
+                continue
+            mouse_button, row, col = move
+            position = board_number * self.board_stride + row * self.row_stride + col
+            byte_index, bit = position >> 3, 1 << (position & 7)
+
+            if mouse_button == "right":
+                if not revealed_bytes[byte_index] & bit:
+                    flag_toggle_bytes[byte_index] |= bit
+            elif mouse_button == "left":
+                clicked_boards.append(board_number)
+                if shown_flag_bytes[byte_index] & bit:
+                    continue
+                click_bytes[byte_index] |= bit
+                if mine_bytes[byte_index] & bit:
+                    lost_boards.append(board_number)
+            else:
+                raise Exception(f"Invalid button {mouse_button!r}")
+
+        self.flags ^= int.from_bytes(flag_toggle_bytes, "little")
+        self.revealed |= self.flood_fill(int.from_bytes(click_bytes, "little"))
+
+        # a lost board has every tile revealed, and the rest of the boards that were clicked are checked for a win
+        if lost_boards:
+            self.revealed |= self.board_tile_mask * self._board_selector(lost_boards)
+            for board_number in lost_boards:
+                self.game_over[board_number] = True
+        unfinished_bytes = (self.tile_mask & ~self.revealed & ~(self.flags & self.mines)).to_bytes(num_bytes, "little")
+        board_num_bytes = self.board_stride // 8
+        finished_board = bytes(board_num_bytes)
+        for board_number in clicked_boards:
+            board_start = board_number * board_num_bytes
+            if (
+                not self.game_over[board_number]
+                and unfinished_bytes[board_start : board_start + board_num_bytes] == finished_board
+            ):
+                self.game_over[board_number] = True
+                self.won[board_number] = True
+
+    def flood_fill(self, clicks: int) -> int:
+        """
+        Find every tile that revealing the clicked tiles reveals, on every board at once.
+        Reveals spread out from empty tiles to every tile around them that isn't a mine, stopping at tiles that were
+        already revealed.
+
+        Parameters
+        ----------
+        clicks : int
+            The bitboard of the clicked tiles, which shouldn't have flags on them.
+
+        Returns
+        -------
+        int
+            The bitboard of every tile to reveal.
+        """
+
+        can_reveal = self.tile_mask & ~self.mines & ~self.revealed
+        to_reveal = clicks & ~self.revealed
+        frontier = to_reveal & self.empty_tiles
+        while frontier:
+            spread = 0
+            for offset in self.neighbour_offsets:
+                spread |= self._shift(frontier, offset)
+            spread &= can_reveal & ~to_reveal
+            to_reveal |= spread
+            frontier = spread & self.empty_tiles
+        return to_reveal
+
+    def get_planes(self) -> tuple[bytes, bytes, bytes, bytes]:
+        """
+        Get the tiles of every board as flat planes of one byte per tile, board after board and row after row (the
+        layout of a C-ordered array of shape (num_boards, board_height, board_width)), to be wrapped without copying by
+        `memoryview`, `array` or `numpy.frombuffer`.
+
+        Returns
+        -------
+        tuple[bytes, bytes, bytes, bytes]
+            Whether each tile is revealed (0 or 1), whether it has a flag shown on it (0 or 1), whether it's a revealed
+            mine (0 or 1), and its value as a signed byte (the number of mines around it less the number of flags
+            planted around it for numbered tiles, and 0 for every other tile), whether or not it's revealed.
+        """
+
+        num_cells = self.num_boards * self.board_stride
+
+        # counts are at most 24, so the counter's bitboards can be spread out to a byte per tile and added together as
+        # integers without any byte carrying into the next
+        flag_counts = []
+        for offset in self.neighbour_offsets:
+            self._add_to_counter(flag_counts, self._shift(self.flags, offset) & self.tile_mask)
+        numbered_tiles = self.tile_mask & ~self.mines & ~self.empty_tiles
+        mine_count_bytes = sum(
+            int.from_bytes(self._to_cells(count_bits & numbered_tiles, num_cells), "little") << bit
+            for bit, count_bits in enumerate(self.mine_counts)
+        )
+        flag_count_bytes = sum(
+            int.from_bytes(self._to_cells(count_bits & numbered_tiles, num_cells), "little") << bit
+            for bit, count_bits in enumerate(flag_counts)
+        )
+
+        # the value of each byte is offset by 128 to keep the subtraction from borrowing, then shifted back to signed
+        offset_bytes = int.from_bytes(b"\x80" * num_cells, "little")
+        values = (
+            (offset_bytes + mine_count_bytes - flag_count_bytes)
+            .to_bytes(num_cells, "little")
+            .translate(UNSIGNED_TO_SIGNED)
+        )
+        return (
+            self._strip_padding(self._to_cells(self.revealed, num_cells)),
+            self._strip_padding(self._to_cells(self.flags & ~self.revealed, num_cells)),
+            self._strip_padding(self._to_cells(self.mines & self.revealed, num_cells)),
+            self._strip_padding(values),
+        )
+
+    def get_visible_board(self, board_number: int) -> list[list[str | int]]:
+        """
+        Get what a player should be shown for every tile of a board, just as `GameServer.get_tile_state` shows it.
+
+        Parameters
+        ----------
+        board_number : int
+            The board to show.
+
+        Returns
+        -------
+        list[list[str | int]]
+            "#" for each hidden tile, "F" for each tile with a flag, "B" for each revealed mine, or the value of any
+            other revealed tile, by row then column.
+        """
+
+        board_start = board_number * self.board_stride
+        flag_counts = []
+        for offset in self.neighbour_offsets:
+            self._add_to_counter(flag_counts, self._shift(self.flags, offset))
+
+        def get_bit(bits: int, position: int) -> int:
+            return bits >> position & 1
+
+        visible_board = []
+        for row in range(self.board_height):
+            visible_row = []
+            for col in range(self.board_width):
+                position = board_start + row * self.row_stride + col
+                if not get_bit(self.revealed, position):
+                    visible_row.append("F" if get_bit(self.flags, position) else "#")
+                elif get_bit(self.mines, position):
+                    visible_row.append("B")
+                elif get_bit(self.empty_tiles, position):
+                    visible_row.append(0)
+                else:
+                    visible_row.append(
+                        sum(get_bit(count_bits, position) << bit for bit, count_bits in enumerate(self.mine_counts))
+                        - sum(get_bit(count_bits, position) << bit for bit, count_bits in enumerate(flag_counts))
+                    )
+            visible_board.append(visible_row)
+        return visible_board
+
+    def _on_board(self, row: int, col: int) -> bool:
+        return 0 <= row < self.board_height and 0 <= col < self.board_width
+
+    def _get_mine_locations(self, rng: random.Random, first_click_coords: tuple[int, int]) -> list[tuple[int, int]]:
+        """
+        Pick random locations on a board to hide mines on, keeping them away from the first click.
+        This picks them exactly as `MinesweeperBoard._get_mine_locations` does, so boards seeded the same match.
+
+        Parameters
+        ----------
+        rng : random.Random
+            The board's random number generator.
+
+        first_click_coords : tuple[int, int]
+            The coordinates of the first tile clicked, to keep it and the tiles around it clear of mines.
+
+        Returns
+        -------
+        list[tuple[int, int]]
+            The (row, col) coordinates of each mine, in a random order.
+        """
+
+        first_row, first_col = first_click_coords
+        safe_positions = [
+            row * self.board_width + col
+            for row in range(max(first_row - self.reach, 0), min(first_row + self.reach + 1, self.board_height))
+            for col in range(max(first_col - self.reach, 0), min(first_col + self.reach + 1, self.board_width))
+        ]
+
+        num_positions = self.board_width * self.board_height - len(safe_positions)
+        mine_locations = []
+        for position in rng.sample(range(num_positions), self.num_mines):
+            for safe_position in safe_positions:
+                if position >= safe_position:
+                    position += 1
+            mine_locations.append(divmod(position, self.board_width))
+        return mine_locations
+
+    def _board_selector(self, board_numbers) -> int:
+        """
+        Get the number that a single board's bitboard is multiplied by to repeat it onto each of the given boards.
+        """
+
+        selector_bytes = bytearray(self.num_boards * self.board_stride // 8)
+        for board_number in board_numbers:
+            selector_bytes[board_number * self.board_stride // 8] = 1
+        return int.from_bytes(selector_bytes, "little")
+
+    @staticmethod
+    def _shift(bits: int, offset: int) -> int:
+        """
+        Line every tile up with its neighbour at the given offset, so each tile's bit is the bit of that neighbour.
+        """
+
+        return bits >> offset if offset > 0 else bits << -offset
+
+    @staticmethod
+    def _add_to_counter(counter: list[int], bits: int):
+        """
+        Add 1 to the count of every tile set in a bitboard, in a counter made of one bitboard per bit of the count.
+        """
+
+        for bit in range(len(counter)):
+            carry = counter[bit] & bits
+            counter[bit] ^= bits
+            bits = carry
+            if not bits:
+                return
+        if bits:
+            counter.append(bits)
+
+    @staticmethod
+    def _to_cells(bits: int, num_cells: int) -> bytes:
+        """
+        Spread a bitboard out to one 0 or 1 byte per bit, in the order of the bits.
+        """
+
+        return format(bits, f"0{num_cells}b")[::-1].encode("ascii").translate(DIGITS_TO_BYTES)
+
+    def _strip_padding(self, cells: bytes) -> bytes:
+        """
+        Cut the blank rows and columns out of one byte per bit of a bitboard, leaving only the tiles.
+        """
+
+        return b"".join(
+            cells[board_start + row * self.row_stride : board_start + row * self.row_stride + self.board_width]
+            for board_start in range(0, len(cells), self.board_stride)
+            for row in range(self.board_height)
+        )
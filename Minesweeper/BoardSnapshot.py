@@ -0,0 +1,379 @@
+"""
+A compact, versioned binary format for saving minesweeper boards of every version mid-game.
+
+Instead of pickling every tile object, a snapshot stores each per-tile property as its own plane: the true/false
+properties (mines, negative mines, numbered tiles, revealed tiles, flags and negative flags) are packed 8 tiles to a
+byte, and the values are stored as one signed byte per tile (or one double for versions with float values).
+
+Layout (all numbers little-endian):
+- header: magic b"MSWP", format version (u16), version name length (u16) and the utf-8 version name
+- settings: width, height, number of mines and number of negative mines (u32 each), distance weight (f64),
+  value type code (1 byte, "b" or "d") and whether the board has been generated yet (1 byte)
+- the 6 bit planes, each ceil(width * height / 8) bytes, tiles in row-major order
+- the value plane, width * height values
+"""
+
+import gc
+import struct
+import sys
+from array import array
+from itertools import repeat
+from operator import attrgetter, is_
+from Minesweeper.MinesweeperTile import FLOAT_VALUE_VERSIONS, Tile, MinesweeperTile
+from Minesweeper.MappedTileGrid import MappedTileGrid
+from Minesweeper.MinesweeperBoard import MinesweeperBoard
+from Minesweeper.MinesweeperVBoard import MinesweeperVBoard
+from Minesweeper.DistanceMinesweeperBoard import DistanceMinesweeperBoard
+from Minesweeper.WeightedMinesweeperBoard import WeightedMinesweeperBoard
+from Minesweeper.NegativeMinesweeperBoard import NegativeMinesweeperBoard
+from PlayerStats import PlayerStats
+
+MAGIC = b"MSWP"
+FORMAT_VERSION = 1
+
+HEADER = struct.Struct("<4sHH")
+SETTINGS = struct.Struct("<IIIIdc?")
+
+# the board class for each version
+BOARD_CLASSES = {
+    "Minesweeper": MinesweeperBoard,
+    "Minesweeper V": MinesweeperVBoard,
+    "Distance Minesweeper": DistanceMinesweeperBoard,
+    "Weighted Minesweeper": WeightedMinesweeperBoard,
+    "Negative Minesweeper": NegativeMinesweeperBoard,
+}
+
+# translation tables between one byte per tile (0 or 1) and the ascii digits python can parse as a binary number
+BYTES_TO_DIGITS = bytes.maketrans(b"\x00\x01", b"01")
+DIGITS_TO_BYTES = bytes.maketrans(b"01", b"\x00\x01")
+
+# translation tables from each tile's `flag_planted` to whether it has a positive or a negative flag planted
+POSITIVE_FLAGS = bytes.maketrans(b"\x00\x01\x02", b"\x00\x01\x00")
+NEGATIVE_FLAGS = bytes.maketrans(b"\x00\x01\x02", b"\x00\x00\x01")
+
+
+def pack_bits(plane: bytes) -> bytes:
+    """
+    Pack a plane of one 0 or 1 byte per tile into 8 tiles per byte, first tile in the highest bit.
+
+    Parameters
+    ----------
+    plane : bytes
+        One byte per tile, each either 0 or 1.
+
+    Returns
+    -------
+    bytes
+        The packed plane, ceil(len(plane) / 8) bytes long.
+    """
+
+    packed_length = (len(plane) + 7) // 8
+    if packed_length == 0:
+        return b""
+
+    # parsing the plane as a binary number does the packing in C instead of looping over every tile in python
+    digits = plane.translate(BYTES_TO_DIGITS).ljust(packed_length * 8, b"0")
+    return int(digits, 2).to_bytes(packed_length, "big")
+
+
+def unpack_bits(packed_plane: bytes, num_tiles: int) -> bytes:
+    """
+    Unpack a plane packed by `pack_bits` back into one 0 or 1 byte per tile.
+
+    Parameters
+    ----------
+    packed_plane : bytes
+        The packed plane.
+
+    num_tiles : int
+        The number of tiles in the plane.
+
+    Returns
+    -------
+    bytes
+        One byte per tile, each either 0 or 1.
+    """
+
+    if num_tiles == 0:
+        return b""
+    digits = format(int.from_bytes(packed_plane, "big"), f"0{len(packed_plane) * 8}b").encode("ascii")
+    return digits[:num_tiles].translate(DIGITS_TO_BYTES)
+
+
+def create_board(
+    version: str,
+    width: int,
+    height: int,
+    num_mines: int,
+    num_negative_mines: int,
+    distance_weight: float,
+    board: list[list[MinesweeperTile]] | MappedTileGrid,
+    stats: PlayerStats = None,
+) -> MinesweeperBoard:
+    """
+    Create a board of the given version around tiles that were saved along with its settings.
+
+    Parameters
+    ----------
+    version : {"Minesweeper", "Minesweeper V", "Distance Minesweeper", "Weighted Minesweeper",
+               "Negative Minesweeper"}
+        The version of Minesweeper the board plays.
+
+    width : int
+        The number of tiles wide the board is.
+
+    height : int
+        The number of tiles high the board is.
+
+    num_mines : int
+        The number of mines hidden in the board (including any negative mines).
+
+    num_negative_mines : int
+        The number of negative mines hidden in the board.
+
+    distance_weight : float
+        The board's distance weight, for versions that have one.
+
+    board : list[list[MinesweeperTile]] | MappedTileGrid
+        The board's tiles.
+
+    stats : PlayerStats, optional
+        Stats for the board to update throughout the rest of the game.
+
+    Returns
+    -------
+    MinesweeperBoard
+        The board, of the version's own board class.
+    """
+
+    if version not in BOARD_CLASSES:
+        raise Exception("Invalid Minesweeper Version")
+
+    match version:
+        case "Distance Minesweeper" | "Weighted Minesweeper":
+            return BOARD_CLASSES[version](
+                width=width,
+                height=height,
+                num_mines=num_mines,
+                board=board,
+                stats=stats,
+                distance_weight=int(distance_weight) if distance_weight.is_integer() else distance_weight,
+            )
+        case "Negative Minesweeper":
+            return NegativeMinesweeperBoard(
+                width=width,
+                height=height,
+                num_positive_mines=num_mines - num_negative_mines,
+                num_negative_mines=num_negative_mines,
+                board=board,
+                stats=stats,
+            )
+        case _:
+            return BOARD_CLASSES[version](width=width, height=height, num_mines=num_mines, board=board, stats=stats)
+
+
+def board_to_bytes(minesweeper_board: MinesweeperBoard, board_generated: bool = True) -> bytes:
+    """
+    Create a snapshot of the given board.
+
+    Parameters
+    ----------
+    minesweeper_board : MinesweeperBoard
+        The board to snapshot, of any Minesweeper version.
+
+    board_generated : bool, default: True
+        Whether the board's mines have been placed yet (they're placed on the first click of a game).
+
+    Returns
+    -------
+    bytes
+        The snapshot.
+    """
+
+    version_name = minesweeper_board.minesweeper_version.encode("utf-8")
+    value_type = "d" if minesweeper_board.minesweeper_version in FLOAT_VALUE_VERSIONS else "b"
+    tiles = [tile for row in minesweeper_board.board for tile in row]
+
+    # every plane is built with map so the loops over the tiles run in C instead of python
+    types = list(map(attrgetter("type"), tiles))
+    flags_planted = bytes(map(attrgetter("flag_planted"), tiles))
+    planes = [
+        bytes(map(is_, types, repeat(Tile.MINE))),
+        bytes(map(is_, types, repeat(Tile.NEGATIVE_MINE))),
+        bytes(map(is_, types, repeat(Tile.NUMBERED))),
+        bytes(map(attrgetter("revealed"), tiles)),
+        flags_planted.translate(POSITIVE_FLAGS),
+        flags_planted.translate(NEGATIVE_FLAGS),
+    ]
+    values = array(value_type, list(map(attrgetter("value"), tiles)))
+    if sys.byteorder != "little":
+        values.byteswap()
+
+    return b"".join(
+        [
+            HEADER.pack(MAGIC, FORMAT_VERSION, len(version_name)),
+            version_name,
+            SETTINGS.pack(
+                minesweeper_board.board_width,
+                minesweeper_board.board_height,
+                minesweeper_board.num_mines,
+                getattr(minesweeper_board, "num_negative_mines", 0),
+                getattr(minesweeper_board, "distance_weight", 0),
+                value_type.encode("ascii"),
+                board_generated,
+            ),
+            *(pack_bits(plane) for plane in planes),
+            values.tobytes(),
+        ]
+    )
+
+
+def board_from_bytes(snapshot: bytes, stats: PlayerStats = None) -> tuple[MinesweeperBoard, bool]:
+    """
+    Recreate a board from a snapshot made by `board_to_bytes`.
+
+    Parameters
+    ----------
+    snapshot : bytes
+        The snapshot.
+
+    stats : PlayerStats, optional
+        Stats for the recreated board to update throughout the rest of the game.
+
+    Returns
+    -------
+    tuple[MinesweeperBoard, bool]
+        The recreated board (of the same class as the one snapshotted), and whether its mines had been placed yet.
+    """
+
+    magic, format_version, version_name_length = HEADER.unpack_from(snapshot)
+    if magic != MAGIC:
+        raise Exception("Not a minesweeper board snapshot")
+    if format_version != FORMAT_VERSION:
+        raise Exception(f"Unsupported board snapshot format version {format_version}")
+
+    offset = HEADER.size
+    version = snapshot[offset : offset + version_name_length].decode("utf-8")
+    offset += version_name_length
+    width, height, num_mines, num_negative_mines, distance_weight, value_type, board_generated = SETTINGS.unpack_from(
+        snapshot, offset
+    )
+    offset += SETTINGS.size
+    if version not in BOARD_CLASSES:
+        raise Exception("Invalid Minesweeper Version")
+
+    num_tiles = width * height
+    packed_length = (num_tiles + 7) // 8
+    mines, negative_mines, numbered, revealed, flags, negative_flags = [
+        unpack_bits(snapshot[offset + i * packed_length : offset + (i + 1) * packed_length], num_tiles)
+        for i in range(6)
+    ]
+    offset += 6 * packed_length
+
+    values = array(value_type.decode("ascii"))
+    values.frombytes(snapshot[offset : offset + num_tiles * values.itemsize])
+    if sys.byteorder != "little":
+        values.byteswap()
+    values = values.tolist()
+
+    # the planes are combined into one code per tile by adding them up as big numbers, which can't carry between
+    # tiles since each tile's code fits in its byte
+    type_codes = (4 * int.from_bytes(mines) + 2 * int.from_bytes(negative_mines) + int.from_bytes(numbered)).to_bytes(
+        num_tiles
+    )
+    flags_planted = (int.from_bytes(flags) + 2 * int.from_bytes(negative_flags)).to_bytes(num_tiles)
+
+    # a tile's type code has its mine, negative mine and numbered bits (in that order) set
+    tile_types = (Tile.EMPTY, Tile.NUMBERED, Tile.NEGATIVE_MINE, Tile.NEGATIVE_MINE, Tile.MINE, Tile.MINE, Tile.MINE)
+    types = map(tile_types.__getitem__, type_codes)
+
+    # the garbage collector would otherwise keep stopping to scan the new tiles while they're made, even though tiles
+    # can't form reference cycles
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        tiles = list(map(MinesweeperTile, types, values, map(bool, revealed), flags_planted))
+        board = [tiles[row * width : (row + 1) * width] for row in range(height)]
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+
+    minesweeper_board = create_board(
+        version, width, height, num_mines, num_negative_mines, distance_weight, board, stats
+    )
+    return minesweeper_board, board_generated
+
+
+def save_board(minesweeper_board: MinesweeperBoard, file_name: str, board_generated: bool = True):
+    """
+    Save a snapshot of the given board to a file.
+
+    Parameters
+    ----------
+    minesweeper_board : MinesweeperBoard
+        The board to save, of any Minesweeper version.
+
+    file_name : str
+        The file to save the snapshot to.
+
+    board_generated : bool, default: True
+        Whether the board's mines have been placed yet (they're placed on the first click of a game).
+    """
+
+    with open(file_name, "wb") as snapshot_file:
+        snapshot_file.write(board_to_bytes(minesweeper_board, board_generated))
+
+
+def load_board(file_name: str, stats: PlayerStats = None) -> tuple[MinesweeperBoard, bool]:
+    """
+    Load a board from a snapshot file saved by `save_board`.
+
+    Parameters
+    ----------
+    file_name : str
+        The file to load the snapshot from.
+
+    stats : PlayerStats, optional
+        Stats for the loaded board to update throughout the rest of the game.
+
+    Returns
+    -------
+    tuple[MinesweeperBoard, bool]
+        The loaded board, and whether its mines had been placed yet.
+    """
+
+    with open(file_name, "rb") as snapshot_file:
+        return board_from_bytes(snapshot_file.read(), stats)
+
+
+def load_mapped_board(file_name: str, stats: PlayerStats = None) -> tuple[MinesweeperBoard, bool]:
+    """
+    Pick a game back up from a `MappedTileGrid` file, using the board settings stored in it, without reading its tiles
+    into memory.
+
+    Parameters
+    ----------
+    file_name : str
+        The file the grid's tiles are stored in.
+
+    stats : PlayerStats, optional
+        Stats for the board to update throughout the rest of the game.
+
+    Returns
+    -------
+    tuple[MinesweeperBoard, bool]
+        The board playing on the grid, and whether its mines had been placed yet.
+    """
+
+    grid = MappedTileGrid(file_name)
+    minesweeper_board = create_board(
+        grid.minesweeper_version,
+        grid.width,
+        grid.height,
+        grid.num_mines,
+        grid.num_negative_mines,
+        grid.distance_weight,
+        grid,
+        stats,
+    )
+    return minesweeper_board, grid.board_generated
@@ -1,7 +1,7 @@
-import random
 import math
 from Minesweeper.MinesweeperBoard import Tile, MinesweeperTile, MinesweeperBoard
-from PlayerStats import PlayerStats
+from Minesweeper.MappedTileGrid import MappedTileGrid
+from PlayerStats import PlayerStats, MINES_DEFUSED, FLAG_MISTAKES
 
 
 class DistanceMinesweeperBoard(MinesweeperBoard):
@@ -32,6 +32,11 @@ class DistanceMinesweeperBoard(MinesweeperBoard):
         What the distance is squared by when calculating the inverse (higher means smaller numbers means easier)
     """
 
+    # every mine on the board adds to every tile's value rather than just the tiles around it, so chording has nothing
+    # around a number to reveal, and no tile is ever empty enough to reveal the tiles around it
+    chord_reach = 0
+    flood_reach = 0
+
     def __init__(
         self,
         minesweeper_version: str = "Distance Minesweeper",
@@ -62,34 +67,10 @@ class DistanceMinesweeperBoard(MinesweeperBoard):
         """
 
         # create a base board of size width x height (all tiles that aren't mines are numbered in this version)
-        board = [
-            [MinesweeperTile(type=Tile.NUMBERED) for _ in range(self.board_width)] for _ in range(self.board_height)
-        ]
-
-        # create a list of tiles surrounding and including the first click
-        first_click_tiles = [
-            first_click_coords,
-            (first_click_coords[0] - 1, first_click_coords[1] - 1),
-            (first_click_coords[0] - 1, first_click_coords[1]),
-            (first_click_coords[0] - 1, first_click_coords[1] + 1),
-            (first_click_coords[0], first_click_coords[1] - 1),
-            (first_click_coords[0], first_click_coords[1] + 1),
-            (first_click_coords[0] + 1, first_click_coords[1] - 1),
-            (first_click_coords[0] + 1, first_click_coords[1]),
-            (first_click_coords[0] + 1, first_click_coords[1] + 1),
-        ]
-
-        # create a list of tuples representing every possible (row, col) pair
-        tile_locations = []
-        for row in range(self.board_height):
-            for col in range(self.board_width):
-
-                # if the coordinate pair is the first click or next to the first click, don't let it get a mine
-                if first_click_coords[0] < 0 or (row, col) not in first_click_tiles:
-                    tile_locations.append((row, col))
-
-        # take a random sample of locations to put mines on
-        mine_locations = random.sample(tile_locations, self.num_mines)
+        board = self._create_blank_board(Tile.NUMBERED)
+
+        # take a random sample of locations to put mines on, keeping the first click and the tiles around it clear
+        mine_locations = self._get_mine_locations(first_click_coords)
 
         # hide the mines in the board
         for mine_location in mine_locations:
@@ -111,25 +92,11 @@ class DistanceMinesweeperBoard(MinesweeperBoard):
                             ** self.distance_weight
                         )
 
-        return board
+        # a board kept in a file records that it's been generated, so the game can be picked back up from the file
+        if isinstance(board, MappedTileGrid):
+            board.board_generated = True
 
-    def _reveal_tile(self, row, col):
-        """
-        Reveal the tile at the given row and column.
-
-        Parameters
-        ----------
-        row : int
-            The row of the tile to reveal.
-        col : int
-            The column of the tile to reveal.
-        """
-
-        if not self.board[row][col].revealed:
-            self.stats.increment_stat(self.minesweeper_version, "Tiles Revealed")
-            self.board[row][col].revealed = True
-            self.board[row][col].flag_planted = 0
-            self.board[row][col].changed_last_move = True
+        return board
 
     def plant_flag_on_tile(self, row, col):
         """
@@ -154,12 +121,12 @@ class DistanceMinesweeperBoard(MinesweeperBoard):
                 change_factor = 1
 
             if self.board[row][col].type == Tile.MINE:
-                self.stats.increment_stat(self.minesweeper_version, "Mines Defused", -change_factor)
+                self.stats.increment_stat(self.minesweeper_version, MINES_DEFUSED, -change_factor)
             else:
-                self.stats.increment_stat(self.minesweeper_version, "Flag Mistakes", -change_factor)
+                self.stats.increment_stat(self.minesweeper_version, FLAG_MISTAKES, -change_factor)
 
             self.board[row][col].flag_planted = (self.board[row][col].flag_planted + 1) % 2
-            self.board[row][col].changed_last_move = True
+            self._mark_tile_changed(row, col)
 
             # change every numbered tile by the inverse of their distance from the flag
             for r in range(len(self.board)):
@@ -175,4 +142,4 @@ class DistanceMinesweeperBoard(MinesweeperBoard):
                             / (math.sqrt(math.pow(row - r, 2) + math.pow(col - c, 2))) ** self.distance_weight
                             * change_factor
                         )
-                        self.board[r][c].changed_last_move = True
+                        self._mark_tile_changed(r, c)
@@ -0,0 +1,633 @@
+import mmap
+import random
+from array import array
+from typing import Iterable
+from Minesweeper.MinesweeperTile import FLOAT_VALUE_VERSIONS, Tile, MinesweeperTile
+
+MAGIC = b"MSWPMAP2"
+
+# the header is 9 64-bit fields (the magic, width, height, whether values are floats, the number of unfinished tiles,
+# the number of mines, the number of negative mines, the distance weight as a double, and whether the board has been
+# generated yet), then the version's name in utf-8 from `VERSION_NAME_START` on, padded with 0s
+HEADER_SIZE = 128
+WIDTH_FIELD = 1
+HEIGHT_FIELD = 2
+FLOAT_VALUES_FIELD = 3
+UNFINISHED_TILES_FIELD = 4
+NUM_MINES_FIELD = 5
+NUM_NEGATIVE_MINES_FIELD = 6
+DISTANCE_WEIGHT_FIELD = 7
+BOARD_GENERATED_FIELD = 8
+VERSION_NAME_START = 96
+
+# each tile's state is one byte: its type in the lowest 2 bits, whether it's revealed in the next bit, then its flag
+TYPE_MASK = 0b00011
+REVEALED_BIT = 0b00100
+FLAG_SHIFT = 3
+TILE_TYPES = (Tile.EMPTY, Tile.MINE, Tile.NUMBERED, Tile.NEGATIVE_MINE)
+
+# whether a tile with each state is finished (revealed or flagged with the right flag) for checking if a game is won
+FINISHED_STATES = tuple(
+    bool(
+        state & REVEALED_BIT
+        or (state >> FLAG_SHIFT == 1 and TILE_TYPES[state & TYPE_MASK] == Tile.MINE)
+        or (state >> FLAG_SHIFT == 2 and TILE_TYPES[state & TYPE_MASK] == Tile.NEGATIVE_MINE)
+    )
+    for state in range(32)
+)
+
+# translation tables from a state byte to whether it's a mine, a negative mine, or neither (as a byte of all 1s)
+MINE_STATES = bytes(TILE_TYPES[state & TYPE_MASK] == Tile.MINE for state in range(256))
+NEGATIVE_MINE_STATES = bytes(TILE_TYPES[state & TYPE_MASK] == Tile.NEGATIVE_MINE for state in range(256))
+NON_MINE_MASKS = bytes(
+    0 if TILE_TYPES[state & TYPE_MASK] in (Tile.MINE, Tile.NEGATIVE_MINE) else 0xFF for state in range(256)
+)
+
+# translation tables from the number of mines around a tile to its state, and from its value + 128 to its value's byte
+NUMBERED_STATES = bytes([TILE_TYPES.index(Tile.EMPTY)] + [TILE_TYPES.index(Tile.NUMBERED)] * 255)
+OFFSET_VALUES = bytes((value - 128) % 256 for value in range(256))
+
+# the most bytes filled or scanned at once, so huge planes are never copied into memory whole
+CHUNK_SIZE = 1 << 24
+
+
+class MappedTile:
+    """
+    A view of a single tile in a `MappedTileGrid`, with the same attributes as a `MinesweeperTile`.
+    Reading or setting an attribute reads or writes the tile's bytes in the grid's file.
+
+    Attributes
+    ----------
+    grid : MappedTileGrid
+        The grid the tile is in.
+
+    index : int
+        The tile's position in the grid's planes (row * width + col).
+    """
+
+    __slots__ = ("grid", "index")
+
+    def __init__(self, grid: "MappedTileGrid", index: int):
+        self.grid = grid
+        self.index = index
+
+    @property
+    def type(self) -> Tile:
+        return TILE_TYPES[self.grid.states[self.index] & TYPE_MASK]
+
+    @type.setter
+    def type(self, tile_type: Tile):
+        state = self.grid.states[self.index]
+        self.grid.set_state(self.index, state & ~TYPE_MASK | TILE_TYPES.index(tile_type))
+
+    @property
+    def value(self) -> float:
+        return self.grid.values[self.index]
+
+    @value.setter
+    def value(self, value: float):
+        self.grid.values[self.index] = float(value) if self.grid.float_values else value
+
+    @property
+    def revealed(self) -> bool:
+        return bool(self.grid.states[self.index] & REVEALED_BIT)
+
+    @revealed.setter
+    def revealed(self, revealed: bool):
+        state = self.grid.states[self.index]
+        self.grid.set_state(self.index, state | REVEALED_BIT if revealed else state & ~REVEALED_BIT)
+
+    @property
+    def flag_planted(self) -> int:
+        return self.grid.states[self.index] >> FLAG_SHIFT
+
+    @flag_planted.setter
+    def flag_planted(self, flag_planted: int):
+        state = self.grid.states[self.index]
+        self.grid.set_state(self.index, state & (TYPE_MASK | REVEALED_BIT) | int(flag_planted) << FLAG_SHIFT)
+
+    @property
+    def changed_last_move(self) -> bool:
+        return self.index in self.grid.changed_indices
+
+    @changed_last_move.setter
+    def changed_last_move(self, changed_last_move: bool):
+        if changed_last_move:
+            self.grid.changed_indices.add(self.index)
+        else:
+            self.grid.changed_indices.discard(self.index)
+
+
+class MappedTileRow:
+    """
+    A view of a single row of a `MappedTileGrid`, indexed by column like a row of `MinesweeperTile` objects.
+
+    Attributes
+    ----------
+    grid : MappedTileGrid
+        The grid the row is in.
+
+    start : int
+        The position of the row's first tile in the grid's planes.
+    """
+
+    __slots__ = ("grid", "start")
+
+    def __init__(self, grid: "MappedTileGrid", start: int):
+        self.grid = grid
+        self.start = start
+
+    def __len__(self) -> int:
+        return self.grid.width
+
+    def __getitem__(self, col: int) -> MappedTile:
+        if not 0 <= col < self.grid.width:
+            raise IndexError("tile column out of range")
+        return MappedTile(self.grid, self.start + col)
+
+    def __setitem__(self, col: int, tile: MinesweeperTile):
+        if not 0 <= col < self.grid.width:
+            raise IndexError("tile column out of range")
+        mapped_tile = MappedTile(self.grid, self.start + col)
+        mapped_tile.type = tile.type
+        mapped_tile.value = tile.value
+        mapped_tile.revealed = tile.revealed
+        mapped_tile.flag_planted = tile.flag_planted
+        mapped_tile.changed_last_move = tile.changed_last_move
+
+    def __iter__(self):
+        return (MappedTile(self.grid, index) for index in range(self.start, self.start + self.grid.width))
+
+
+class MappedTileGrid:
+    """
+    A grid of tiles stored in a memory-mapped file instead of as `MinesweeperTile` objects, for boards bigger than RAM.
+
+    It's indexed like the usual list of rows of tiles (`grid[row][col].revealed`, `for row in grid`, `len(grid)`), so it
+    can be passed as the `board` of any `MinesweeperBoard` and the board works on it unchanged, while the OS pages the
+    tiles in and out as moves touch them. Everything is kept in the file as it changes, so a game can be picked back up
+    after a restart just by opening the file again (see `BoardSnapshot.load_mapped_board`).
+
+    The file holds a header (the settings of the board the grid is played on, and whether it's been generated yet), then
+    one state byte per tile (its type, whether it's revealed and its flag), then one value per tile (a signed byte, or a
+    double for versions with float values). Which tiles changed last move isn't worth keeping between runs, so that's
+    only kept in memory.
+
+    Giving a size creates a new blank grid of that size in the file (replacing whatever was there), and leaving it out
+    opens the grid that's already in the file. Whenever a board clears the grid to generate itself on it, the board's
+    settings replace the grid's.
+
+    Attributes
+    ----------
+    file_name : str
+        The file the tiles are stored in.
+
+    width : int
+        The number of tiles wide the grid is.
+
+    height : int
+        The number of tiles high the grid is.
+
+    minesweeper_version : str
+        The name of the Minesweeper version played on the grid.
+
+    num_mines : int
+        The number of mines hidden in the grid (including any negative mines).
+
+    num_negative_mines : int
+        The number of negative mines hidden in the grid.
+
+    distance_weight : float
+        The distance weight of the board played on the grid, for versions that have one.
+
+    float_values : bool
+        Whether tile values are stored as doubles (for versions like Distance Minesweeper) or signed bytes, which
+        depends on the version.
+
+    states : memoryview
+        The state byte of every tile, in row-major order.
+
+    values : memoryview
+        The value of every tile, in row-major order.
+
+    changed_indices : set[int]
+        The positions of the tiles whose `changed_last_move` indicator is set.
+    """
+
+    def __init__(
+        self,
+        file_name: str,
+        width: int = None,
+        height: int = None,
+        minesweeper_version="Minesweeper",
+        num_mines=0,
+        num_negative_mines=0,
+        distance_weight=0,
+    ):
+        self.file_name = file_name
+        self.changed_indices = set()
+        self.file = None
+        self.map = None
+
+        if width is None:
+            self.file = open(file_name, "r+b")
+            header = self.file.read(HEADER_SIZE)
+            if len(header) < HEADER_SIZE or header[:8] != MAGIC:
+                self.file.close()
+                raise Exception("Not a memory-mapped minesweeper board")
+            fields = memoryview(header).cast("q")
+            self.width = fields[WIDTH_FIELD]
+            self.height = fields[HEIGHT_FIELD]
+            self.float_values = bool(fields[FLOAT_VALUES_FIELD])
+            self.num_mines = fields[NUM_MINES_FIELD]
+            self.num_negative_mines = fields[NUM_NEGATIVE_MINES_FIELD]
+            self.distance_weight = memoryview(header).cast("d")[DISTANCE_WEIGHT_FIELD]
+            self.minesweeper_version = header[VERSION_NAME_START:].rstrip(b"\0").decode("utf-8")
+            self._map_file()
+        else:
+            self.width = width
+            self.height = height
+            self.file = open(file_name, "w+b")
+            self.clear(
+                minesweeper_version=minesweeper_version,
+                num_mines=num_mines,
+                num_negative_mines=num_negative_mines,
+                distance_weight=distance_weight,
+            )
+
+    def _map_file(self):
+        num_tiles = self.width * self.height
+
+        # the values start on an 8 byte boundary so they can be read as doubles
+        values_offset = HEADER_SIZE + (num_tiles + 7) // 8 * 8
+        self.values_offset = values_offset
+        self.map = mmap.mmap(self.file.fileno(), 0)
+        self.header = memoryview(self.map)[:HEADER_SIZE].cast("q")
+        self.states = memoryview(self.map)[HEADER_SIZE : HEADER_SIZE + num_tiles]
+        self.values = memoryview(self.map)[
+            values_offset : values_offset + num_tiles * (8 if self.float_values else 1)
+        ].cast("d" if self.float_values else "b")
+
+    def _unmap_file(self):
+        self.header.release()
+        self.states.release()
+        self.values.release()
+        self.map.close()
+
+    @property
+    def num_unfinished_tiles(self) -> int:
+        """
+        The number of tiles that are neither revealed nor flagged with the right flag. The game is won when it's 0.
+        It's kept up to date as tiles change, so checking if a game is won never has to look at every tile.
+        """
+
+        return self.header[UNFINISHED_TILES_FIELD]
+
+    @property
+    def board_generated(self) -> bool:
+        """
+        Whether mines have been hidden in the grid since it was last cleared (they're hidden on the first click of a
+        game).
+        """
+
+        return bool(self.header[BOARD_GENERATED_FIELD])
+
+    @board_generated.setter
+    def board_generated(self, board_generated: bool):
+        self.header[BOARD_GENERATED_FIELD] = board_generated
+
+    def set_state(self, index: int, state: int):
+        """
+        Set the state byte of the tile at the given position, keeping `num_unfinished_tiles` up to date.
+
+        Parameters
+        ----------
+        index : int
+            The tile's position in the grid's planes (row * width + col).
+
+        state : int
+            The tile's new state byte.
+        """
+
+        self.header[UNFINISHED_TILES_FIELD] += FINISHED_STATES[self.states[index]] - FINISHED_STATES[state]
+        self.states[index] = state
+
+    def clear(
+        self,
+        tile_type: Tile = Tile.EMPTY,
+        minesweeper_version: str = None,
+        num_mines: int = None,
+        num_negative_mines: int = None,
+        distance_weight: float = None,
+    ):
+        """
+        Reset every tile to a hidden, unflagged tile of the given type with a value of 0, and mark the grid as not
+        generated yet. Any board settings given replace the grid's, and the rest are kept.
+
+        Parameters
+        ----------
+        tile_type : Tile, default: Tile.EMPTY
+            The type every tile should be.
+
+        minesweeper_version : str, optional
+            The name of the Minesweeper version that will be played on the grid, which decides whether its values are
+            floats.
+
+        num_mines : int, optional
+            The number of mines that will be hidden in the grid (including any negative mines).
+
+        num_negative_mines : int, optional
+            The number of negative mines that will be hidden in the grid.
+
+        distance_weight : float, optional
+            The distance weight of the board that will be played on the grid, for versions that have one.
+        """
+
+        if minesweeper_version is not None:
+            version_name = minesweeper_version.encode("utf-8")
+            if len(version_name) > HEADER_SIZE - VERSION_NAME_START:
+                raise Exception(f"Version name {minesweeper_version!r} is too long to store")
+            self.minesweeper_version = minesweeper_version
+            self.float_values = minesweeper_version in FLOAT_VALUE_VERSIONS
+        if num_mines is not None:
+            self.num_mines = num_mines
+        if num_negative_mines is not None:
+            self.num_negative_mines = num_negative_mines
+        if distance_weight is not None:
+            self.distance_weight = distance_weight
+
+        num_tiles = self.width * self.height
+        if self.map is not None:
+            self._unmap_file()
+
+        # emptying the file and growing it back zeroes it without writing a byte, and leaves it sparse on disk
+        values_offset = HEADER_SIZE + (num_tiles + 7) // 8 * 8
+        self.file.truncate(0)
+        self.file.truncate(values_offset + num_tiles * (8 if self.float_values else 1))
+        self._map_file()
+
+        self.map[:8] = MAGIC
+        self.header[WIDTH_FIELD] = self.width
+        self.header[HEIGHT_FIELD] = self.height
+        self.header[FLOAT_VALUES_FIELD] = self.float_values
+        self.header[UNFINISHED_TILES_FIELD] = num_tiles
+        self.header[NUM_MINES_FIELD] = self.num_mines
+        self.header[NUM_NEGATIVE_MINES_FIELD] = self.num_negative_mines
+        self.map[DISTANCE_WEIGHT_FIELD * 8 : DISTANCE_WEIGHT_FIELD * 8 + 8] = array(
+            "d", [self.distance_weight]
+        ).tobytes()
+        version_name = self.minesweeper_version.encode("utf-8")
+        self.map[VERSION_NAME_START : VERSION_NAME_START + len(version_name)] = version_name
+        self.changed_indices.clear()
+
+        state = TILE_TYPES.index(tile_type)
+        if state != 0:
+            for start in range(0, num_tiles, CHUNK_SIZE):
+                end = min(start + CHUNK_SIZE, num_tiles)
+                self.states[start:end] = bytes([state]) * (end - start)
+
+    def reveal_all(self):
+        """
+        Reveal every tile in the grid, a chunk of tiles at a time instead of one at a time.
+        """
+
+        reveal = bytes(state | REVEALED_BIT for state in range(256))
+        for start in range(0, len(self.states), CHUNK_SIZE):
+            end = min(start + CHUNK_SIZE, len(self.states))
+            self.states[start:end] = self.states[start:end].tobytes().translate(reveal)
+        self.header[UNFINISHED_TILES_FIELD] = 0
+
+    def find_tiles(self, *tile_types: Tile):
+        """
+        Find every tile of the given types, scanning a chunk of tiles at a time.
+
+        Parameters
+        ----------
+        *tile_types : Tile
+            The types of tile to find.
+
+        Yields
+        ------
+        tuple[int, int]
+            The (row, col) coordinates of each tile found, in row-major order.
+        """
+
+        wanted_states = [bytes([state]) for state in range(32) if TILE_TYPES[state & TYPE_MASK] in tile_types]
+        for start in range(0, len(self.states), CHUNK_SIZE):
+            chunk = self.states[start : start + CHUNK_SIZE].tobytes()
+
+            # each wanted state is searched for in C, so only the tiles that are found are looked at in python
+            indices = []
+            for wanted_state in wanted_states:
+                index = chunk.find(wanted_state)
+                while index != -1:
+                    indices.append(start + index)
+                    index = chunk.find(wanted_state, index + 1)
+            for index in sorted(indices):
+                yield divmod(index, self.width)
+
+    def place_mines(
+        self,
+        mine_locations: Iterable[tuple[int, int]],
+        negative_mine_locations: Iterable[tuple[int, int]] = (),
+        reach=1,
+    ):
+        """
+        Hide mines at the given locations in a blank grid of empty tiles, then number every other tile (see
+        `number_tiles`).
+
+        Parameters
+        ----------
+        mine_locations : Iterable[tuple[int, int]]
+            The (row, col) coordinates of each mine.
+
+        negative_mine_locations : Iterable[tuple[int, int]], default: ()
+            The (row, col) coordinates of each negative mine.
+
+        reach : int, default: 1
+            How many tiles out in every direction a mine is counted (1 for the 3x3 area around it, 2 for 5x5).
+        """
+
+        for row, col in mine_locations:
+            self.states[row * self.width + col] = TILE_TYPES.index(Tile.MINE)
+        for row, col in negative_mine_locations:
+            self.states[row * self.width + col] = TILE_TYPES.index(Tile.NEGATIVE_MINE)
+        self.number_tiles(reach)
+        self.board_generated = True
+
+    def place_random_mines(
+        self,
+        rng: random.Random,
+        num_mines: int,
+        num_negative_mines: int = 0,
+        first_click_coords=(-1, -1),
+        safe_distance=1,
+        reach=1,
+    ):
+        """
+        Hide mines at random in a blank grid of empty tiles, keeping the first click and the tiles around it clear, then
+        number every other tile (see `number_tiles`).
+
+        The mines are scattered straight into the grid's file, with the grid's own state bytes keeping track of which
+        tiles already have one, so their positions are never listed in memory (which would take tens of gigabytes on
+        the biggest boards). Every way of placing the mines is equally likely, though the same seed places them
+        differently to `MinesweeperBoard._get_mine_locations`.
+
+        Parameters
+        ----------
+        rng : random.Random
+            The random number generator to place the mines with.
+
+        num_mines : int
+            The number of mines to hide.
+
+        num_negative_mines : int, default: 0
+            The number of negative mines to hide.
+
+        first_click_coords : tuple, optional
+            The coordinates of the first tile clicked, to keep it and the tiles around it clear of mines.
+            No tiles are kept clear if left empty.
+
+        safe_distance : int, default: 1
+            How many tiles out from the first click in every direction are kept clear of mines.
+
+        reach : int, default: 1
+            How many tiles out in every direction a mine is counted (1 for the 3x3 area around it, 2 for 5x5).
+        """
+
+        empty_state, mine_state, negative_mine_state = (
+            TILE_TYPES.index(tile_type) for tile_type in (Tile.EMPTY, Tile.MINE, Tile.NEGATIVE_MINE)
+        )
+
+        safe_positions = set()
+        if first_click_coords[0] >= 0:
+            first_row, first_col = first_click_coords
+            safe_positions = {
+                row * self.width + col
+                for row in range(max(first_row - safe_distance, 0), min(first_row + safe_distance + 1, self.height))
+                for col in range(max(first_col - safe_distance, 0), min(first_col + safe_distance + 1, self.width))
+            }
+        num_positions = len(self.states) - len(safe_positions)
+        total_mines = num_mines + num_negative_mines
+        if total_mines > num_positions:
+            raise Exception("Too many mines to hide in the board")
+
+        def scatter(count: int, from_state: int, to_state: int):
+            # tiles are picked at random until one in the right state is found, which takes at most 4 picks on average
+            # since the rarer of the two states is always the one scattered
+            states = self.states
+            while count:
+                index = rng.randrange(len(states))
+                if states[index] == from_state and index not in safe_positions:
+                    states[index] = to_state
+                    count -= 1
+
+        def replace_states(from_state: int, to_state: int):
+            replace = bytes(to_state if state == from_state else state for state in range(256))
+            for start in range(0, len(self.states), CHUNK_SIZE):
+                end = min(start + CHUNK_SIZE, len(self.states))
+                self.states[start:end] = self.states[start:end].tobytes().translate(replace)
+
+        if total_mines * 2 <= num_positions:
+            scatter(num_mines, empty_state, mine_state)
+            scatter(num_negative_mines, empty_state, negative_mine_state)
+        else:
+
+            # most tiles are mines, so every tile starts out as one and the tiles left clear are scattered instead
+            replace_states(empty_state, mine_state)
+            for position in safe_positions:
+                self.states[position] = empty_state
+            scatter(num_positions - total_mines, mine_state, empty_state)
+            if num_negative_mines * 2 <= total_mines:
+                scatter(num_negative_mines, mine_state, negative_mine_state)
+            else:
+                replace_states(mine_state, negative_mine_state)
+                scatter(num_mines, negative_mine_state, mine_state)
+        self.number_tiles(reach)
+        self.board_generated = True
+
+    def number_tiles(self, reach=1):
+        """
+        Number every tile that isn't a mine by the mines within `reach` tiles of it, like regular, V and Negative
+        Minesweeper do (negative mines count as -1, and any tile near a mine is numbered).
+
+        Rather than adding 1 to the tiles around each mine one at a time, a whole row is numbered at once: each row's
+        mines are read as one big number with a byte per tile, so adding up shifted copies of it and the rows around it
+        counts the mines around every tile in the row in a few steps of C. No tile can have more than 255 mines around
+        it, so the counts never carry from one tile's byte into the next.
+
+        Parameters
+        ----------
+        reach : int, default: 1
+            How many tiles out in every direction a mine is counted (1 for the 3x3 area around it, 2 for 5x5).
+        """
+
+        row_mask = (1 << 8 * self.width) - 1
+        value_offsets = int.from_bytes(b"\x80" * self.width)
+
+        def count_across_row(row_mines: int) -> int:
+            # the mines in reach of each tile along its own row, by adding copies of the row shifted a tile at a time
+            counts = row_mines
+            for distance in range(1, reach + 1):
+                counts += ((row_mines << 8 * distance) & row_mask) + (row_mines >> 8 * distance)
+            return counts
+
+        # the counts along each row, kept only while they're in reach of the row being numbered
+        row_counts = {}
+        for row in range(self.height + reach):
+            if row < self.height:
+                row_states = self.states[row * self.width : (row + 1) * self.width].tobytes()
+                row_counts[row] = (
+                    count_across_row(int.from_bytes(row_states.translate(MINE_STATES))),
+                    count_across_row(int.from_bytes(row_states.translate(NEGATIVE_MINE_STATES))),
+                )
+
+            # once the rows in reach below a row have been counted along, that row can be numbered
+            numbered_row = row - reach
+            if numbered_row < 0:
+                continue
+            rows_in_reach = range(max(numbered_row - reach, 0), min(numbered_row + reach + 1, self.height))
+            mines = sum(row_counts[row_in_reach][0] for row_in_reach in rows_in_reach)
+            negative_mines = sum(row_counts[row_in_reach][1] for row_in_reach in rows_in_reach)
+            row_counts.pop(numbered_row - reach, None)
+
+            start = numbered_row * self.width
+            row_states = self.states[start : start + self.width].tobytes()
+            non_mines = int.from_bytes(row_states.translate(NON_MINE_MASKS))
+
+            # every value is offset by 128 so subtracting the negative mines can't borrow from the next tile's byte
+            values = (mines + value_offsets - negative_mines).to_bytes(self.width).translate(OFFSET_VALUES)
+            numbered = (mines + negative_mines).to_bytes(self.width).translate(NUMBERED_STATES)
+            self.states[start : start + self.width] = (
+                (int.from_bytes(numbered) & non_mines) | int.from_bytes(row_states)
+            ).to_bytes(self.width)
+            self.map[self.values_offset + start : self.values_offset + start + self.width] = (
+                int.from_bytes(values) & non_mines
+            ).to_bytes(self.width)
+
+    def flush(self):
+        """
+        Write every change made to the grid out to its file.
+        """
+
+        self.map.flush()
+
+    def close(self):
+        """
+        Write every change made to the grid out to its file and close it.
+        """
+
+        self.map.flush()
+        self._unmap_file()
+        self.file.close()
+
+    def __len__(self) -> int:
+        return self.height
+
+    def __getitem__(self, row: int) -> MappedTileRow:
+        if not 0 <= row < self.height:
+            raise IndexError("tile row out of range")
+        return MappedTileRow(self, row * self.width)
+
+    def __iter__(self):
+        return (MappedTileRow(self, row * self.width) for row in range(self.height))
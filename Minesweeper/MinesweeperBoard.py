@@ -1,6 +1,9 @@
 import random
+from typing import Iterable
 from Minesweeper.MinesweeperTile import Tile, MinesweeperTile
-from PlayerStats import PlayerStats
+from Minesweeper.MappedTileGrid import MappedTileGrid
+from Minesweeper.VisibleState import VisibleState
+from PlayerStats import PlayerStats, TILES_REVEALED, MINES_DEFUSED, FLAG_MISTAKES
 
 
 class MinesweeperBoard:
@@ -21,13 +24,39 @@ class MinesweeperBoard:
     num_mines : int, default: 40
         The number of mines hidden in the board.
 
-    board : list, default: 2D array of blank tiles of size height x width
+    board : list | MappedTileGrid, default: 2D array of blank tiles of size height x width
         A 2D array of tiles representing the current board state.
+        For boards too big to fit in memory, this can be a `MappedTileGrid` keeping the tiles in a file instead.
 
     stats : PlayerStats, optional
         Stats to update throughout the game whenever a relevant action happens.
+
+    changed_tiles : list[tuple[int, int]]
+        The (row, col) coordinates of every tile whose `changed_last_move` indicator is set, in the order they changed.
+
+    rng : random.Random
+        The random number generator the mines are placed with, which can be seeded to generate the same board again.
+
+    num_tiles_revealed : int
+        The number of tiles revealed by moves made on this board.
+
+    visible_state : VisibleState
+        What a player can see of the board, kept up to date as tiles change, once `track_visible_state` is called.
+
+    chord_reach : int
+        How many tiles away from a numbered tile its value counts mines, and so how far chording it reveals.
+
+    safe_distance : int
+        How many tiles out from the first click in every direction are kept clear of mines.
+
+    flood_reach : int
+        How many tiles out in every direction revealing an empty tile reveals the tiles around it too (0 for none).
     """
 
+    chord_reach = 1
+    safe_distance = 1
+    flood_reach = 1
+
     def __init__(
         self,
         minesweeper_version="Minesweeper",
@@ -47,6 +76,114 @@ class MinesweeperBoard:
             else board
         )
         self.stats = stats if stats is not None else PlayerStats()
+        self.changed_tiles = []
+        self.rng = random.Random()
+        self.num_tiles_revealed = 0
+        self.visible_state = None
+
+    def track_visible_state(self) -> VisibleState:
+        """
+        Start keeping what a player can see of the board in flat planes, updated in place as tiles change.
+
+        Returns
+        -------
+        VisibleState
+            The board's visible state.
+        """
+
+        if self.visible_state is None:
+            self.visible_state = VisibleState(self)
+        return self.visible_state
+
+    def _create_blank_board(self, tile_type=Tile.EMPTY) -> list[list[MinesweeperTile]] | MappedTileGrid:
+        """
+        Create a board of size `self.width` and `self.height` where every tile is a hidden tile of the given type.
+        If the board's tiles are kept in a file, that file is cleared and reused instead of making tiles in memory, and
+        the board's settings are stored in it so the game can be picked back up from the file alone.
+
+        Parameters
+        ----------
+        tile_type : Tile, default: Tile.EMPTY
+            The type every tile should be.
+
+        Returns
+        -------
+        list[list[MinesweeperTile]] | MappedTileGrid
+            2D array representing the blank board
+        """
+
+        if self.visible_state is not None:
+            self.visible_state.clear()
+        if isinstance(self.board, MappedTileGrid):
+            self.board.clear(
+                tile_type,
+                minesweeper_version=self.minesweeper_version,
+                num_mines=self.num_mines,
+                num_negative_mines=getattr(self, "num_negative_mines", 0),
+                distance_weight=getattr(self, "distance_weight", 0),
+            )
+            return self.board
+        return [[MinesweeperTile(tile_type) for _ in range(self.board_width)] for _ in range(self.board_height)]
+
+    def get_max_mines(self) -> int:
+        """
+        Get the most mines the board can hide, wherever the first click is.
+
+        Returns
+        -------
+        int
+            The number of tiles left once the most tiles a first click can keep clear are taken away.
+        """
+
+        safe_size = 2 * self.safe_distance + 1
+        return self.board_width * self.board_height - min(self.board_width, safe_size) * min(
+            self.board_height, safe_size
+        )
+
+    def _get_mine_locations(self, first_click_coords=(-1, -1), safe_distance=1) -> list[tuple[int, int]]:
+        """
+        Pick `self.num_mines` random locations on the board to hide mines on, keeping them away from the first click.
+        Only the picked locations are listed, never every location on the board, so it stays quick on huge boards.
+
+        Parameters
+        ----------
+        first_click_coords : tuple, optional
+            The coordinates of the first tile clicked, to keep it and the tiles around it clear of mines.
+            No tiles are kept clear if left empty.
+
+        safe_distance : int, default: 1
+            How many tiles out from the first click in every direction are kept clear of mines.
+
+        Returns
+        -------
+        list[tuple[int, int]]
+            The (row, col) coordinates of each mine, in a random order.
+        """
+
+        # the positions (row * width + col) of the tiles that are kept clear of mines, in order
+        safe_positions = []
+        if first_click_coords[0] >= 0:
+            first_row, first_col = first_click_coords
+            safe_positions = [
+                row * self.board_width + col
+                for row in range(
+                    max(first_row - safe_distance, 0), min(first_row + safe_distance + 1, self.board_height)
+                )
+                for col in range(
+                    max(first_col - safe_distance, 0), min(first_col + safe_distance + 1, self.board_width)
+                )
+            ]
+
+        # sample positions from a range as much shorter as there are safe positions, then shift each one past every safe
+        # position at or before it, which spreads the mines evenly over every position that isn't safe
+        num_positions = self.board_width * self.board_height - len(safe_positions)
+        mine_locations = []
+        for position in self.rng.sample(range(num_positions), self.num_mines):
+            for safe_position in safe_positions:
+                if position >= safe_position:
+                    position += 1
+            mine_locations.append(divmod(position, self.board_width))
+        return mine_locations
 
     def get_random_board(self, first_click_coords=(-1, -1)) -> list:
         """
@@ -65,32 +202,16 @@ class MinesweeperBoard:
         """
 
         # create a base board of size width x height
-        board = [[MinesweeperTile() for _ in range(self.board_width)] for _ in range(self.board_height)]
-
-        # create a list of tiles surrounding and including the first click
-        first_click_tiles = [
-            first_click_coords,
-            (first_click_coords[0] - 1, first_click_coords[1] - 1),
-            (first_click_coords[0] - 1, first_click_coords[1]),
-            (first_click_coords[0] - 1, first_click_coords[1] + 1),
-            (first_click_coords[0], first_click_coords[1] - 1),
-            (first_click_coords[0], first_click_coords[1] + 1),
-            (first_click_coords[0] + 1, first_click_coords[1] - 1),
-            (first_click_coords[0] + 1, first_click_coords[1]),
-            (first_click_coords[0] + 1, first_click_coords[1] + 1),
-        ]
-
-        # create a list of tuples representing every possible (row, col) pair
-        tile_locations = []
-        for row in range(self.board_height):
-            for col in range(self.board_width):
-
-                # if the coordinate pair is the first click or next to the first click, don't let it get a mine
-                if first_click_coords[0] < 0 or (row, col) not in first_click_tiles:
-                    tile_locations.append((row, col))
-
-        # take a random sample of locations to put mines on
-        mine_locations = random.sample(tile_locations, self.num_mines)
+        board = self._create_blank_board()
+
+        # boards kept in a file have their mines scattered straight into the file and are numbered a whole row at a
+        # time, instead of listing every mine and numbering the board a mine at a time
+        if isinstance(board, MappedTileGrid):
+            board.place_random_mines(self.rng, self.num_mines, 0, first_click_coords, self.safe_distance)
+            return board
+
+        # take a random sample of locations to put mines on, keeping the first click and the tiles around it clear
+        mine_locations = self._get_mine_locations(first_click_coords)
 
         # hide the mines in the board
         for mine_location in mine_locations:
@@ -140,48 +261,111 @@ class MinesweeperBoard:
 
         if 0 <= row < self.board_height and 0 <= col < self.board_width and not self.board[row][col].flag_planted:
             self.reset_changed_last_move_board()
-            self._reveal_tile(row, col)
+            self._reveal_tiles([(row, col)])
             return self.board[row][col]
         return MinesweeperTile(Tile.NULL)
 
-    def _reveal_tile(self, row: int, col: int):
+    def make_moves(self, coords: Iterable[tuple[int, int]]) -> list[MinesweeperTile]:
         """
-        Reveal the tile at the given row and column.
+        Make a move on each of the given tiles that's on the board and doesn't have a flag planted there, in order, all
+        as a single move: the last move's changes are reset once, the tiles are revealed in one pass that never visits
+        a tile twice and the stats are updated once, so `self.changed_tiles` ends up with the changes of every move.
+        The moves stop at the first mine moved on, since it ends the game.
+
+        Parameters
+        ----------
+        coords : Iterable[tuple[int, int]]
+            The (row, col) coordinates of the tiles to move on.
+
+        Returns
+        -------
+        list[MinesweeperTile]
+            The MinesweeperTiles that were moved on, in order (ending with the mine, if one was moved on).
+        """
+
+        tiles_to_reveal = []
+        for row, col in coords:
+            if 0 <= row < self.board_height and 0 <= col < self.board_width and not self.board[row][col].flag_planted:
+                tiles_to_reveal.append((row, col))
+                if self.board[row][col].type == Tile.MINE or self.board[row][col].type == Tile.NEGATIVE_MINE:
+                    break
+
+        self.reset_changed_last_move_board()
+        self._reveal_tiles(tiles_to_reveal)
+        return [self.board[row][col] for row, col in tiles_to_reveal]
+
+    def chord(self, row: int, col: int) -> list[MinesweeperTile]:
+        """
+        Chord the revealed numbered tile at the given row and column: once enough flags are planted around it to bring
+        its value down to 0, make a move on every tile around it without a flag at once (see `make_moves`).
 
         Parameters
         ----------
         row : int
-            The row of the tile to reveal.
+            The row of the tile to chord.
         col : int
-            The column of the tile to reveal.
+            The column of the tile to chord.
+
+        Returns
+        -------
+        list[MinesweeperTile]
+            The MinesweeperTiles that were moved on, in order (ending with the mine, if a flag was planted wrong).
         """
 
-        if not self.board[row][col].revealed:
-            self.stats.increment_stat(self.minesweeper_version, "Tiles Revealed")
+        surrounding_tiles = []
+        if (
+            0 <= row < self.board_height
+            and 0 <= col < self.board_width
+            and self.board[row][col].revealed
+            and self.board[row][col].type == Tile.NUMBERED
+            and self.board[row][col].value == 0
+        ):
+            reach = self.chord_reach
+            surrounding_tiles = [
+                (surrounding_row, surrounding_col)
+                for surrounding_row in range(max(row - reach, 0), min(row + reach + 1, self.board_height))
+                for surrounding_col in range(max(col - reach, 0), min(col + reach + 1, self.board_width))
+                if not self.board[surrounding_row][surrounding_col].revealed
+            ]
+        return self.make_moves(surrounding_tiles)
+
+    def _reveal_tiles(self, tiles: list[tuple[int, int]]):
+        """
+        Reveal the tiles at the given (row, col) coordinates in order, along with every tile revealing them floods out
+        to.
+
+        Parameters
+        ----------
+        tiles : list[tuple[int, int]]
+            The (row, col) coordinates of the tiles to reveal.
+        """
+
+        # the tiles still to be revealed are kept in a list instead of revealing them recursively, so revealing a huge
+        # empty area can't overflow the stack, and it starts out with every tile (reversed, so the first is popped
+        # first) so they're all flooded out from in one pass
+        reach = self.flood_reach
+        tiles_to_reveal = tiles[::-1]
+        num_revealed = 0
+        while tiles_to_reveal:
+            row, col = tiles_to_reveal.pop()
+            if self.board[row][col].revealed:
+                continue
+
+            num_revealed += 1
             self.board[row][col].revealed = True
             self.board[row][col].flag_planted = 0
-            self.board[row][col].changed_last_move = True
+            self._mark_tile_changed(row, col)
 
-            # if the tile is empty, recursively reveal all adjacent, non-mine tiles
+            # if the tile is empty, reveal every tile within `flood_reach` of it that isn't a mine too
             if self.board[row][col].type == Tile.EMPTY:
-                surrounding_tiles = [
-                    (row - 1, col - 1),
-                    (row - 1, col),
-                    (row - 1, col + 1),
-                    (row, col - 1),
-                    (row, col + 1),
-                    (row + 1, col - 1),
-                    (row + 1, col),
-                    (row + 1, col + 1),
-                ]
-
-                for tile in surrounding_tiles:
-                    if (
-                        0 <= tile[0] < self.board_height
-                        and 0 <= tile[1] < self.board_width
-                        and self.board[tile[0]][tile[1]].type != Tile.MINE
-                    ):
-                        self._reveal_tile(tile[0], tile[1])
+                for surrounding_row in range(max(row - reach, 0), min(row + reach + 1, self.board_height)):
+                    for surrounding_col in range(max(col - reach, 0), min(col + reach + 1, self.board_width)):
+                        if self.board[surrounding_row][surrounding_col].type not in (Tile.MINE, Tile.NEGATIVE_MINE):
+                            tiles_to_reveal.append((surrounding_row, surrounding_col))
+
+        # the revealed tiles are added to the stats once per call instead of once per tile, which adds up on huge boards
+        self.stats.increment_stat(self.minesweeper_version, TILES_REVEALED, num_revealed)
+        self.num_tiles_revealed += num_revealed
 
     def plant_flag_on_tile(self, row: int, col: int):
         """
@@ -206,9 +390,9 @@ class MinesweeperBoard:
                 change_value = 1
 
             if self.board[row][col].type == Tile.MINE:
-                self.stats.increment_stat(self.minesweeper_version, "Mines Defused", -change_value)
+                self.stats.increment_stat(self.minesweeper_version, MINES_DEFUSED, -change_value)
             else:
-                self.stats.increment_stat(self.minesweeper_version, "Flag Mistakes", -change_value)
+                self.stats.increment_stat(self.minesweeper_version, FLAG_MISTAKES, -change_value)
 
             surrounding_tiles = [
                 (row - 1, col - 1),
@@ -222,7 +406,7 @@ class MinesweeperBoard:
             ]
 
             self.board[row][col].flag_planted = (self.board[row][col].flag_planted + 1) % 2
-            self.board[row][col].changed_last_move = True
+            self._mark_tile_changed(row, col)
 
             # change every numbered surrounding tile by the change value
             for tile in surrounding_tiles:
@@ -232,27 +416,58 @@ class MinesweeperBoard:
                     and self.board[tile[0]][tile[1]].type == Tile.NUMBERED
                 ):
                     self.board[tile[0]][tile[1]].value += change_value
-                    self.board[tile[0]][tile[1]].changed_last_move = True
+                    self._mark_tile_changed(tile[0], tile[1])
+
+    def _mark_tile_changed(self, row: int, col: int):
+        """
+        Set the `changed_last_move` indicator of the tile at the given row and column and add it to
+        `self.changed_tiles`.
+
+        Parameters
+        ----------
+        row : int
+            The row of the tile that changed.
+        col : int
+            The column of the tile that changed.
+        """
+
+        if not self.board[row][col].changed_last_move:
+            self.board[row][col].changed_last_move = True
+            self.changed_tiles.append((row, col))
+        if self.visible_state is not None:
+            self.visible_state.update_tile(row, col)
 
     def reset_changed_last_move_board(self):
         """
         Reset every tile's `changed_last_move` indicator to False in `self.board`.
+        Only the tiles in `self.changed_tiles` can have it set, so the rest of the board isn't visited.
         """
 
-        for row in self.board:
-            for tile in row:
-                tile.changed_last_move = False
+        for row, col in self.changed_tiles:
+            if row < len(self.board) and col < len(self.board[row]):
+                self.board[row][col].changed_last_move = False
+        self.changed_tiles = []
 
     def reveal_all_tiles(self):
         """
         Set every tile to revealed.
         """
 
-        for row in self.board:
-            for tile in row:
-                if not tile.revealed:
-                    tile.changed_last_move = True
-                tile.revealed = True
+        # a board kept in a file is revealed a chunk at a time, and only its mines are redrawn, since listing every tile
+        # of a board too big for memory as changed would defeat the point
+        if isinstance(self.board, MappedTileGrid):
+            for row, col in self.board.find_tiles(Tile.MINE, Tile.NEGATIVE_MINE):
+                self._mark_tile_changed(row, col)
+            self.board.reveal_all()
+            if self.visible_state is not None:
+                self.visible_state.refresh()
+            return
+
+        for row in range(len(self.board)):
+            for col in range(len(self.board[row])):
+                if not self.board[row][col].revealed:
+                    self.board[row][col].revealed = True
+                    self._mark_tile_changed(row, col)
 
     def board_finished(self) -> bool:
         """
@@ -264,6 +479,10 @@ class MinesweeperBoard:
             Whether the board has been completed or not
         """
 
+        # a board kept in a file keeps count of its unfinished tiles, so it doesn't have to read every tile
+        if isinstance(self.board, MappedTileGrid):
+            return self.board.num_unfinished_tiles == 0
+
         for row in self.board:
             for tile in row:
 
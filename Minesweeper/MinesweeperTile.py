@@ -1,6 +1,8 @@
-import sys
 from enum import Enum
 
+# the versions whose tile values are floats (the distance-weighted number of mines around each tile) rather than ints
+FLOAT_VALUE_VERSIONS = ("Distance Minesweeper", "Weighted Minesweeper")
+
 
 class Tile(Enum):
     NULL = -1  # out of bounds
@@ -35,6 +37,9 @@ class MinesweeperTile:
         Whether the tile was updated by the last move or not.
     """
 
+    # boards hold a tile object for every tile, so tiles skip the per-object dictionary to be smaller and faster to make
+    __slots__ = ("type", "value", "revealed", "flag_planted", "changed_last_move")
+
     def __init__(
         self,
         type=Tile.EMPTY,
@@ -48,6 +53,3 @@ class MinesweeperTile:
         self.revealed = revealed
         self.flag_planted = flag_planted
         self.changed_last_move = changed_last_move
-
-        # set the recursion limit way up for my silly reveal tile function
-        sys.setrecursionlimit(100000)
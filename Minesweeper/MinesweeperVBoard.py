@@ -1,6 +1,6 @@
-import random
 from Minesweeper.MinesweeperBoard import Tile, MinesweeperTile, MinesweeperBoard
-from PlayerStats import PlayerStats
+from Minesweeper.MappedTileGrid import MappedTileGrid
+from PlayerStats import PlayerStats, MINES_DEFUSED, FLAG_MISTAKES
 
 
 class MinesweeperVBoard(MinesweeperBoard):
@@ -28,6 +28,12 @@ class MinesweeperVBoard(MinesweeperBoard):
         Stats to update throughout the game whenever a relevant action happens.
     """
 
+    # tile values count the mines up to 2 tiles away, so the first click is kept clear and empty tiles reveal the tiles
+    # around them just as far out
+    chord_reach = 2
+    safe_distance = 2
+    flood_reach = 2
+
     def __init__(
         self,
         minesweeper_version="Minesweeper V",
@@ -56,48 +62,16 @@ class MinesweeperVBoard(MinesweeperBoard):
         """
 
         # create a base board of size width x height
-        board = [[MinesweeperTile() for _ in range(self.board_width)] for _ in range(self.board_height)]
-
-        # create a list of tiles surrounding and including the first click
-        first_click_tiles = [
-            first_click_coords,
-            (first_click_coords[0] - 2, first_click_coords[1] - 2),
-            (first_click_coords[0] - 2, first_click_coords[1] - 1),
-            (first_click_coords[0] - 2, first_click_coords[1]),
-            (first_click_coords[0] - 2, first_click_coords[1] + 1),
-            (first_click_coords[0] - 2, first_click_coords[1] + 2),
-            (first_click_coords[0] - 1, first_click_coords[1] - 2),
-            (first_click_coords[0] - 1, first_click_coords[1] - 1),
-            (first_click_coords[0] - 1, first_click_coords[1]),
-            (first_click_coords[0] - 1, first_click_coords[1] + 1),
-            (first_click_coords[0] - 1, first_click_coords[1] + 2),
-            (first_click_coords[0], first_click_coords[1] - 2),
-            (first_click_coords[0], first_click_coords[1] - 1),
-            (first_click_coords[0], first_click_coords[1] + 1),
-            (first_click_coords[0], first_click_coords[1] + 2),
-            (first_click_coords[0] + 1, first_click_coords[1] - 2),
-            (first_click_coords[0] + 1, first_click_coords[1] - 1),
-            (first_click_coords[0] + 1, first_click_coords[1]),
-            (first_click_coords[0] + 1, first_click_coords[1] + 1),
-            (first_click_coords[0] + 1, first_click_coords[1] + 2),
-            (first_click_coords[0] + 2, first_click_coords[1] - 2),
-            (first_click_coords[0] + 2, first_click_coords[1] - 1),
-            (first_click_coords[0] + 2, first_click_coords[1]),
-            (first_click_coords[0] + 2, first_click_coords[1] + 1),
-            (first_click_coords[0] + 2, first_click_coords[1] + 2),
-        ]
+        board = self._create_blank_board()
 
-        # create a list of tuples representing every possible (row, col) pair
-        tile_locations = []
-        for row in range(self.board_height):
-            for col in range(self.board_width):
+        # boards kept in a file have their mines scattered straight into the file and are numbered a whole row at a
+        # time, instead of listing every mine and numbering the board a mine at a time
+        if isinstance(board, MappedTileGrid):
+            board.place_random_mines(self.rng, self.num_mines, 0, first_click_coords, self.safe_distance, reach=2)
+            return board
 
-                # if the coordinate pair is the first click or next to the first click, don't let it get a mine
-                if first_click_coords[0] < 0 or (row, col) not in first_click_tiles:
-                    tile_locations.append((row, col))
-
-        # take a random sample of locations to put mines on
-        mine_locations = random.sample(tile_locations, self.num_mines)
+        # take a random sample of locations to put mines on, keeping the first click and the tiles around it clear
+        mine_locations = self._get_mine_locations(first_click_coords, self.safe_distance)
 
         # hide the mines in the board
         for mine_location in mine_locations:
@@ -144,61 +118,6 @@ class MinesweeperVBoard(MinesweeperBoard):
 
         return board
 
-    def _reveal_tile(self, row, col):
-        """
-        Reveal the tile at the given row and column.
-
-        Parameters
-        ----------
-        row : int
-            The row of the tile to reveal.
-        col : int
-            The column of the tile to reveal.
-        """
-
-        if not self.board[row][col].revealed:
-            self.stats.increment_stat(self.minesweeper_version, "Tiles Revealed")
-            self.board[row][col].revealed = True
-            self.board[row][col].flag_planted = 0
-            self.board[row][col].changed_last_move = True
-
-            # if the tile is empty, recursively reveal all adjacent, non-mine tiles
-            if self.board[row][col].type == Tile.EMPTY:
-                surrounding_tiles = [
-                    (row - 2, col - 2),
-                    (row - 2, col - 1),
-                    (row - 2, col),
-                    (row - 2, col + 1),
-                    (row - 2, col + 2),
-                    (row - 1, col - 2),
-                    (row - 1, col - 1),
-                    (row - 1, col),
-                    (row - 1, col + 1),
-                    (row - 1, col + 2),
-                    (row, col - 2),
-                    (row, col - 1),
-                    (row, col + 1),
-                    (row, col + 2),
-                    (row + 1, col - 2),
-                    (row + 1, col - 1),
-                    (row + 1, col),
-                    (row + 1, col + 1),
-                    (row + 1, col + 2),
-                    (row + 2, col - 2),
-                    (row + 2, col - 1),
-                    (row + 2, col),
-                    (row + 2, col + 1),
-                    (row + 2, col + 2),
-                ]
-
-                for tile in surrounding_tiles:
-                    if (
-                        0 <= tile[0] < self.board_height
-                        and 0 <= tile[1] < self.board_width
-                        and self.board[tile[0]][tile[1]].type != Tile.MINE
-                    ):
-                        self._reveal_tile(tile[0], tile[1])
-
     def plant_flag_on_tile(self, row, col):
         """
         Plant or unplant a flag on the tile at the given row and column if it is not revealed.
@@ -222,9 +141,9 @@ class MinesweeperVBoard(MinesweeperBoard):
                 change_value = 1
 
             if self.board[row][col].type == Tile.MINE:
-                self.stats.increment_stat(self.minesweeper_version, "Mines Defused", -change_value)
+                self.stats.increment_stat(self.minesweeper_version, MINES_DEFUSED, -change_value)
             else:
-                self.stats.increment_stat(self.minesweeper_version, "Flag Mistakes", -change_value)
+                self.stats.increment_stat(self.minesweeper_version, FLAG_MISTAKES, -change_value)
 
             surrounding_tiles = [
                 (row - 2, col - 2),
@@ -254,7 +173,7 @@ class MinesweeperVBoard(MinesweeperBoard):
             ]
 
             self.board[row][col].flag_planted = (self.board[row][col].flag_planted + 1) % 2
-            self.board[row][col].changed_last_move = True
+            self._mark_tile_changed(row, col)
 
             # change every numbered surrounding tile by the change value
             for tile in surrounding_tiles:
@@ -264,4 +183,4 @@ class MinesweeperVBoard(MinesweeperBoard):
                     and self.board[tile[0]][tile[1]].type == Tile.NUMBERED
                 ):
                     self.board[tile[0]][tile[1]].value += change_value
-                    self.board[tile[0]][tile[1]].changed_last_move = True
+                    self._mark_tile_changed(tile[0], tile[1])
@@ -1,6 +1,6 @@
-import random
 from Minesweeper.MinesweeperBoard import Tile, MinesweeperTile, MinesweeperBoard
-from PlayerStats import PlayerStats
+from Minesweeper.MappedTileGrid import MappedTileGrid
+from PlayerStats import PlayerStats, FLAG_MISTAKES, POSITIVE_MINES_DEFUSED, NEGATIVE_MINES_DEFUSED
 
 
 class NegativeMinesweeperBoard(MinesweeperBoard):
@@ -31,6 +31,10 @@ class NegativeMinesweeperBoard(MinesweeperBoard):
         Stats to update throughout the game whenever a relevant action happens.
     """
 
+    # a positive and a negative mine next to a tile cancel out in its value, so a number brought down to 0 doesn't mean
+    # the flags around it account for every mine there, and chording it could reveal them
+    chord_reach = 0
+
     def __init__(
         self,
         minesweeper_version="Negative Minesweeper",
@@ -62,39 +66,26 @@ class NegativeMinesweeperBoard(MinesweeperBoard):
         """
 
         # create a base board of size width x height
-        board = [[MinesweeperTile() for _ in range(self.board_width)] for _ in range(self.board_height)]
-
-        # create a list of tiles surrounding and including the first click
-        first_click_tiles = [
-            first_click_coords,
-            (first_click_coords[0] - 1, first_click_coords[1] - 1),
-            (first_click_coords[0] - 1, first_click_coords[1]),
-            (first_click_coords[0] - 1, first_click_coords[1] + 1),
-            (first_click_coords[0], first_click_coords[1] - 1),
-            (first_click_coords[0], first_click_coords[1] + 1),
-            (first_click_coords[0] + 1, first_click_coords[1] - 1),
-            (first_click_coords[0] + 1, first_click_coords[1]),
-            (first_click_coords[0] + 1, first_click_coords[1] + 1),
-        ]
-
-        # create a list of tuples representing every possible (row, col) pair
-        tile_locations = []
-        for row in range(self.board_height):
-            for col in range(self.board_width):
-
-                # if the coordinate pair is the first click or next to the first click, don't let it get a mine
-                if first_click_coords[0] < 0 or (row, col) not in first_click_tiles:
-                    tile_locations.append((row, col))
-
-        # take a random sample of locations to put mines on
-        mine_locations = random.sample(tile_locations, self.num_mines)
+        board = self._create_blank_board()
+
+        # boards kept in a file have their mines scattered straight into the file and are numbered a whole row at a
+        # time, instead of listing every mine and numbering the board a mine at a time
+        if isinstance(board, MappedTileGrid):
+            board.place_random_mines(
+                self.rng, self.num_positive_mines, self.num_negative_mines, first_click_coords, self.safe_distance
+            )
+            return board
+
+        # take a random sample of locations to put mines on, keeping the first click and the tiles around it clear
+        mine_locations = self._get_mine_locations(first_click_coords)
 
         # hide the mines in the board
-        positive_count = 0
-        for mine_location in mine_locations:
-            if positive_count < self.num_positive_mines:
+        for mine_number, mine_location in enumerate(mine_locations):
+
+            # the first `num_positive_mines` mines are positive, and the rest are negative
+            positive_mine = mine_number < self.num_positive_mines
+            if positive_mine:
                 board[mine_location[0]][mine_location[1]] = MinesweeperTile(Tile.MINE)
-                positive_count += 1
             else:
                 board[mine_location[0]][mine_location[1]] = MinesweeperTile(Tile.NEGATIVE_MINE)
 
@@ -117,7 +108,7 @@ class NegativeMinesweeperBoard(MinesweeperBoard):
                     and board[tile[0]][tile[1]].type != Tile.MINE
                     and board[tile[0]][tile[1]].type != Tile.NEGATIVE_MINE
                 ):
-                    if positive_count < self.num_positive_mines:
+                    if positive_mine:
                         board[tile[0]][tile[1]].value += 1
                     else:
                         board[tile[0]][tile[1]].value -= 1
@@ -127,46 +118,6 @@ class NegativeMinesweeperBoard(MinesweeperBoard):
 
         return board
 
-    def _reveal_tile(self, row, col):
-        """
-        Reveal the tile at the given row and column.
-
-        Parameters
-        ----------
-        row : int
-            The row of the tile to reveal.
-        col : int
-            The column of the tile to reveal.
-        """
-
-        if not self.board[row][col].revealed:
-            self.stats.increment_stat(self.minesweeper_version, "Tiles Revealed")
-            self.board[row][col].revealed = True
-            self.board[row][col].flag_planted = False
-            self.board[row][col].changed_last_move = True
-
-            # if the tile is empty, recursively reveal all adjacent, non-mine tiles
-            if self.board[row][col].type == Tile.EMPTY:
-                surrounding_tiles = [
-                    (row - 1, col - 1),
-                    (row - 1, col),
-                    (row - 1, col + 1),
-                    (row, col - 1),
-                    (row, col + 1),
-                    (row + 1, col - 1),
-                    (row + 1, col),
-                    (row + 1, col + 1),
-                ]
-
-                for tile in surrounding_tiles:
-                    if (
-                        0 <= tile[0] < self.board_height
-                        and 0 <= tile[1] < self.board_width
-                        and self.board[tile[0]][tile[1]].type != Tile.MINE
-                        and self.board[tile[0]][tile[1]].type != Tile.NEGATIVE_MINE
-                    ):
-                        self._reveal_tile(tile[0], tile[1])
-
     def plant_flag_on_tile(self, row, col):
         """
         Plant or unplant a flag on the tile at the given row and column if it is not revealed.
@@ -193,25 +144,25 @@ class NegativeMinesweeperBoard(MinesweeperBoard):
             # TODO: this is ridiculous lol
             if self.board[row][col].type == Tile.MINE:
                 if self.board[row][col].flag_planted == 0:
-                    self.stats.increment_stat(self.minesweeper_version, "Positive Mines Defused")
+                    self.stats.increment_stat(self.minesweeper_version, POSITIVE_MINES_DEFUSED)
                 elif self.board[row][col].flag_planted == 1:
-                    self.stats.increment_stat(self.minesweeper_version, "Positive Mines Defused", -1)
-                    self.stats.increment_stat(self.minesweeper_version, "Flag Mistakes")
+                    self.stats.increment_stat(self.minesweeper_version, POSITIVE_MINES_DEFUSED, -1)
+                    self.stats.increment_stat(self.minesweeper_version, FLAG_MISTAKES)
                 else:
-                    self.stats.increment_stat(self.minesweeper_version, "Flag Mistakes", -1)
+                    self.stats.increment_stat(self.minesweeper_version, FLAG_MISTAKES, -1)
             elif self.board[row][col].type == Tile.NEGATIVE_MINE:
                 if self.board[row][col].flag_planted == 0:
-                    self.stats.increment_stat(self.minesweeper_version, "Flag Mistakes", -1)
+                    self.stats.increment_stat(self.minesweeper_version, FLAG_MISTAKES, -1)
                 elif self.board[row][col].flag_planted == 1:
-                    self.stats.increment_stat(self.minesweeper_version, "Negative Mines Defused")
+                    self.stats.increment_stat(self.minesweeper_version, NEGATIVE_MINES_DEFUSED)
                 else:
-                    self.stats.increment_stat(self.minesweeper_version, "Negative Mines Defused", -1)
-                    self.stats.increment_stat(self.minesweeper_version, "Flag Mistakes")
+                    self.stats.increment_stat(self.minesweeper_version, NEGATIVE_MINES_DEFUSED, -1)
+                    self.stats.increment_stat(self.minesweeper_version, FLAG_MISTAKES)
             else:
                 if self.board[row][col].flag_planted == 0:
-                    self.stats.increment_stat(self.minesweeper_version, "Flag Mistakes")
+                    self.stats.increment_stat(self.minesweeper_version, FLAG_MISTAKES)
                 elif self.board[row][col].flag_planted == 2:
-                    self.stats.increment_stat(self.minesweeper_version, "Flag Mistakes", -1)
+                    self.stats.increment_stat(self.minesweeper_version, FLAG_MISTAKES, -1)
 
             surrounding_tiles = [
                 (row - 1, col - 1),
@@ -225,7 +176,7 @@ class NegativeMinesweeperBoard(MinesweeperBoard):
             ]
 
             self.board[row][col].flag_planted = (self.board[row][col].flag_planted + 1) % 3
-            self.board[row][col].changed_last_move = True
+            self._mark_tile_changed(row, col)
 
             # change every numbered surrounding tile by the change value
             for tile in surrounding_tiles:
@@ -235,7 +186,7 @@ class NegativeMinesweeperBoard(MinesweeperBoard):
                     and self.board[tile[0]][tile[1]].type == Tile.NUMBERED
                 ):
                     self.board[tile[0]][tile[1]].value += change_value
-                    self.board[tile[0]][tile[1]].changed_last_move = True
+                    self._mark_tile_changed(tile[0], tile[1])
 
     def board_finished(self) -> bool:
         """
@@ -247,6 +198,10 @@ class NegativeMinesweeperBoard(MinesweeperBoard):
             Whether the board has been completed or not
         """
 
+        # a board kept in a file keeps count of its unfinished tiles, so it doesn't have to read every tile
+        if isinstance(self.board, MappedTileGrid):
+            return self.board.num_unfinished_tiles == 0
+
         for row in self.board:
             for tile in row:
 
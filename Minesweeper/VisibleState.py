@@ -0,0 +1,130 @@
+from array import array
+from Minesweeper.MinesweeperTile import FLOAT_VALUE_VERSIONS, Tile
+
+
+class VisibleState:
+    """
+    What a player can see of a board, kept as flat planes of one number per tile (in row-major order) that the board
+    updates in place as each tile changes.
+
+    Bots, renderers and other processes can read the planes straight through the buffer protocol, as the 2D memoryviews
+    of shape (height, width) the `*_view` properties give (`numpy.asarray` wraps them without copying), instead of
+    walking every tile object of the board after each move.
+
+    Attributes
+    ----------
+    minesweeper_board : MinesweeperBoard
+        The board whose visible state is kept.
+
+    revealed : bytearray
+        1 for each revealed tile, or 0.
+
+    flags : bytearray
+        The `flag_planted` of each hidden tile (1 for a flag, 2 for a negative flag), or 0 for revealed tiles.
+
+    mines : bytearray
+        1 for each revealed mine, 2 for each revealed negative mine, or 0.
+
+    values : array.array
+        The value of each revealed tile, or 0 for hidden tiles, as doubles for versions with float values and ints for
+        the rest.
+    """
+
+    def __init__(self, minesweeper_board):
+        self.minesweeper_board = minesweeper_board
+        num_tiles = minesweeper_board.board_width * minesweeper_board.board_height
+        self.revealed = bytearray(num_tiles)
+        self.flags = bytearray(num_tiles)
+        self.mines = bytearray(num_tiles)
+        value_type = "d" if minesweeper_board.minesweeper_version in FLOAT_VALUE_VERSIONS else "i"
+        self.values = array(value_type, bytes(num_tiles * array(value_type).itemsize))
+        self.refresh()
+
+    @property
+    def revealed_view(self) -> memoryview:
+        """
+        The revealed plane as a memoryview of shape (height, width).
+        """
+
+        return self._view(self.revealed)
+
+    @property
+    def flags_view(self) -> memoryview:
+        """
+        The flags plane as a memoryview of shape (height, width).
+        """
+
+        return self._view(self.flags)
+
+    @property
+    def mines_view(self) -> memoryview:
+        """
+        The mines plane as a memoryview of shape (height, width).
+        """
+
+        return self._view(self.mines)
+
+    @property
+    def values_view(self) -> memoryview:
+        """
+        The values plane as a memoryview of shape (height, width).
+        """
+
+        return self._view(self.values)
+
+    def update_tile(self, row: int, col: int):
+        """
+        Update the planes for a single tile from the board.
+
+        Parameters
+        ----------
+        row : int
+            The row of the tile.
+
+        col : int
+            The column of the tile.
+        """
+
+        tile = self.minesweeper_board.board[row][col]
+        index = row * self.minesweeper_board.board_width + col
+        if tile.revealed:
+            self.revealed[index] = 1
+            self.flags[index] = 0
+            self.mines[index] = 1 if tile.type == Tile.MINE else 2 if tile.type == Tile.NEGATIVE_MINE else 0
+            self.values[index] = tile.value
+        else:
+            self.revealed[index] = 0
+            self.flags[index] = tile.flag_planted
+            self.mines[index] = 0
+            self.values[index] = 0
+
+    def clear(self):
+        """
+        Set the planes to a board where every tile is hidden without a flag, which a newly generated board always is.
+        """
+
+        # the planes are overwritten rather than replaced, so views of them already handed out stay up to date
+        num_tiles = len(self.revealed)
+        self.revealed[:] = bytes(num_tiles)
+        self.flags[:] = bytes(num_tiles)
+        self.mines[:] = bytes(num_tiles)
+        memoryview(self.values).cast("B")[:] = bytes(num_tiles * self.values.itemsize)
+
+    def refresh(self):
+        """
+        Update the planes for every tile from the board.
+        """
+
+        self.clear()
+        for row, tile_row in enumerate(self.minesweeper_board.board):
+            for col, tile in enumerate(tile_row):
+                if tile.revealed or tile.flag_planted:
+                    self.update_tile(row, col)
+
+    def _view(self, plane: bytearray | array) -> memoryview:
+        board = self.minesweeper_board
+        return (
+            memoryview(plane)
+            .cast("B")
+            .cast("B" if isinstance(plane, bytearray) else plane.typecode, (board.board_height, board.board_width))
+        )
@@ -0,0 +1,451 @@
+"""
+A reinforcement learning environment for Minesweeper, in the style of gym: `reset(seed)` starts a game, and
+`step(action)` makes a move and returns (observation, reward, done, info).
+
+An action is a single number: `row * width + col` reveals that tile, and `width * height` more than that plants a flag
+on it. Observations are float32 arrays of shape (NUM_CHANNELS, height, width), flattened in C order, with a channel for:
+- `VALUE_CHANNEL`: each revealed tile's value (a float in Distance and Weighted Minesweeper), or -1 if it's hidden
+- `REVEALED_CHANNEL`: 1 if the tile is revealed, or 0
+- `FLAG_CHANNEL`: 1 if the hidden tile has a flag, -1 if it has a negative flag, or 0
+- `MINE_CHANNEL`: 1 if the tile is a revealed mine, -1 if it's a revealed negative mine, or 0
+Each environment keeps a single observation and updates it in place, only rewriting the tiles each move changed, so
+`numpy.frombuffer(observation, numpy.float32).reshape(env.observation_shape)` wraps it without copying. Copy it to keep
+an observation from one step to the next.
+
+Revealing tiles is rewarded with the fraction of the board's safe tiles revealed, so a won game adds up to 1 before the
+`WIN_REWARD`, and revealing a mine gets `LOSS_REWARD` instead. Planting flags and moves that don't change anything are
+rewarded with 0.
+
+`VectorMinesweeperEnv` steps many environments together, with one action each, starting a new game on any environment
+whose game ended (the observation it ended on is kept in its info as "final_observation"). Versions that can be batched
+(see `Minesweeper.BoardBatch`) are all stepped at once, without a board object per game.
+"""
+
+import random
+from array import array
+from typing import Sequence
+from GameController import create_minesweeper_board
+from Minesweeper.BoardBatch import BoardBatch, REACHES
+from Minesweeper.MinesweeperTile import Tile
+
+NUM_CHANNELS = 4
+VALUE_CHANNEL = 0
+REVEALED_CHANNEL = 1
+FLAG_CHANNEL = 2
+MINE_CHANNEL = 3
+
+WIN_REWARD = 1.0
+LOSS_REWARD = -1.0
+
+# translation tables from one 0 or 1 byte per tile to a byte of all 1s where the tile is revealed, and where it's hidden
+REVEALED_MASK = bytes.maketrans(b"\x00\x01", b"\x00\xff")
+HIDDEN_MASK = bytes.maketrans(b"\x00\x01", b"\xff\x00")
+
+
+def get_reward(num_revealed: int, num_safe_tiles: int, lost: bool, won: bool) -> float:
+    """
+    Get the reward for a move.
+
+    Parameters
+    ----------
+    num_revealed : int
+        The number of tiles the move revealed.
+
+    num_safe_tiles : int
+        The number of tiles on the board that aren't mines.
+
+    lost : bool
+        Whether the move revealed a mine.
+
+    won : bool
+        Whether the move won the game.
+
+    Returns
+    -------
+    float
+        The reward.
+    """
+
+    if lost:
+        return LOSS_REWARD
+    return num_revealed / num_safe_tiles + (WIN_REWARD if won else 0)
+
+
+class MinesweeperEnv:
+    """
+    A single game of Minesweeper for an agent to play, one action at a time.
+
+    Attributes
+    ----------
+    width : int, default: 16
+        The number of tiles wide the board is.
+
+    height : int, default: 16
+        The number of tiles high the board is.
+
+    num_mines : int, default: 40
+        The number of mines hidden in the board.
+
+    version : {"Minesweeper", "Minesweeper V", "Distance Minesweeper", "Weighted Minesweeper",
+               "Negative Minesweeper"}, default: "Minesweeper"
+        Which version of Minesweeper to play.
+
+    difficulty : {"easy", "medium", "hard"}, default: "medium"
+        How difficult the game is (ONLY affects certain gamemodes, such as Distance Minesweeper).
+
+    num_actions : int
+        The number of different actions, twice the number of tiles.
+
+    observation_shape : tuple[int, int, int]
+        The shape of an observation, (NUM_CHANNELS, height, width).
+
+    observation : memoryview
+        The current observation, a flat float32 view updated in place by every move.
+
+    minesweeper_board : MinesweeperBoard
+        The board being played on.
+
+    first_move_made : bool
+        Whether the board has been generated by the first reveal yet.
+
+    game_over : bool
+        Whether the game is over.
+
+    won : bool
+        Whether the game was won.
+    """
+
+    def __init__(
+        self,
+        width=16,
+        height=16,
+        num_mines=40,
+        version="Minesweeper",
+        difficulty="medium",
+        observation: memoryview = None,
+    ):
+        self.width = width
+        self.height = height
+        self.num_mines = num_mines
+        self.version = version
+        self.difficulty = difficulty
+        self.num_actions = 2 * width * height
+        self.observation_shape = (NUM_CHANNELS, height, width)
+
+        # a vector of environments gives each one its own part of a single observation for all of them
+        if observation is None:
+            observation = memoryview(array("f", bytes(4 * NUM_CHANNELS * width * height)))
+        self.observation = observation
+        self.blank_observation = array("f", [-1.0] * width * height + [0.0] * (NUM_CHANNELS - 1) * width * height)
+
+        self.minesweeper_board = None
+        self.first_move_made = False
+        self.game_over = False
+        self.won = False
+
+    def reset(self, seed: int = None) -> memoryview:
+        """
+        Start a new game.
+
+        Parameters
+        ----------
+        seed : int, optional
+            The seed to place the board's mines with, a random one by default.
+
+        Returns
+        -------
+        memoryview
+            The first observation, of a board with every tile hidden.
+        """
+
+        self.minesweeper_board = create_minesweeper_board(
+            self.width, self.height, self.num_mines, self.version, self.difficulty
+        )
+        if seed is not None:
+            self.minesweeper_board.rng.seed(seed)
+        self.first_move_made = False
+        self.game_over = False
+        self.won = False
+        self.observation[:] = memoryview(self.blank_observation)
+        return self.observation
+
+    def step(self, action: int) -> tuple[memoryview, float, bool, dict]:
+        """
+        Make a move, just as the game controller makes a click.
+
+        Parameters
+        ----------
+        action : int
+            The tile to reveal (row * width + col), or width * height more than the tile to plant a flag on.
+
+        Returns
+        -------
+        tuple[memoryview, float, bool, dict]
+            The observation after the move, the move's reward, whether the game is over, and info about the move:
+            "won" (whether the game was won) and "tiles_revealed" (the number of tiles the move revealed).
+        """
+
+        if self.game_over:
+            raise Exception("The game is over, reset the environment to start a new one")
+        if not 0 <= action < self.num_actions:
+            raise Exception(f"Invalid action {action}")
+
+        minesweeper_board = self.minesweeper_board
+        row, col = divmod(action % (self.width * self.height), self.width)
+        num_revealed_before = minesweeper_board.num_tiles_revealed
+        lost = False
+        if action < self.width * self.height:
+
+            # the first reveal replaces the whole board, flags and all, so every tile is redrawn
+            if not self.first_move_made:
+                minesweeper_board.board = minesweeper_board.get_random_board((row, col))
+                self.first_move_made = True
+                self.observation[:] = memoryview(self.blank_observation)
+
+            activated_tile = minesweeper_board.make_move(row, col)
+            if activated_tile.type == Tile.MINE or activated_tile.type == Tile.NEGATIVE_MINE:
+                minesweeper_board.reveal_all_tiles()
+                self.game_over = lost = True
+            elif minesweeper_board.board_finished():
+                self.game_over = self.won = True
+        else:
+            minesweeper_board.plant_flag_on_tile(row, col)
+        self.update_observation(minesweeper_board.changed_tiles)
+
+        num_revealed = minesweeper_board.num_tiles_revealed - num_revealed_before
+        reward = get_reward(num_revealed, self.width * self.height - self.num_mines, lost, self.won)
+        return self.observation, reward, self.game_over, {"won": self.won, "tiles_revealed": num_revealed}
+
+    def update_observation(self, changed_tiles: Sequence[tuple[int, int]]):
+        """
+        Rewrite the given tiles of the observation from the board.
+
+        Parameters
+        ----------
+        changed_tiles : Sequence[tuple[int, int]]
+            The (row, col) coordinates of the tiles to rewrite.
+        """
+
+        board = self.minesweeper_board.board
+        observation = self.observation
+        num_tiles = self.width * self.height
+        for row, col in changed_tiles:
+            tile = board[row][col]
+            index = row * self.width + col
+            if tile.revealed:
+                observation[index] = tile.value
+                observation[index + REVEALED_CHANNEL * num_tiles] = 1.0
+                observation[index + FLAG_CHANNEL * num_tiles] = 0.0
+                observation[index + MINE_CHANNEL * num_tiles] = (
+                    1.0 if tile.type == Tile.MINE else -1.0 if tile.type == Tile.NEGATIVE_MINE else 0.0
+                )
+            else:
+                observation[index] = -1.0
+                observation[index + REVEALED_CHANNEL * num_tiles] = 0.0
+                observation[index + FLAG_CHANNEL * num_tiles] = (0.0, 1.0, -1.0)[tile.flag_planted]
+                observation[index + MINE_CHANNEL * num_tiles] = 0.0
+
+
+class VectorMinesweeperEnv:
+    """
+    Many environments of the same settings stepped together, each starting a new game as soon as its last one ends.
+
+    The observations of every environment are kept in one float32 array of shape (num_envs, NUM_CHANNELS, height,
+    width), flattened in C order, which is updated in place by every step.
+
+    Attributes
+    ----------
+    num_envs : int
+        The number of environments.
+
+    width : int, default: 16
+        The number of tiles wide each board is.
+
+    height : int, default: 16
+        The number of tiles high each board is.
+
+    num_mines : int, default: 40
+        The number of mines hidden in each board.
+
+    version : {"Minesweeper", "Minesweeper V", "Distance Minesweeper", "Weighted Minesweeper",
+               "Negative Minesweeper"}, default: "Minesweeper"
+        Which version of Minesweeper to play.
+
+    difficulty : {"easy", "medium", "hard"}, default: "medium"
+        How difficult the games are (ONLY affects certain gamemodes, such as Distance Minesweeper).
+
+    observations : array.array
+        The observations of every environment.
+
+    rng : random.Random
+        Picks the seed of each new game.
+
+    batch : BoardBatch
+        Every environment's board, if the version can be batched.
+
+    envs : list[MinesweeperEnv]
+        Each environment, if the version can't be batched.
+    """
+
+    def __init__(self, num_envs: int, width=16, height=16, num_mines=40, version="Minesweeper", difficulty="medium"):
+        self.num_envs = num_envs
+        self.width = width
+        self.height = height
+        self.num_mines = num_mines
+        self.version = version
+        self.difficulty = difficulty
+        self.observation_size = NUM_CHANNELS * width * height
+        self.observations = array("f", bytes(4 * num_envs * self.observation_size))
+        self.blank_observation = array("f", [-1.0] * width * height + [0.0] * (NUM_CHANNELS - 1) * width * height)
+        self.rng = random.Random()
+
+        self.batch = None
+        self.envs = []
+        self.num_revealed = [0] * num_envs
+        if version in REACHES:
+            self.batch = BoardBatch(num_envs, width, height, num_mines, version)
+        else:
+            observations = memoryview(self.observations)
+            self.envs = [
+                MinesweeperEnv(
+                    width,
+                    height,
+                    num_mines,
+                    version,
+                    difficulty,
+                    observations[env_number * self.observation_size : (env_number + 1) * self.observation_size],
+                )
+                for env_number in range(num_envs)
+            ]
+
+    def reset(self, seed: int = None) -> array:
+        """
+        Start a new game in every environment.
+
+        Parameters
+        ----------
+        seed : int, optional
+            Seeds every game played from now on, random by default.
+
+        Returns
+        -------
+        array.array
+            The first observation of every environment.
+        """
+
+        self.rng.seed(seed)
+        self._reset_envs(range(self.num_envs))
+        return self.observations
+
+    def step(self, actions: Sequence[int]) -> tuple[array, list[float], list[bool], list[dict]]:
+        """
+        Make a move in every environment.
+
+        Parameters
+        ----------
+        actions : Sequence[int]
+            The action for each environment, the same as `MinesweeperEnv.step` takes.
+
+        Returns
+        -------
+        tuple[array.array, list[float], list[bool], list[dict]]
+            The observation of every environment after the step (the first observation of a new game for the ones
+            whose game ended), and each environment's reward, whether its game ended and its info. The info of an
+            environment whose game ended also has the observation it ended on, as "final_observation".
+        """
+
+        if len(actions) != self.num_envs:
+            raise Exception(f"Expected an action for each of the {self.num_envs} environments, got {len(actions)}")
+
+        if self.batch is None:
+            results = [env.step(action) for env, action in zip(self.envs, actions)]
+            rewards = [reward for _, reward, _, _ in results]
+            dones = [done for _, _, done, _ in results]
+            infos = [info for _, _, _, info in results]
+        else:
+            rewards, dones, infos = self._step_batch(actions)
+
+        finished_envs = [env_number for env_number, done in enumerate(dones) if done]
+        for env_number in finished_envs:
+            start = env_number * self.observation_size
+            infos[env_number]["final_observation"] = self.observations[start : start + self.observation_size]
+        self._reset_envs(finished_envs)
+        return self.observations, rewards, dones, infos
+
+    def _step_batch(self, actions: Sequence[int]) -> tuple[list[float], list[bool], list[dict]]:
+        """
+        Make a move on every board of the batch, and write every observation out from the batch's planes.
+        """
+
+        num_tiles = self.width * self.height
+        for action in actions:
+            if not 0 <= action < 2 * num_tiles:
+                raise Exception(f"Invalid action {action}")
+
+        batch = self.batch
+        batch.step(
+            [
+                ("left" if action < num_tiles else "right",) + divmod(action % num_tiles, self.width)
+                for action in actions
+            ]
+        )
+        revealed, flags, mines, values = batch.get_planes()
+
+        # a hidden tile's value is -1 (all 1s as a signed byte), which is worked out for every tile at once
+        num_cells = len(values)
+        values = (
+            (int.from_bytes(values, "little") & int.from_bytes(revealed.translate(REVEALED_MASK), "little"))
+            | int.from_bytes(revealed.translate(HIDDEN_MASK), "little")
+        ).to_bytes(num_cells, "little")
+
+        # each plane is turned into floats in one go, then each environment's part is copied into its observation
+        channels = [None] * NUM_CHANNELS
+        for channel, plane in (
+            (VALUE_CHANNEL, values),
+            (REVEALED_CHANNEL, revealed),
+            (FLAG_CHANNEL, flags),
+            (MINE_CHANNEL, mines),
+        ):
+            channels[channel] = memoryview(array("f", array("b", plane)))
+        observations = memoryview(self.observations)
+
+        rewards = []
+        dones = []
+        infos = []
+        for env_number in range(self.num_envs):
+            tiles_start = env_number * num_tiles
+            observation_start = env_number * self.observation_size
+            for channel in range(NUM_CHANNELS):
+                start = observation_start + channel * num_tiles
+                observations[start : start + num_tiles] = channels[channel][tiles_start : tiles_start + num_tiles]
+
+            game_over, won = batch.game_over[env_number], batch.won[env_number]
+            lost = game_over and not won
+            num_revealed = revealed.count(1, tiles_start, tiles_start + num_tiles)
+
+            # a lost board has every tile revealed, but the move itself only revealed the mine
+            tiles_revealed = 1 if lost else num_revealed - self.num_revealed[env_number]
+            self.num_revealed[env_number] = num_revealed
+            rewards.append(get_reward(tiles_revealed, num_tiles - self.num_mines, lost, won))
+            dones.append(game_over)
+            infos.append({"won": won, "tiles_revealed": tiles_revealed})
+        return rewards, dones, infos
+
+    def _reset_envs(self, env_numbers: Sequence[int]):
+        """
+        Start a new game in each of the given environments.
+        """
+
+        if not env_numbers:
+            return
+        seeds = [self.rng.getrandbits(64) for _ in env_numbers]
+        if self.batch is None:
+            for env_number, seed in zip(env_numbers, seeds):
+                self.envs[env_number].reset(seed)
+            return
+
+        self.batch.reset(env_numbers, seeds)
+        for env_number in env_numbers:
+            start = env_number * self.observation_size
+            self.observations[start : start + self.observation_size] = self.blank_observation
+            self.num_revealed[env_number] = 0
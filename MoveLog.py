@@ -0,0 +1,297 @@
+"""
+An append-only log of the moves made in each game, which can be replayed without any window to get the same game back.
+
+Every game's board is generated from a seed, so a game is fully described by its settings, its seed and the moves made
+in it (the first left click being where the board was generated around). That's a few bytes per move, instead of the
+whole board a snapshot stores, which makes logs cheap enough to keep for every finished game, to reproduce bug reports
+with and to replay as benchmarks.
+
+Layout of a log file (all numbers little-endian):
+- header: magic b"MSWL" and format version (u16), written once when the file is created
+- then, for each game, a game record: b"G", width, height and number of mines (u32 each), seed (u64), version name
+  length and difficulty length (u8 each), and the utf-8 version name and difficulty
+- followed by a move record for each move made in that game: b"L" (left click), b"R" (right click) or b"C" (chord,
+  a left click on a revealed number), row and col (u32 each)
+
+Records are only ever appended, so a log cut short (ex. by a crash) loses nothing but its unfinished last record.
+"""
+
+import struct
+import sys
+import time
+from typing import BinaryIO
+from Minesweeper.MinesweeperBoard import Tile, MinesweeperBoard
+from PlayerStats import PlayerStats
+
+MAGIC = b"MSWL"
+FORMAT_VERSION = 1
+
+HEADER = struct.Struct("<4sH")
+GAME = struct.Struct("<cIIIQBB")
+MOVE = struct.Struct("<cII")
+
+# the record code of each mouse button, and the other way around (chords are recorded as moves of their own, so a replay
+# never has to work out which left clicks were on revealed tiles)
+MOVE_CODES = {"left": b"L", "right": b"R", "chord": b"C"}
+MOUSE_BUTTONS = {b"L": "left", b"R": "right", b"C": "chord"}
+
+
+class MoveLog:
+    """
+    The settings, seed and moves of a single game, which can be replayed to make the same moves on the same board.
+
+    Attributes
+    ----------
+    version : {"Minesweeper", "Minesweeper V", "Distance Minesweeper", "Weighted Minesweeper", "Negative Minesweeper"}
+        Which version of Minesweeper the game was played in.
+
+    width : int
+        The number of tiles wide the board is.
+
+    height : int
+        The number of tiles high the board is.
+
+    num_mines : int
+        The number of mines hidden in the board.
+
+    difficulty : str
+        How difficult the game was (ONLY affects certain gamemodes, such as Distance Minesweeper).
+
+    seed : int
+        The seed the board's mines were placed with.
+
+    moves : list[tuple[str, int, int]]
+        Every move made in the game in the order it was made, in the form (mouse button, row, col).
+
+    log_file : BinaryIO, optional
+        The file each move is appended to as it's made, if the game is being logged to one.
+    """
+
+    def __init__(
+        self,
+        version: str,
+        width: int,
+        height: int,
+        num_mines: int,
+        difficulty: str,
+        seed: int,
+        moves: list[tuple[str, int, int]] = None,
+        file_name: str = None,
+    ):
+        self.version = version
+        self.width = width
+        self.height = height
+        self.num_mines = num_mines
+        self.difficulty = difficulty
+        self.seed = seed
+        self.moves = moves if moves is not None else []
+        self.log_file = None
+
+        if file_name is not None:
+            self.log_file = open_log_file(file_name)
+            self.log_file.write(self.game_record())
+            self.log_file.flush()
+
+    @property
+    def first_click(self) -> tuple[int, int] | None:
+        """
+        The (row, col) coordinates of the first left click, which the board was generated around.
+        """
+
+        for mouse_button, row, col in self.moves:
+            if mouse_button == "left":
+                return row, col
+        return None
+
+    def game_record(self) -> bytes:
+        """
+        Get the record that starts this game in a log file.
+
+        Returns
+        -------
+        bytes
+            The game record.
+        """
+
+        version_name = self.version.encode("utf-8")
+        difficulty = self.difficulty.encode("utf-8")
+        return (
+            GAME.pack(b"G", self.width, self.height, self.num_mines, self.seed, len(version_name), len(difficulty))
+            + version_name
+            + difficulty
+        )
+
+    def to_bytes(self) -> bytes:
+        """
+        Get this game's game record followed by the records of all its moves, as they appear in a log file.
+
+        Returns
+        -------
+        bytes
+            The game's records.
+        """
+
+        return self.game_record() + b"".join(
+            MOVE.pack(MOVE_CODES[mouse_button], row, col) for mouse_button, row, col in self.moves
+        )
+
+    def add_move(self, mouse_button: str, row: int, col: int):
+        """
+        Add a move to the end of the log, and append it to the log file straight away if there is one.
+
+        Parameters
+        ----------
+        mouse_button : {"left", "right", "chord"}
+            Which mouse button the move was made with, or "chord" for a left click on a revealed number.
+
+        row : int
+            The row of the clicked tile.
+
+        col : int
+            The column of the clicked tile.
+        """
+
+        self.moves.append((mouse_button, row, col))
+        if self.log_file is not None:
+            self.log_file.write(MOVE.pack(MOVE_CODES[mouse_button], row, col))
+            self.log_file.flush()
+
+    def close(self):
+        """
+        Stop appending moves to the log file, if there is one.
+        """
+
+        if self.log_file is not None:
+            self.log_file.close()
+            self.log_file = None
+
+    def replay(self, stats: PlayerStats = None) -> MinesweeperBoard:
+        """
+        Make every move in the log on a new board of the same settings, generated from the same seed.
+        Moves are made straight on the board without any window or renderer, just as the game controller makes them,
+        and the replay stops where the game ended.
+
+        Parameters
+        ----------
+        stats : PlayerStats, optional
+            Stats for the board to update throughout the replay.
+
+        Returns
+        -------
+        MinesweeperBoard
+            The board as it was after the last move.
+        """
+
+        # the game controller imports this module to log its games, so it can only be imported once both are loaded
+        from GameController import create_minesweeper_board
+
+        minesweeper_board = create_minesweeper_board(
+            self.width, self.height, self.num_mines, self.version, self.difficulty, stats
+        )
+        minesweeper_board.rng.seed(self.seed)
+
+        first_move_made = False
+        for mouse_button, row, col in self.moves:
+            if mouse_button == "left":
+                if not first_move_made:
+                    minesweeper_board.board = minesweeper_board.get_random_board((row, col))
+                    first_move_made = True
+
+                activated_tile = minesweeper_board.make_move(row, col)
+                if activated_tile.type == Tile.MINE or activated_tile.type == Tile.NEGATIVE_MINE:
+                    minesweeper_board.reveal_all_tiles()
+                    break
+            elif mouse_button == "chord":
+                activated_tiles = minesweeper_board.chord(row, col)
+                if any(tile.type == Tile.MINE or tile.type == Tile.NEGATIVE_MINE for tile in activated_tiles):
+                    minesweeper_board.reveal_all_tiles()
+                    break
+            else:
+                minesweeper_board.plant_flag_on_tile(row, col)
+        return minesweeper_board
+
+
+def open_log_file(file_name: str) -> BinaryIO:
+    """
+    Open a log file to append records to, writing its header first if the file is new.
+
+    Parameters
+    ----------
+    file_name : str
+        The log file to open.
+
+    Returns
+    -------
+    BinaryIO
+        The opened log file.
+    """
+
+    log_file = open(file_name, "ab")
+    if log_file.tell() == 0:
+        log_file.write(HEADER.pack(MAGIC, FORMAT_VERSION))
+    return log_file
+
+
+def read_move_logs(file_name: str) -> list[MoveLog]:
+    """
+    Read every game out of a log file, in the order they were played.
+
+    Parameters
+    ----------
+    file_name : str
+        The log file to read.
+
+    Returns
+    -------
+    list[MoveLog]
+        The log of each game in the file.
+    """
+
+    with open(file_name, "rb") as log_file:
+        data = log_file.read()
+
+    magic, format_version = HEADER.unpack_from(data)
+    if magic != MAGIC:
+        raise Exception("Not a minesweeper move log")
+    if format_version != FORMAT_VERSION:
+        raise Exception(f"Unsupported move log format version {format_version}")
+
+    move_logs = []
+    offset = HEADER.size
+    while offset < len(data):
+        if data[offset : offset + 1] == b"G":
+            if offset + GAME.size > len(data):
+                break
+            _, width, height, num_mines, seed, version_name_length, difficulty_length = GAME.unpack_from(data, offset)
+            offset += GAME.size
+            if offset + version_name_length + difficulty_length > len(data):
+                break
+            version = data[offset : offset + version_name_length].decode("utf-8")
+            offset += version_name_length
+            difficulty = data[offset : offset + difficulty_length].decode("utf-8")
+            offset += difficulty_length
+            move_logs.append(MoveLog(version, width, height, num_mines, difficulty, seed))
+        else:
+
+            # the last record is left unfinished if the game was cut off while it was being written
+            if offset + MOVE.size > len(data):
+                break
+            move_code, row, col = MOVE.unpack_from(data, offset)
+            offset += MOVE.size
+            move_logs[-1].moves.append((MOUSE_BUTTONS[move_code], row, col))
+    return move_logs
+
+
+if __name__ == "__main__":
+
+    # replay every game in the given log files as fast as possible, as a benchmark
+    total_moves = 0
+    start_time = time.perf_counter()
+    for log_file_name in sys.argv[1:]:
+        for move_log in read_move_logs(log_file_name):
+            move_log.replay()
+            total_moves += len(move_log.moves)
+    seconds_taken = time.perf_counter() - start_time
+    print(
+        f"Replayed {total_moves} moves in {seconds_taken:.3f}s ({total_moves / max(seconds_taken, 1e-9):.0f} moves/s)"
+    )
@@ -1,14 +1,55 @@
+import os
 import pickle
+from contextlib import contextmanager
+from copy import deepcopy
+
+# file locking is done differently on windows
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+    import msvcrt
+
+# how many increments the journal can build up before they're compacted into the stats file
+COMPACT_AFTER = 1000
+
+# the names of the stats updated while a game is being played, so they aren't spelled out everywhere they're updated
+TILES_REVEALED = "Tiles Revealed"
+MINES_DEFUSED = "Mines Defused"
+FLAG_MISTAKES = "Flag Mistakes"
+POSITIVE_MINES_DEFUSED = "Positive Mines Defused"
+NEGATIVE_MINES_DEFUSED = "Negative Mines Defused"
+MINES_ENCOUNTERED = "Mines Encountered"
 
 
 class PlayerStats:
     """
     Holds the base template for the player stats dictionary, which is read in and out of the 'stats' file
 
+    Instead of rewriting the whole stats file after every game, each save only appends the stats that changed since the
+    last one to a journal file next to it, one increment per line. Loading reads the stats file and then adds the
+    journaled increments on top. Once a process has journaled `COMPACT_AFTER` increments, the journal is compacted into
+    a new stats file, which is written to a temporary file first and then swapped in, so a crash at any point leaves
+    either the old stats or the new ones, never a broken file.
+
+    Any number of processes can share the same stats files. Each save is appended to the journal in a single write under
+    a shared lock, so saves never wait on each other, and loading or compacting takes an exclusive lock and adds up
+    everything every process has journaled, so no process's stats are ever overwritten by another's.
+
     Parameters
     ----------
     player_stats: dict[str, dict[str, float]], default: {}
         The dictionary holding the player's stats for the different gamemodes.
+
+    file_name: str, default: "stats"
+        The file the player's stats are compacted into, with the journal and lock files kept in the same file name plus
+        ".journal" and ".lock".
+
+    unsaved_increments: dict[tuple[str, str], float]
+        The total amount each stat has been incremented by since the last save, by (minesweeper_version, stat).
+
+    num_journaled: int
+        The number of increments this process has journaled since the journal was last compacted.
     """
 
     starting_player_stats = {
@@ -168,36 +209,225 @@ class PlayerStats:
         },
     }
 
-    def __init__(self, player_stats=None):
+    def __init__(self, player_stats=None, file_name="stats"):
         self.player_stats = player_stats if player_stats is not None else {}
+        self.file_name = file_name
+        self.unsaved_increments = {}
+        self.num_journaled = 0
+
+    @property
+    def journal_file_name(self) -> str:
+        """
+        The file the increments made since the stats file was last compacted are appended to.
+        """
+
+        return self.file_name + ".journal"
+
+    @classmethod
+    def merge_stats(cls, *all_player_stats: dict[str, dict[str, float]]) -> dict[str, dict[str, float]]:
+        """
+        Add up any number of players' stats (ex. loaded from different stats files) into new stats.
+        Only the stats in `starting_player_stats` are kept, and any of them missing from the given stats count as 0.
+
+        Parameters
+        ----------
+        *all_player_stats : dict[str, dict[str, float]]
+            The stats to add up.
+
+        Returns
+        -------
+        dict[str, dict[str, float]]
+            The added up stats.
+        """
+
+        merged_stats = deepcopy(cls.starting_player_stats)
+        for player_stats in all_player_stats:
+            for minesweeper_version, version_stats in merged_stats.items():
+                other_version_stats = player_stats.get(minesweeper_version, {})
+                for stat in version_stats:
+                    version_stats[stat] += other_version_stats.get(stat, 0)
+        return merged_stats
 
     def load_player_stats(self):
         """
-        Load the player's stats, or create a new stats file if there isn't one already.
+        Load the player's stats (including everything saved by other processes), or create a new stats file if there
+        isn't one already.
         """
 
-        try:
-            with open("stats", "rb") as stats_file:
-                self.player_stats = pickle.load(stats_file)
-        except FileNotFoundError:
-            self.reset_stats()
-            self.player_stats = self.starting_player_stats
+        with self._lock_stats_files(exclusive=True):
+            if not os.path.exists(self.file_name):
+                self._write_stats_file(self.starting_player_stats, 0)
+            self.player_stats, _, self.num_journaled = self._read_stats_files()
+
+            # a journal left over from a compaction cut short is removed, since its increments are already in the stats
+            # file and nothing should be appended to it
+            if self.num_journaled < 0:
+                os.remove(self.journal_file_name)
+                self.num_journaled = 0
+        self.unsaved_increments = {}
 
     def save_player_stats(self):
         """
-        Save the player's stats to an extension-less "stats" file.
+        Save the stats that changed since the last save by appending them to the journal, compacting the journal into
+        the stats file once it gets long.
+        """
+
+        self.journal_increments(self.take_unsaved_increments())
+
+    def take_unsaved_increments(self) -> dict[tuple[str, str], float]:
+        """
+        Take the increments made since the last save, so they can be saved with `journal_increments` (ex. by a
+        background thread, since taking them is quick but journaling them isn't).
+
+        Returns
+        -------
+        dict[tuple[str, str], float]
+            The total amount each stat has been incremented by since the last save, by (minesweeper_version, stat).
+        """
+
+        increments = self.unsaved_increments
+        self.unsaved_increments = {}
+        return increments
+
+    def journal_increments(self, increments: dict[tuple[str, str], float]):
+        """
+        Append increments taken by `take_unsaved_increments` to the journal, compacting the journal into the stats file
+        once it gets long.
+
+        Parameters
+        ----------
+        increments : dict[tuple[str, str], float]
+            The total amount to increment each stat by, by (minesweeper_version, stat).
+        """
+
+        if increments:
+            lines = [
+                f"{minesweeper_version}\t{stat}\t{increment_value!r}\n"
+                for (minesweeper_version, stat), increment_value in increments.items()
+            ]
+
+            # other processes can append to the journal at the same time, since everything is appended in a single write
+            # to the end of the file, so it can't be interleaved with theirs
+            with self._lock_stats_files(exclusive=False):
+                journal_file = os.open(
+                    self.journal_file_name, os.O_WRONLY | os.O_APPEND | os.O_CREAT | getattr(os, "O_BINARY", 0), 0o666
+                )
+                try:
+
+                    # every journal starts with its generation, which the stats file records once it's been compacted
+                    if os.fstat(journal_file).st_size == 0:
+                        lines.insert(0, f"{self._read_compacted_generation() + 1}\n")
+                    os.write(journal_file, "".join(lines).encode("utf-8"))
+                finally:
+                    os.close(journal_file)
+            self.num_journaled += len(increments)
+
+        if self.num_journaled >= COMPACT_AFTER:
+            self.compact_stats()
+
+    def compact_stats(self):
+        """
+        Add the journal (including the increments other processes journaled) into a new stats file and clear it.
         """
 
-        with open("stats", "wb") as stats_file:
-            pickle.dump(self.player_stats, stats_file, protocol=pickle.HIGHEST_PROTOCOL)
+        with self._lock_stats_files(exclusive=True):
+            player_stats, compacted_generation, _ = self._read_stats_files()
+            self._write_stats_file(player_stats, compacted_generation + 1)
+        self.num_journaled = 0
 
     def reset_stats(self):
         """
         Reset the stats file to the starting player stats (0s across the board).
         """
 
-        with open("stats", "wb") as stats_file:
-            pickle.dump(self.starting_player_stats, stats_file, protocol=pickle.HIGHEST_PROTOCOL)
+        with self._lock_stats_files(exclusive=True):
+            self._write_stats_file(self.starting_player_stats, self._read_compacted_generation() + 1)
+        self.unsaved_increments = {}
+        self.num_journaled = 0
+
+    @contextmanager
+    def _lock_stats_files(self, exclusive: bool):
+        # appending to the journal only needs a shared lock, so processes never wait on each other to save, but anything
+        # rewriting the stats file needs every other process to wait (windows only has exclusive locks)
+        with open(self.file_name + ".lock", "a+b") as lock_file:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+            else:
+                lock_file.seek(0)
+                msvcrt.locking(lock_file.fileno(), msvcrt.LK_LOCK, 1)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+                else:
+                    lock_file.seek(0)
+                    msvcrt.locking(lock_file.fileno(), msvcrt.LK_UNLCK, 1)
+
+    def _read_compacted_generation(self) -> int:
+        # stats files written before the journal existed don't say which journal they've compacted
+        try:
+            with open(self.file_name, "rb") as stats_file:
+                pickle.load(stats_file)
+                return pickle.load(stats_file)
+        except (FileNotFoundError, EOFError):
+            return 0
+
+    def _read_stats_files(self) -> tuple[dict[str, dict[str, float]], int, int]:
+        # read the stats file and add every journaled increment on top, returning the stats, the generation of the last
+        # compacted journal and the number of journaled increments (or -1 if the journal was already compacted)
+        try:
+            with open(self.file_name, "rb") as stats_file:
+                player_stats = self.merge_stats(pickle.load(stats_file))
+                try:
+                    compacted_generation = pickle.load(stats_file)
+                except EOFError:
+                    compacted_generation = 0
+        except FileNotFoundError:
+            player_stats = deepcopy(self.starting_player_stats)
+            compacted_generation = 0
+
+        try:
+            with open(self.journal_file_name, "r", encoding="utf-8") as journal_file:
+                lines = journal_file.readlines()
+        except FileNotFoundError:
+            return player_stats, compacted_generation, 0
+
+        # a journal that was already compacted (if the game crashed before it could be removed) is ignored, since its
+        # increments are already in the stats file
+        if not lines or not lines[0].strip().isdigit() or int(lines[0]) <= compacted_generation:
+            return player_stats, compacted_generation, -1
+
+        num_journaled = 0
+        for line in lines[1:]:
+            fields = line[:-1].split("\t")
+
+            # lines left unfinished by a crash, and the extra generation written when two processes start the journal at
+            # the same time, are skipped
+            if not line.endswith("\n") or len(fields) != 3:
+                continue
+            minesweeper_version, stat, increment_value = fields
+            try:
+                increment_value = float(increment_value)
+            except ValueError:
+                continue
+            if minesweeper_version in player_stats and stat in player_stats[minesweeper_version]:
+                player_stats[minesweeper_version][stat] += increment_value
+            num_journaled += 1
+        return player_stats, compacted_generation, num_journaled
+
+    def _write_stats_file(self, player_stats: dict[str, dict[str, float]], compacted_generation: int):
+        # the new stats are only swapped in for the old ones once they're completely written, and they record which
+        # journal they include, so a crash before that journal is removed can't count its increments twice
+        temporary_file_name = self.file_name + ".tmp"
+        with open(temporary_file_name, "wb") as stats_file:
+            pickle.dump(player_stats, stats_file, protocol=pickle.HIGHEST_PROTOCOL)
+            pickle.dump(compacted_generation, stats_file, protocol=pickle.HIGHEST_PROTOCOL)
+            stats_file.flush()
+            os.fsync(stats_file.fileno())
+        os.replace(temporary_file_name, self.file_name)
+        if os.path.exists(self.journal_file_name):
+            os.remove(self.journal_file_name)
 
     def increment_stat(
         self,
@@ -226,8 +456,13 @@ class PlayerStats:
             Whether the update was successful or not.
         """
 
-        if minesweeper_version in self.player_stats and stat_to_increment in self.player_stats[minesweeper_version]:
-            self.player_stats[minesweeper_version][stat_to_increment] += increment_value
+        version_stats = self.player_stats.get(minesweeper_version)
+        if version_stats is not None and stat_to_increment in version_stats:
+            version_stats[stat_to_increment] += increment_value
+
+            # increments to the same stat are added up until the next save, so each stat is only journaled once per save
+            key = (minesweeper_version, stat_to_increment)
+            self.unsaved_increments[key] = self.unsaved_increments.get(key, 0) + increment_value
             return True
         return False
 
@@ -0,0 +1,68 @@
+from typing import Callable, Iterable
+from Minesweeper.MinesweeperBoard import MinesweeperBoard
+
+
+class Renderer:
+    """
+    The base class for every way of showing a minesweeper board to the player and taking their clicks.
+
+    This base class shows nothing and takes no clicks, which is what headless games (bots, simulations, etc.) use, so
+    they never have to import or start Tk. Subclasses such as `GUI.BoardRenderer` override whichever methods they need.
+
+    Attributes
+    ----------
+    minesweeper_board : MinesweeperBoard
+        The minesweeper board to draw.
+
+    click_handler : Callable[[int, int, str], None], optional
+        Called with the row and column of the clicked tile and the mouse button ("left" or "right") whenever the player
+        clicks a tile.
+    """
+
+    def __init__(self, minesweeper_board: MinesweeperBoard, click_handler: Callable[[int, int, str], None] = None):
+        self.minesweeper_board = minesweeper_board
+        self.click_handler = click_handler
+
+    def draw(self):
+        """
+        Draw the whole board and start taking the player's clicks.
+        """
+
+    def update(self, changed_tiles: Iterable[tuple[int, int]] = None):
+        """
+        Redraw all tiles that changed last move.
+
+        Parameters
+        ----------
+        changed_tiles : Iterable[tuple[int, int]], optional
+            The (row, col) coordinates of the tiles to redraw, defaults to the board's `changed_tiles`.
+        """
+
+    def undraw(self):
+        """
+        Clear the board away and stop taking the player's clicks.
+        """
+
+    def show_message(self, message: str):
+        """
+        Show the player a message about the game (ex. that it's been won).
+        Headless games have no one to show it to, so the base renderer ignores it.
+
+        Parameters
+        ----------
+        message : str
+            The message to show.
+        """
+
+    def schedule(self, callback: Callable[[], None]):
+        """
+        Call the given function once the renderer has finished handling whatever input is waiting.
+        With nothing to wait for, the base renderer calls it right away.
+
+        Parameters
+        ----------
+        callback : Callable[[], None]
+            The function to call.
+        """
+
+        callback()
@@ -0,0 +1,105 @@
+import threading
+from PlayerStats import PlayerStats
+
+
+class StatsWriter:
+    """
+    Saves a player's stats on a background thread, so the game never has to wait on the disk to start the next game.
+
+    `save` only takes the stats changed since the last save, which is quick, and leaves them for the background thread.
+    That thread writes out everything left for it every `flush_interval` seconds, so a burst of saves (ex. quick games
+    played back to back) is written out together in one go. `flush` and `close` write everything out straight away,
+    for when the game is closing.
+
+    A write that fails on the background thread is tried again on the next one. Its error is kept in `last_error` for
+    the writer's owner to report, instead of the thread printing it over whatever the game is drawing.
+
+    Attributes
+    ----------
+    stats : PlayerStats
+        The stats to save.
+
+    flush_interval : float, default: 1.0
+        How many seconds the background thread waits between writing out the saved stats.
+
+    pending_increments : dict[tuple[str, str], float]
+        The increments saved but not yet written out, by (minesweeper_version, stat).
+
+    pending_lock : threading.Lock
+        Held while `pending_increments` is being changed.
+
+    write_lock : threading.Lock
+        Held while stats are being written out, so the background thread and `flush` never write at the same time.
+
+    last_error : OSError | None
+        The error the last write out on the background thread failed with, or None if it succeeded.
+
+    closed : threading.Event
+        Set once the writer is closed, which stops the background thread.
+
+    thread : threading.Thread
+        The background thread writing out the saved stats.
+    """
+
+    def __init__(self, stats: PlayerStats, flush_interval: float = 1.0):
+        self.stats = stats
+        self.flush_interval = flush_interval
+        self.pending_increments = {}
+        self.pending_lock = threading.Lock()
+        self.write_lock = threading.Lock()
+        self.last_error = None
+        self.closed = threading.Event()
+        self.thread = threading.Thread(target=self._write_periodically, name="StatsWriter", daemon=True)
+        self.thread.start()
+
+    def save(self):
+        """
+        Save the stats changed since the last save, leaving them for the background thread to write out.
+        This has to be called from the thread the stats are incremented on.
+        """
+
+        increments = self.stats.take_unsaved_increments()
+        if not increments:
+            return
+        with self.pending_lock:
+            for key, increment_value in increments.items():
+                self.pending_increments[key] = self.pending_increments.get(key, 0) + increment_value
+
+    def flush(self):
+        """
+        Write out every saved stat straight away, waiting until it's done.
+        """
+
+        with self.write_lock:
+            with self.pending_lock:
+                increments = self.pending_increments
+                self.pending_increments = {}
+
+            try:
+                self.stats.journal_increments(increments)
+            except OSError:
+
+                # the increments are put back to be tried again, instead of being lost
+                with self.pending_lock:
+                    for key, increment_value in increments.items():
+                        self.pending_increments[key] = self.pending_increments.get(key, 0) + increment_value
+                raise
+
+    def close(self):
+        """
+        Save the stats changed since the last save, write everything out and stop the background thread.
+        This has to be called from the thread the stats are incremented on.
+        """
+
+        self.save()
+        self.closed.set()
+        self.thread.join()
+        self.flush()
+
+    def _write_periodically(self):
+        while not self.closed.wait(self.flush_interval):
+            try:
+                self.flush()
+                self.last_error = None
+            except OSError as error:
+                self.last_error = error
@@ -0,0 +1,213 @@
+import sys
+from typing import Callable, Iterable, TextIO
+from Minesweeper.MinesweeperBoard import MinesweeperBoard
+from Minesweeper.MinesweeperTile import FLOAT_VALUE_VERSIONS, Tile, MinesweeperTile
+from Renderer import Renderer
+
+# ANSI escape sequences
+CLEAR_SCREEN = "\x1b[2J\x1b[H"
+CLEAR_BELOW = "\x1b[J"
+CLEAR_LINE = "\x1b[K"
+RESET = "\x1b[0m"
+
+# the text colour of each kind of tile
+HIDDEN_COLOR = "\x1b[90m"
+FLAG_COLOR = "\x1b[1;31m"
+NEGATIVE_FLAG_COLOR = "\x1b[1;34m"
+MINE_COLOR = "\x1b[1;31m"
+NEGATIVE_MINE_COLOR = "\x1b[1;34m"
+POSITIVE_VALUE_COLOR = "\x1b[33m"
+NEGATIVE_VALUE_COLOR = "\x1b[36m"
+
+
+class TerminalRenderer(Renderer):
+    """
+    Draws a minesweeper board onto an ANSI terminal (locally or over SSH) and takes moves typed in by the player.
+
+    The whole board is only written out once, by `draw`. After that, `update` moves the cursor straight to each tile
+    that changed and rewrites just that tile, so a move on a huge board only sends the handful of bytes it changed.
+    Everything written at once is sent in a single write. Messages about the game are shown on a status line below the
+    board, and moves are typed in on the line below that.
+
+    Moves are typed in as "row col" to reveal a tile (or chord it, if it's a revealed number), or "f row col" to plant a
+    flag on it.
+
+    Attributes
+    ----------
+    minesweeper_board : MinesweeperBoard
+        The minesweeper board to draw.
+
+    click_handler : Callable[[int, int, str], None], optional
+        Called with the row and column of the chosen tile and the mouse button the move stands for ("left" to reveal,
+        "right" to plant a flag) whenever the player types in a move.
+
+    stream : TextIO, default: sys.stdout
+        The terminal to draw onto.
+
+    cell_width : int
+        The number of characters each tile takes up, including the space separating it from the next tile.
+    """
+
+    def __init__(
+        self,
+        minesweeper_board: MinesweeperBoard,
+        click_handler: Callable[[int, int, str], None] = None,
+        stream: TextIO = None,
+    ):
+        super().__init__(minesweeper_board, click_handler)
+        self.stream = stream if stream is not None else sys.stdout
+
+        # float values need wider cells to fit
+        self.cell_width = 6 if minesweeper_board.minesweeper_version in FLOAT_VALUE_VERSIONS else 3
+
+    def get_cell(self, tile: MinesweeperTile) -> tuple[str, str]:
+        """
+        Get the colour and text to draw for a tile, with the text padded to exactly `cell_width` characters.
+
+        Parameters
+        ----------
+        tile : MinesweeperTile
+            The tile being drawn.
+
+        Returns
+        -------
+        tuple[str, str]
+            The colour code for the tile's text (or RESET for the default colour) and the text itself.
+        """
+
+        # if the tile is not revealed, show its flag (if it has one)
+        if not tile.revealed:
+            if tile.flag_planted == 1:
+                color, text = FLAG_COLOR, "F"
+            elif tile.flag_planted == 2:
+                color, text = NEGATIVE_FLAG_COLOR, "f"
+            else:
+                color, text = HIDDEN_COLOR, "#"
+        elif tile.type == Tile.MINE:
+            color, text = MINE_COLOR, "B"
+        elif tile.type == Tile.NEGATIVE_MINE:
+            color, text = NEGATIVE_MINE_COLOR, "b"
+        elif tile.type == Tile.EMPTY or tile.value == 0:
+            color, text = RESET, "."
+        else:
+            color = POSITIVE_VALUE_COLOR if tile.value > 0 else NEGATIVE_VALUE_COLOR
+            text = str(tile.value) if isinstance(tile.value, int) else f"{tile.value:.1f}"
+
+        # values too long for the cell are cut short rather than pushing the rest of the row out of line
+        return color, text[: self.cell_width - 1].rjust(self.cell_width - 1) + " "
+
+    def _write_cell(self, output: list[str], tile: MinesweeperTile, color: str) -> str:
+        # the colour only needs to be sent when it's different from the last tile's, which it usually isn't
+        tile_color, text = self.get_cell(tile)
+        if tile_color != color:
+            output.append(tile_color)
+        output.append(text)
+        return tile_color
+
+    def draw(self):
+        """
+        Clear the terminal and draw the whole board onto it.
+        """
+
+        output = [CLEAR_SCREEN]
+        color = RESET
+        for row in self.minesweeper_board.board:
+            for tile in row:
+                color = self._write_cell(output, tile, color)
+            output.append("\n")
+
+        # the status line is left empty until there's a message to show on it
+        output.append(RESET + "\n" + CLEAR_BELOW)
+        self.stream.write("".join(output))
+        self.stream.flush()
+
+    def update(self, changed_tiles: Iterable[tuple[int, int]] = None):
+        """
+        Redraw all tiles that changed last move, moving the cursor to each one instead of redrawing the whole board.
+        The cursor is left on the line below the status line afterwards, with everything below it cleared.
+
+        Parameters
+        ----------
+        changed_tiles : Iterable[tuple[int, int]], optional
+            The (row, col) coordinates of the tiles to redraw, defaults to the board's `changed_tiles`.
+        """
+
+        if changed_tiles is None:
+            changed_tiles = self.minesweeper_board.changed_tiles
+
+        board = self.minesweeper_board.board
+        output = []
+        cursor = None
+        color = RESET
+        for row, col in sorted(changed_tiles):
+
+            # tiles right after the last one drawn don't need the cursor moved (ex. a revealed row of empty tiles)
+            if cursor != (row, col):
+                output.append(f"\x1b[{row + 1};{col * self.cell_width + 1}H")
+            color = self._write_cell(output, board[row][col], color)
+            cursor = (row, col + 1)
+
+        output.append(f"{RESET}\x1b[{self.minesweeper_board.board_height + 2};1H" + CLEAR_BELOW)
+        self.stream.write("".join(output))
+        self.stream.flush()
+
+    def show_message(self, message: str):
+        """
+        Show the player a message about the game on the status line below the board, in place of the last one.
+
+        Parameters
+        ----------
+        message : str
+            The message to show.
+        """
+
+        board_height = self.minesweeper_board.board_height
+        self.stream.write(f"\x1b[{board_height + 1};1H{message}{CLEAR_LINE}\x1b[{board_height + 2};1H")
+        self.stream.flush()
+
+    def undraw(self):
+        """
+        Clear the board off the terminal.
+        """
+
+        self.stream.write(CLEAR_SCREEN)
+        self.stream.flush()
+
+    def handle_input(self, line: str) -> bool:
+        """
+        Make the move the player typed in, if it's valid.
+
+        Parameters
+        ----------
+        line : str
+            The typed in move, either "row col" to reveal a tile or "f row col" to plant a flag on it.
+
+        Returns
+        -------
+        bool
+            Whether the line was a valid move or not.
+        """
+
+        words = line.split()
+        mouse_button = "left"
+        if words and words[0].lower() == "f":
+            mouse_button = "right"
+            words = words[1:]
+
+        if len(words) != 2 or not all(word.isdigit() for word in words):
+            return False
+        if self.click_handler is not None:
+            self.click_handler(int(words[0]), int(words[1]), mouse_button)
+        return True
+
+
+if __name__ == "__main__":
+    from GameController import GameController
+    from PlayerStats import PlayerStats
+
+    player_stats = PlayerStats()
+    player_stats.load_player_stats()
+    controller = GameController(stats=player_stats, create_renderer=TerminalRenderer)
+    controller.new_game()
+    for typed_line in sys.stdin:
+        controller.renderer.handle_input(typed_line)
@@ -0,0 +1,632 @@
+"""
+A compact binary wire format for playing on the game server, which sends each player only the tiles their last move
+changed instead of the whole board.
+
+Every number is a varint (7 bits per byte, least significant first, the top bit set on every byte but the last), so
+small numbers take a single byte. A connection opens with `HELLO` (a zero byte, which a JSON request can never start
+with, then the format version) and after that every message either way is framed as its length followed by its
+payload. The first byte of each payload says what the message is.
+
+Requests (player to server):
+- b"n" starts a game: width, height, number of mines, then the version name and difficulty (each as its length
+  followed by the utf-8 string)
+- b"m" makes a move: session id, the tile's index (row * width + col) and the mouse button, b"L" or b"R"
+- b"s" asks for a snapshot of a game's whole board, for a player reconnecting to it
+- b"c" ends a game: session id
+
+Responses (server to player), one per request in the order they were sent:
+- b"N" a game started: session id, width, height and value scale
+- b"D" a move's changes: game state, the number of changed tiles, then each changed tile in order of index as the gap
+  from the previous changed tile's index (the first from -1) followed by the tile's state
+- b"S" a snapshot: game state, width, height and value scale, then the state of every tile in order of index
+- b"C" a game ended: session id
+- b"E" an error: the utf-8 error message
+
+The game state is a single number, with `GAME_OVER` set once the game's over and `GAME_WON` set if it was won. A tile's
+state is one of `HIDDEN`, `FLAG`, `NEGATIVE_FLAG`, `MINE` and `NEGATIVE_MINE`, or for any other revealed tile
+`VALUE_OFFSET` plus its zigzag-encoded value (0, -1, 1, -2, ... become 0, 1, 2, 3, ...). Distance and Weighted
+Minesweeper's float values are sent multiplied by the game's value scale and rounded, so they're only as precise as
+they're shown (to one decimal place), and every other version's values are whole numbers with a value scale of 1.
+"""
+
+import asyncio
+from Minesweeper.MinesweeperBoard import MinesweeperBoard
+from Minesweeper.MinesweeperTile import Tile, MinesweeperTile
+from MoveLog import MOVE_CODES, MOUSE_BUTTONS
+
+FORMAT_VERSION = 1
+HELLO = bytes((0, FORMAT_VERSION))
+
+# the tile states, with revealed values counting up from `VALUE_OFFSET`
+HIDDEN = 0
+FLAG = 1
+NEGATIVE_FLAG = 2
+MINE = 3
+NEGATIVE_MINE = 4
+VALUE_OFFSET = 5
+
+# the bits of a game state
+GAME_OVER = 1
+GAME_WON = 2
+
+# how much the values of the versions with float values are multiplied by to send them as whole numbers
+VALUE_SCALES = {"Distance Minesweeper": 10, "Weighted Minesweeper": 10}
+
+
+def get_value_scale(version: str) -> int:
+    """
+    Get how much a version's tile values are multiplied by to send them.
+
+    Parameters
+    ----------
+    version : {"Minesweeper", "Minesweeper V", "Distance Minesweeper", "Weighted Minesweeper", "Negative Minesweeper"}
+        The version of Minesweeper.
+
+    Returns
+    -------
+    int
+        The value scale.
+    """
+
+    return VALUE_SCALES.get(version, 1)
+
+
+def write_varint(output: bytearray, value: int):
+    """
+    Append a non-negative number to a message as a varint.
+
+    Parameters
+    ----------
+    output : bytearray
+        The message being written.
+
+    value : int
+        The number to write.
+    """
+
+    while value > 0x7F:
+        output.append(value & 0x7F | 0x80)
+        value >>= 7
+    output.append(value)
+
+
+def read_varint(data: bytes, offset: int) -> tuple[int, int]:
+    """
+    Read a varint out of a message.
+
+    Parameters
+    ----------
+    data : bytes
+        The message.
+
+    offset : int
+        Where in the message the varint starts.
+
+    Returns
+    -------
+    tuple[int, int]
+        The number read, and the offset just after it.
+    """
+
+    value = 0
+    shift = 0
+    while True:
+        byte = data[offset]
+        offset += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, offset
+        shift += 7
+
+
+def write_string(output: bytearray, string: str):
+    """
+    Append a string to a message, as its length followed by its utf-8 bytes.
+
+    Parameters
+    ----------
+    output : bytearray
+        The message being written.
+
+    string : str
+        The string to write.
+    """
+
+    encoded_string = string.encode("utf-8")
+    write_varint(output, len(encoded_string))
+    output += encoded_string
+
+
+def read_string(data: bytes, offset: int) -> tuple[str, int]:
+    """
+    Read a string out of a message.
+
+    Parameters
+    ----------
+    data : bytes
+        The message.
+
+    offset : int
+        Where in the message the string starts.
+
+    Returns
+    -------
+    tuple[str, int]
+        The string read, and the offset just after it.
+    """
+
+    length, offset = read_varint(data, offset)
+    if offset + length > len(data):
+        raise ValueError("String runs past the end of the message")
+    return data[offset : offset + length].decode("utf-8"), offset + length
+
+
+def frame(payload: bytes) -> bytes:
+    """
+    Frame a message's payload to be sent, by putting its length in front of it.
+
+    Parameters
+    ----------
+    payload : bytes
+        The message's payload.
+
+    Returns
+    -------
+    bytes
+        The framed message.
+    """
+
+    length = bytearray()
+    write_varint(length, len(payload))
+    return bytes(length) + payload
+
+
+async def read_frame(reader: asyncio.StreamReader, max_size: int = None) -> bytes | None:
+    """
+    Read the next framed message's payload off a connection.
+
+    Parameters
+    ----------
+    reader : asyncio.StreamReader
+        Reads the connection.
+
+    max_size : int, optional
+        The largest payload allowed, with no limit by default.
+
+    Returns
+    -------
+    bytes | None
+        The payload, or None if the connection was closed between messages.
+    """
+
+    length = 0
+    shift = 0
+    while True:
+        byte = await reader.read(1)
+        if not byte:
+            if shift == 0:
+                return None
+            raise asyncio.IncompleteReadError(b"", None)
+        length |= (byte[0] & 0x7F) << shift
+        if byte[0] < 0x80:
+            break
+        shift += 7
+
+    if max_size is not None and length > max_size:
+        raise ValueError(f"Message of {length} bytes is too large")
+    return await reader.readexactly(length)
+
+
+def encode_tile_state(tile: MinesweeperTile, value_scale: int = 1) -> int:
+    """
+    Get the state a tile is sent as.
+
+    Parameters
+    ----------
+    tile : MinesweeperTile
+        The tile to send.
+
+    value_scale : int, default: 1
+        How much the tile's value is multiplied by, if it's revealed.
+
+    Returns
+    -------
+    int
+        The tile's state.
+    """
+
+    if not tile.revealed:
+        return int(tile.flag_planted)
+    if tile.type == Tile.MINE:
+        return MINE
+    if tile.type == Tile.NEGATIVE_MINE:
+        return NEGATIVE_MINE
+
+    value = round(tile.value * value_scale)
+    return VALUE_OFFSET + (value << 1 if value >= 0 else (-value << 1) - 1)
+
+
+def decode_tile_state(state: int, value_scale: int = 1) -> str | int | float:
+    """
+    Get what a player should be shown for a tile's state, just as `GameServer.get_tile_state` shows it.
+
+    Parameters
+    ----------
+    state : int
+        The tile's state.
+
+    value_scale : int, default: 1
+        How much the tile's value was multiplied by.
+
+    Returns
+    -------
+    str | int | float
+        "#" if the tile is hidden, "F" or "f" if it has a flag or negative flag, "B" or "b" if it's a revealed mine or
+        negative mine, or its value if it's any other revealed tile.
+    """
+
+    if state < VALUE_OFFSET:
+        return "#FfBb"[state]
+
+    state -= VALUE_OFFSET
+    value = -((state + 1) >> 1) if state & 1 else state >> 1
+    return value if value_scale == 1 else value / value_scale
+
+
+def encode_game_state(game_over: bool, won: bool) -> int:
+    """
+    Get the game state a game is sent as.
+
+    Parameters
+    ----------
+    game_over : bool
+        Whether the game is over.
+
+    won : bool
+        Whether the game was won.
+
+    Returns
+    -------
+    int
+        The game state.
+    """
+
+    return (GAME_OVER if game_over else 0) | (GAME_WON if won else 0)
+
+
+def encode_delta(
+    minesweeper_board: MinesweeperBoard,
+    changed_tiles: list[tuple[int, int]],
+    game_over: bool,
+    won: bool,
+    value_scale: int = 1,
+) -> bytes:
+    """
+    Write a move's changes as a b"D" message payload.
+
+    Parameters
+    ----------
+    minesweeper_board : MinesweeperBoard
+        The board the move was made on.
+
+    changed_tiles : list[tuple[int, int]]
+        The (row, col) coordinates of every tile the move changed.
+
+    game_over : bool
+        Whether the game is over.
+
+    won : bool
+        Whether the game was won.
+
+    value_scale : int, default: 1
+        How much tile values are multiplied by.
+
+    Returns
+    -------
+    bytes
+        The message payload.
+    """
+
+    board = minesweeper_board.board
+    width = minesweeper_board.board_width
+    payload = bytearray(b"D")
+    write_varint(payload, encode_game_state(game_over, won))
+    write_varint(payload, len(changed_tiles))
+
+    # sorting the changes means every index is sent as the (usually tiny) gap from the one before it
+    previous_index = -1
+    for index in sorted(row * width + col for row, col in changed_tiles):
+        write_varint(payload, index - previous_index - 1)
+        write_varint(payload, encode_tile_state(board[index // width][index % width], value_scale))
+        previous_index = index
+    return bytes(payload)
+
+
+def decode_delta(
+    payload: bytes, width: int, value_scale: int = 1
+) -> tuple[list[tuple[int, int, str | int | float]], int]:
+    """
+    Read a move's changes out of a b"D" message payload.
+
+    Parameters
+    ----------
+    payload : bytes
+        The message payload.
+
+    width : int
+        The number of tiles wide the board is.
+
+    value_scale : int, default: 1
+        How much tile values were multiplied by.
+
+    Returns
+    -------
+    tuple[list[tuple[int, int, str | int | float]], int]
+        Every changed tile as (row, col, what the player should be shown for it) in order of index, and the game state.
+    """
+
+    game_state, offset = read_varint(payload, 1)
+    num_changed, offset = read_varint(payload, offset)
+    changed_tiles = []
+    index = -1
+    for _ in range(num_changed):
+        gap, offset = read_varint(payload, offset)
+        state, offset = read_varint(payload, offset)
+        index += gap + 1
+        changed_tiles.append((index // width, index % width, decode_tile_state(state, value_scale)))
+    return changed_tiles, game_state
+
+
+def encode_snapshot(minesweeper_board: MinesweeperBoard, game_over: bool, won: bool, value_scale: int = 1) -> bytes:
+    """
+    Write a whole board as a b"S" message payload.
+
+    Parameters
+    ----------
+    minesweeper_board : MinesweeperBoard
+        The board to send.
+
+    game_over : bool
+        Whether the game is over.
+
+    won : bool
+        Whether the game was won.
+
+    value_scale : int, default: 1
+        How much tile values are multiplied by.
+
+    Returns
+    -------
+    bytes
+        The message payload.
+    """
+
+    payload = bytearray(b"S")
+    for number in (
+        encode_game_state(game_over, won),
+        minesweeper_board.board_width,
+        minesweeper_board.board_height,
+        value_scale,
+    ):
+        write_varint(payload, number)
+    for tile_row in minesweeper_board.board:
+        for tile in tile_row:
+            write_varint(payload, encode_tile_state(tile, value_scale))
+    return bytes(payload)
+
+
+def decode_snapshot(payload: bytes) -> tuple[list[list[str | int | float]], int, int]:
+    """
+    Read a whole board out of a b"S" message payload.
+
+    Parameters
+    ----------
+    payload : bytes
+        The message payload.
+
+    Returns
+    -------
+    tuple[list[list[str | int | float]], int, int]
+        What the player should be shown for every tile by row then column, the game state and the value scale.
+    """
+
+    game_state, offset = read_varint(payload, 1)
+    width, offset = read_varint(payload, offset)
+    height, offset = read_varint(payload, offset)
+    value_scale, offset = read_varint(payload, offset)
+    tiles = []
+    for _ in range(height):
+        tile_row = []
+        for _ in range(width):
+            state, offset = read_varint(payload, offset)
+            tile_row.append(decode_tile_state(state, value_scale))
+        tiles.append(tile_row)
+    return tiles, game_state, value_scale
+
+
+def encode_new_request(width: int, height: int, num_mines: int, version: str, difficulty: str) -> bytes:
+    """
+    Write a b"n" request payload, to start a game.
+
+    Parameters
+    ----------
+    width : int
+        The number of tiles wide the board is.
+
+    height : int
+        The number of tiles high the board is.
+
+    num_mines : int
+        The number of mines hidden in the board.
+
+    version : {"Minesweeper", "Minesweeper V", "Distance Minesweeper", "Weighted Minesweeper", "Negative Minesweeper"}
+        Which version of Minesweeper to play.
+
+    difficulty : {"easy", "medium", "hard"}
+        How difficult the game is (ONLY affects certain gamemodes, such as Distance Minesweeper).
+
+    Returns
+    -------
+    bytes
+        The request payload.
+    """
+
+    payload = bytearray(b"n")
+    for number in (width, height, num_mines):
+        write_varint(payload, number)
+    write_string(payload, version)
+    write_string(payload, difficulty)
+    return bytes(payload)
+
+
+def encode_move_request(session_id: int, index: int, mouse_button: str) -> bytes:
+    """
+    Write a b"m" request payload, to make a move.
+
+    Parameters
+    ----------
+    session_id : int
+        The session to move in.
+
+    index : int
+        The index of the tile to move on (row * width + col).
+
+    mouse_button : {"left", "right"}
+        "left" to reveal the tile, or "right" to plant a flag on it.
+
+    Returns
+    -------
+    bytes
+        The request payload.
+    """
+
+    payload = bytearray(b"m")
+    write_varint(payload, session_id)
+    write_varint(payload, index)
+    return bytes(payload) + MOVE_CODES[mouse_button]
+
+
+def encode_session_request(op: bytes, session_id: int) -> bytes:
+    """
+    Write a request payload that only names a session, either b"s" (snapshot) or b"c" (close).
+
+    Parameters
+    ----------
+    op : {b"s", b"c"}
+        The request's first byte.
+
+    session_id : int
+        The session the request is for.
+
+    Returns
+    -------
+    bytes
+        The request payload.
+    """
+
+    payload = bytearray(op)
+    write_varint(payload, session_id)
+    return bytes(payload)
+
+
+def decode_request(payload: bytes) -> tuple:
+    """
+    Read a request out of its payload.
+
+    Parameters
+    ----------
+    payload : bytes
+        The request payload.
+
+    Returns
+    -------
+    tuple
+        The request's first byte followed by its fields: (b"n", width, height, num_mines, version, difficulty),
+        (b"m", session_id, index, mouse_button), (b"s", session_id) or (b"c", session_id).
+    """
+
+    op = payload[:1]
+    match op:
+        case b"n":
+            width, offset = read_varint(payload, 1)
+            height, offset = read_varint(payload, offset)
+            num_mines, offset = read_varint(payload, offset)
+            version, offset = read_string(payload, offset)
+            difficulty, offset = read_string(payload, offset)
+            return op, width, height, num_mines, version, difficulty
+        case b"m":
+            session_id, offset = read_varint(payload, 1)
+            index, offset = read_varint(payload, offset)
+            if payload[offset : offset + 1] not in MOUSE_BUTTONS:
+                raise ValueError("Invalid mouse button")
+            return op, session_id, index, MOUSE_BUTTONS[payload[offset : offset + 1]]
+        case b"s" | b"c":
+            session_id, _ = read_varint(payload, 1)
+            return op, session_id
+        case _:
+            raise ValueError(f"Unknown request {op!r}")
+
+
+def encode_numbers(op: bytes, *numbers: int) -> bytes:
+    """
+    Write a message payload made of its first byte followed by some numbers, such as b"N" or b"C".
+
+    Parameters
+    ----------
+    op : bytes
+        The message's first byte.
+
+    *numbers : int
+        The numbers in the message.
+
+    Returns
+    -------
+    bytes
+        The message payload.
+    """
+
+    payload = bytearray(op)
+    for number in numbers:
+        write_varint(payload, number)
+    return bytes(payload)
+
+
+def decode_numbers(payload: bytes) -> list[int]:
+    """
+    Read the numbers out of a message payload made of its first byte followed by numbers, such as b"N" or b"C".
+
+    Parameters
+    ----------
+    payload : bytes
+        The message payload.
+
+    Returns
+    -------
+    list[int]
+        The numbers in the message.
+    """
+
+    numbers = []
+    offset = 1
+    while offset < len(payload):
+        number, offset = read_varint(payload, offset)
+        numbers.append(number)
+    return numbers
+
+
+def encode_error(message: str) -> bytes:
+    """
+    Write a b"E" message payload.
+
+    Parameters
+    ----------
+    message : str
+        The error message.
+
+    Returns
+    -------
+    bytes
+        The message payload.
+    """
+
+    return b"E" + message.encode("utf-8")
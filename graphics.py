@@ -6,7 +6,18 @@
 height and resizes the underlying PhotoImage.
 
 * I also separated the left and right mouse click functions so that
-it the program can differentiate between the two.
+it the program can differentiate between the two. The mouse handler set
+with setMouseHandler is called with both the clicked point and which
+button was clicked ("left" or "right").
+
+* The hidden Tk root is created the first time a window, image or
+update needs it rather than when this module is imported, so importing
+it doesn't need a display.
+
+* Resized PhotoImages are cached by (file, width, height), so every
+Image of the same asset and size shares one decoded PhotoImage instead
+of reading and subsampling the file again (so setPixel on one of them
+changes all of them).
 
 --------------------------------------------------------------------
 
@@ -193,8 +204,24 @@ BAD_OPTION = "Illegal option value"
 ##########################################################################
 # global variables and funtions
 
-_root = tk.Tk()
-_root.withdraw()
+_root = None
+
+
+def _get_root():
+    """Return the hidden Tk root every window shares, creating it (and
+    connecting to the display) the first time it's needed"""
+    global _root
+    if _root is None:
+        _root = tk.Tk()
+        _root.withdraw()
+
+        # MacOS fix 2
+        # tk.Toplevel(_root).destroy()
+
+        # MacOS fix 1
+        _root.update()
+    return _root
+
 
 _update_lasttime = time.time()
 
@@ -210,7 +237,7 @@ def update(rate=None):
         else:
             _update_lasttime = now
 
-    _root.update()
+    _get_root().update()
 
 
 ############################################################################
@@ -222,7 +249,7 @@ class GraphWin(tk.Canvas):
 
     def __init__(self, title="Graphics Window", width=200, height=200, autoflush=True):
         assert type(title) == type(""), "Title must be a string"
-        master = tk.Toplevel(_root)
+        master = tk.Toplevel(_get_root())
         master.protocol("WM_DELETE_WINDOW", self.close)
         tk.Canvas.__init__(self, master, width=width, height=height, highlightthickness=0, bd=0)
         self.master.title(title)
@@ -245,7 +272,7 @@ class GraphWin(tk.Canvas):
         master.lift()
         self.lastKey = ""
         if autoflush:
-            _root.update()
+            _get_root().update()
 
     def __repr__(self):
         if self.isClosed():
@@ -292,7 +319,7 @@ class GraphWin(tk.Canvas):
 
     def __autoflush(self):
         if self.autoflush:
-            _root.update()
+            _get_root().update()
 
     def plot(self, x, y, color="black"):
         """Set pixel (x,y) to the given color"""
@@ -400,14 +427,14 @@ class GraphWin(tk.Canvas):
         self.mouseY = e.y
         self.mouseButton = "left"
         if self._mouseCallback:
-            self._mouseCallback(Point(e.x, e.y))
+            self._mouseCallback(Point(e.x, e.y), "left")
 
     def _onRightClick(self, e):
         self.mouseX = e.x
         self.mouseY = e.y
         self.mouseButton = "right"
         if self._mouseCallback:
-            self._mouseCallback(Point(e.x, e.y))
+            self._mouseCallback(Point(e.x, e.y), "right")
 
     def addItem(self, item):
         self.items.append(item)
@@ -510,7 +537,7 @@ class GraphicsObject:
         self.id = self._draw(graphwin, self.config)
         graphwin.addItem(self)
         if graphwin.autoflush:
-            _root.update()
+            _get_root().update()
         return self
 
     def undraw(self):
@@ -523,7 +550,7 @@ class GraphicsObject:
             self.canvas.delete(self.id)
             self.canvas.delItem(self)
             if self.canvas.autoflush:
-                _root.update()
+                _get_root().update()
         self.canvas = None
         self.id = None
 
@@ -543,7 +570,7 @@ class GraphicsObject:
                 y = dy
             self.canvas.move(self.id, x, y)
             if canvas.autoflush:
-                _root.update()
+                _get_root().update()
 
     def _reconfig(self, option, setting):
         # Internal method for changing configuration of the object
@@ -556,7 +583,7 @@ class GraphicsObject:
         if self.canvas and not self.canvas.isClosed():
             self.canvas.itemconfig(self.id, options)
             if self.canvas.autoflush:
-                _root.update()
+                _get_root().update()
 
     def _draw(self, canvas, options):
         """draws appropriate figure on canvas with options provided
@@ -815,7 +842,7 @@ class Entry(GraphicsObject):
         self.anchor = p.clone()
         # print self.anchor
         self.width = width
-        self.text = tk.StringVar(_root)
+        self.text = tk.StringVar(_get_root())
         self.text.set("")
         self.fill = "gray"
         self.color = "black"
@@ -902,15 +929,26 @@ class Image(GraphicsObject):
 
     idCount = 0
     imageCache = {}  # tk photoimages go here to avoid GC while drawn
+    photoCache = {}  # resized tk photoimages shared by every Image of the same (file, width, height)
 
     def __init__(self, p, pixmap, width, height):
         GraphicsObject.__init__(self, [])
         self.anchor = p.clone()
         self.imageId = Image.idCount
         Image.idCount = Image.idCount + 1
-
-        photo_image = tk.PhotoImage(file=pixmap, master=_root)
-        self.img = photo_image.subsample(int(photo_image.width() / width), int(photo_image.height() / height))
+        self.img = Image.getPhotoImage(pixmap, width, height)
+
+    @staticmethod
+    def getPhotoImage(pixmap, width, height):
+        """Return the PhotoImage for the given file resized to width x height,
+        decoding the file only the first time that size is requested"""
+        key = (pixmap, width, height)
+        if key not in Image.photoCache:
+            photo_image = tk.PhotoImage(file=pixmap, master=_get_root())
+            Image.photoCache[key] = photo_image.subsample(
+                int(photo_image.width() / width), int(photo_image.height() / height)
+            )
+        return Image.photoCache[key]
 
     def __repr__(self):
         return "Image({}, {}, {})".format(self.anchor, self.getWidth(), self.getHeight())
@@ -1029,11 +1067,5 @@ def test():
     win.close()
 
 
-# MacOS fix 2
-# tk.Toplevel(_root).destroy()
-
-# MacOS fix 1
-update()
-
 if __name__ == "__main__":
     test()
@@ -0,0 +1,88 @@
+import random
+from array import array
+import pytest
+from GameController import create_minesweeper_board
+from GameServer import get_tile_state
+from Minesweeper.BoardBatch import BoardBatch
+from Minesweeper.MinesweeperTile import Tile
+from PlayerStats import PlayerStats
+
+NUM_BOARDS = 6
+
+
+def make_board_move(minesweeper_board, move) -> tuple[bool, bool]:
+    """
+    Make a move on a regular board the way a batch does, returning whether the game ended and whether it was won.
+    """
+
+    mouse_button, row, col = move
+    if mouse_button == "right":
+        minesweeper_board.plant_flag_on_tile(row, col)
+        return False, False
+    tile = minesweeper_board.make_move(row, col)
+    if tile.type == Tile.MINE:
+        minesweeper_board.reveal_all_tiles()
+        return True, False
+    return minesweeper_board.board_finished(), minesweeper_board.board_finished()
+
+
+def get_random_move(rng, minesweeper_board) -> tuple[str, int, int]:
+    hidden_tiles = [
+        (row, col)
+        for row in range(minesweeper_board.board_height)
+        for col in range(minesweeper_board.board_width)
+        if not minesweeper_board.board[row][col].revealed
+    ]
+    row, col = rng.choice(hidden_tiles)
+    return "right" if rng.random() < 0.3 else "left", row, col
+
+
+@pytest.mark.parametrize("version", ("Minesweeper", "Minesweeper V"))
+@pytest.mark.parametrize("seed", range(4))
+def test_batch_matches_regular_boards(version, seed):
+    width, height, num_mines = 12, 10, 20
+    seeds = [seed * NUM_BOARDS + board_number for board_number in range(NUM_BOARDS)]
+    batch = BoardBatch(NUM_BOARDS, width, height, num_mines, version, seeds=seeds)
+    minesweeper_boards = []
+    for board_seed in seeds:
+        minesweeper_board = create_minesweeper_board(width, height, num_mines, version, "medium", PlayerStats())
+        minesweeper_board.rng.seed(board_seed)
+        minesweeper_boards.append(minesweeper_board)
+
+    rng = random.Random(seed)
+    generated = [False] * NUM_BOARDS
+    game_over = [False] * NUM_BOARDS
+    won = [False] * NUM_BOARDS
+    for _ in range(40):
+        moves = []
+        for board_number, minesweeper_board in enumerate(minesweeper_boards):
+            # some boards sit a step out, and each board's first move is a reveal, which generates it
+            if game_over[board_number] or rng.random() < 0.2:
+                moves.append(None)
+                continue
+            if not generated[board_number]:
+                move = ("left", rng.randrange(height), rng.randrange(width))
+                minesweeper_board.board = minesweeper_board.get_random_board(move[1:])
+                generated[board_number] = True
+            else:
+                move = get_random_move(rng, minesweeper_board)
+            game_over[board_number], won[board_number] = make_board_move(minesweeper_board, move)
+            moves.append(move)
+        batch.step(moves)
+
+        assert batch.game_over == game_over
+        assert batch.won == won
+        revealed, flags, mines, values = batch.get_planes()
+        values = array("b", values)
+        for board_number, minesweeper_board in enumerate(minesweeper_boards):
+            tiles = [tile for tile_row in minesweeper_board.board for tile in tile_row]
+            assert batch.get_visible_board(board_number) == [
+                [get_tile_state(tile) for tile in tile_row] for tile_row in minesweeper_board.board
+            ]
+
+            board_tiles = slice(board_number * width * height, (board_number + 1) * width * height)
+            assert list(revealed[board_tiles]) == [tile.revealed for tile in tiles]
+            assert list(flags[board_tiles]) == [tile.flag_planted and not tile.revealed for tile in tiles]
+            assert list(mines[board_tiles]) == [tile.revealed and tile.type == Tile.MINE for tile in tiles]
+            assert list(values[board_tiles]) == [tile.value if tile.type == Tile.NUMBERED else 0 for tile in tiles]
+    assert any(game_over)
@@ -0,0 +1,23 @@
+import pytest
+from GameHistory import GameHistory, get_density_range
+
+
+@pytest.mark.parametrize(
+    "num_mines, density_range",
+    [(15, 3), (35, 7), (5, 1), (4, 0), (100, 20)],
+)
+def test_density_range_on_range_edges(num_mines, density_range):
+    assert get_density_range(10, 10, num_mines) == density_range
+
+
+def test_win_rate_by_density_on_range_edges(tmp_path):
+    history = GameHistory(str(tmp_path / "history"))
+    history.add_game("Minesweeper", "", 10, 10, 15, 30.0, True, 85)
+    history.add_game("Minesweeper", "", 10, 10, 35, 40.0, False, 12)
+    history.add_game("Minesweeper", "", 10, 10, 14, 50.0, False, 3)
+    assert history.win_rate_by_density() == {0.1: 0.0, 0.15: 1.0, 0.35: 0.0}
+
+    # loading the games back from the file adds them up all at once, which has to put them in the same ranges
+    loaded_history = GameHistory(str(tmp_path / "history"))
+    loaded_history.load_history()
+    assert loaded_history.win_rate_by_density() == {0.1: 0.0, 0.15: 1.0, 0.35: 0.0}
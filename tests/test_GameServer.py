@@ -0,0 +1,52 @@
+import asyncio
+import pytest
+from GameServer import GameServer, MAX_BOARD_TILES
+
+
+def create_session(*settings):
+    async def create():
+        return await GameServer(port=0).create_session(*settings)
+
+    return asyncio.run(create())
+
+
+@pytest.mark.parametrize(
+    "width, height, num_mines, version",
+    [
+        (0, 16, 10, "Minesweeper"),
+        (MAX_BOARD_TILES, 2, 10, "Minesweeper"),
+        (16, 16, 16 * 16 - 8, "Minesweeper"),
+        (16, 16, 16 * 16 - 24, "Minesweeper V"),
+        (3, 3, 1, "Minesweeper"),
+        (16, 16, -1, "Minesweeper"),
+    ],
+)
+def test_create_session_rejects_invalid_settings(width, height, num_mines, version):
+    with pytest.raises(Exception, match="Invalid board size or number of mines"):
+        create_session(width, height, num_mines, version, "medium")
+
+
+@pytest.mark.parametrize(
+    "width, height, num_mines, version, first_click",
+    [
+        (16, 16, 16 * 16 - 9, "Minesweeper", (8, 8)),
+        (16, 16, 16 * 16 - 25, "Minesweeper V", (8, 8)),
+        (4, 4, 0, "Minesweeper V", (0, 0)),
+        (200, 100, 4000, "Minesweeper", (50, 50)),
+    ],
+)
+def test_create_session_accepts_most_mines(width, height, num_mines, version, first_click):
+    session = create_session(width, height, num_mines, version, "medium")
+    changed_tiles = session.make_move(*first_click, "left")
+    assert first_click in changed_tiles
+
+
+def test_sessions_print_nothing(capsys):
+    session = create_session(9, 9, 70, "Minesweeper", "medium")
+    session.make_move(4, 4, "left")
+    for row in range(9):
+        for col in range(9):
+            if session.controller.game_running:
+                session.make_move(row, col, "left")
+    assert not session.controller.game_running
+    assert capsys.readouterr().out == ""
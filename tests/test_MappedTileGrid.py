@@ -0,0 +1,139 @@
+import random
+import pytest
+from GameController import create_minesweeper_board
+from Minesweeper.BoardSnapshot import load_mapped_board
+from Minesweeper.MappedTileGrid import MappedTileGrid
+from Minesweeper.MinesweeperBoard import MinesweeperBoard
+from Minesweeper.MinesweeperTile import Tile
+from PlayerStats import PlayerStats
+
+
+def check_numbering(grid, reach):
+    for row in range(grid.height):
+        for col in range(grid.width):
+            tile = grid[row][col]
+            if tile.type in (Tile.MINE, Tile.NEGATIVE_MINE):
+                continue
+            value = 0
+            for surrounding_row in range(max(row - reach, 0), min(row + reach + 1, grid.height)):
+                for surrounding_col in range(max(col - reach, 0), min(col + reach + 1, grid.width)):
+                    surrounding_type = grid[surrounding_row][surrounding_col].type
+                    value += (surrounding_type == Tile.MINE) - (surrounding_type == Tile.NEGATIVE_MINE)
+            assert tile.value == value
+            near_mine = any(
+                grid[surrounding_row][surrounding_col].type in (Tile.MINE, Tile.NEGATIVE_MINE)
+                for surrounding_row in range(max(row - reach, 0), min(row + reach + 1, grid.height))
+                for surrounding_col in range(max(col - reach, 0), min(col + reach + 1, grid.width))
+            )
+            assert tile.type == (Tile.NUMBERED if near_mine else Tile.EMPTY)
+
+
+@pytest.mark.parametrize(
+    "num_mines, num_negative_mines, safe_distance, reach",
+    [(40, 0, 1, 1), (30, 10, 1, 1), (200, 0, 1, 1), (150, 60, 1, 1), (60, 160, 1, 1), (100, 0, 2, 2), (0, 0, 1, 1)],
+)
+def test_place_random_mines(tmp_path, num_mines, num_negative_mines, safe_distance, reach):
+    grid = MappedTileGrid(str(tmp_path / "grid"), 16, 15)
+    grid.place_random_mines(random.Random(0), num_mines, num_negative_mines, (0, 5), safe_distance, reach)
+
+    assert len(list(grid.find_tiles(Tile.MINE))) == num_mines
+    assert len(list(grid.find_tiles(Tile.NEGATIVE_MINE))) == num_negative_mines
+    for row in range(0, safe_distance + 1):
+        for col in range(5 - safe_distance, 5 + safe_distance + 1):
+            assert grid[row][col].type not in (Tile.MINE, Tile.NEGATIVE_MINE)
+    assert grid.num_unfinished_tiles == 16 * 15
+    check_numbering(grid, reach)
+
+
+def test_place_random_mines_rejects_too_many_mines(tmp_path):
+    grid = MappedTileGrid(str(tmp_path / "grid"), 16, 15)
+    with pytest.raises(Exception, match="Too many mines"):
+        grid.place_random_mines(random.Random(0), 16 * 15 - 9 + 1, 0, (8, 8))
+
+
+@pytest.mark.parametrize("version", ("Minesweeper", "Minesweeper V", "Negative Minesweeper"))
+def test_mapped_board_never_lists_mines(tmp_path, monkeypatch, version):
+    def list_mine_locations(*args, **kwargs):
+        raise AssertionError("every mine location was listed in memory")
+
+    monkeypatch.setattr(MinesweeperBoard, "_get_mine_locations", list_mine_locations)
+    minesweeper_board = create_minesweeper_board(20, 20, 60, version, "medium", PlayerStats())
+    minesweeper_board.board = MappedTileGrid(str(tmp_path / "grid"), 20, 20)
+    minesweeper_board.rng.seed(0)
+    minesweeper_board.board = minesweeper_board.get_random_board((10, 10))
+    assert minesweeper_board.make_move(10, 10).type == Tile.EMPTY
+
+
+def get_tile_states(board):
+    return [[(tile.type, tile.value, tile.revealed, tile.flag_planted) for tile in tile_row] for tile_row in board]
+
+
+@pytest.mark.parametrize("version", ("Distance Minesweeper", "Weighted Minesweeper"))
+def test_float_boards_on_default_grid(tmp_path, version):
+    minesweeper_board = create_minesweeper_board(12, 10, 15, version, "medium", PlayerStats())
+    minesweeper_board.board = MappedTileGrid(str(tmp_path / "grid"), 12, 10)
+    minesweeper_board.rng.seed(0)
+    minesweeper_board.board = minesweeper_board.get_random_board((5, 5))
+    assert minesweeper_board.board.float_values
+
+    regular_board = create_minesweeper_board(12, 10, 15, version, "medium", PlayerStats())
+    regular_board.rng.seed(0)
+    regular_board.board = regular_board.get_random_board((5, 5))
+    assert get_tile_states(minesweeper_board.board) == get_tile_states(regular_board.board)
+
+    # generating the board stored its settings in the grid, in place of the default ones
+    minesweeper_board.board.close()
+    resumed_board, board_generated = load_mapped_board(str(tmp_path / "grid"))
+    assert board_generated
+    assert resumed_board.minesweeper_version == version
+    assert resumed_board.distance_weight == minesweeper_board.distance_weight
+    assert get_tile_states(resumed_board.board) == get_tile_states(regular_board.board)
+    resumed_board.board.close()
+
+
+@pytest.mark.parametrize(
+    "version, difficulty",
+    [
+        ("Minesweeper", "medium"),
+        ("Minesweeper V", "medium"),
+        ("Distance Minesweeper", "easy"),
+        ("Weighted Minesweeper", "hard"),
+        ("Negative Minesweeper", "hard"),
+    ],
+)
+def test_load_mapped_board(tmp_path, version, difficulty):
+    file_name = str(tmp_path / "grid")
+    minesweeper_board = create_minesweeper_board(12, 10, 15, version, difficulty, PlayerStats())
+    minesweeper_board.board = MappedTileGrid(
+        file_name,
+        12,
+        10,
+        version,
+        15,
+        getattr(minesweeper_board, "num_negative_mines", 0),
+        getattr(minesweeper_board, "distance_weight", 0),
+    )
+    minesweeper_board.plant_flag_on_tile(0, 0)
+    minesweeper_board.board.close()
+
+    # before the first move, the board is picked back up as not generated yet, with its flags
+    loaded_board, board_generated = load_mapped_board(file_name)
+    assert not board_generated
+    assert loaded_board.board[0][0].flag_planted
+
+    loaded_board.rng.seed(0)
+    loaded_board.board = loaded_board.get_random_board((5, 5))
+    loaded_board.make_move(5, 5)
+    loaded_board.plant_flag_on_tile(9, 11)
+    tile_states = get_tile_states(loaded_board.board)
+    loaded_board.board.close()
+
+    resumed_board, board_generated = load_mapped_board(file_name)
+    assert board_generated
+    assert type(resumed_board) is type(minesweeper_board)
+    for setting in ("minesweeper_version", "board_width", "board_height", "num_mines"):
+        assert getattr(resumed_board, setting) == getattr(minesweeper_board, setting)
+    for setting in ("num_negative_mines", "distance_weight"):
+        assert getattr(resumed_board, setting, None) == getattr(minesweeper_board, setting, None)
+    assert get_tile_states(resumed_board.board) == tile_states
+    resumed_board.board.close()
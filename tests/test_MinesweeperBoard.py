@@ -0,0 +1,135 @@
+import copy
+import random
+import pytest
+from GameController import create_minesweeper_board
+from Minesweeper.MinesweeperTile import Tile
+from PlayerStats import PlayerStats
+
+VERSIONS = ("Minesweeper", "Minesweeper V", "Distance Minesweeper", "Weighted Minesweeper", "Negative Minesweeper")
+
+
+def generate_board(version, seed, first_click=(8, 8), width=16, height=16, num_mines=40):
+    minesweeper_board = create_minesweeper_board(width, height, num_mines, version, "medium", PlayerStats())
+    minesweeper_board.rng.seed(seed)
+    minesweeper_board.board = minesweeper_board.get_random_board(first_click)
+    return minesweeper_board
+
+
+def get_surrounding_tiles(minesweeper_board, row, col, reach=None):
+    if reach is None:
+        reach = minesweeper_board.chord_reach
+    return [
+        (surrounding_row, surrounding_col)
+        for surrounding_row in range(max(row - reach, 0), min(row + reach + 1, minesweeper_board.board_height))
+        for surrounding_col in range(max(col - reach, 0), min(col + reach + 1, minesweeper_board.board_width))
+        if (surrounding_row, surrounding_col) != (row, col)
+    ]
+
+
+@pytest.mark.parametrize("version", ("Minesweeper", "Minesweeper V"))
+@pytest.mark.parametrize("seed", range(10))
+def test_chord_reveals_around_flagged_number(version, seed):
+    minesweeper_board = generate_board(version, seed)
+    minesweeper_board.make_move(8, 8)
+
+    num_chorded = 0
+    for row in range(minesweeper_board.board_height):
+        for col in range(minesweeper_board.board_width):
+            tile = minesweeper_board.board[row][col]
+            if not tile.revealed or tile.type != Tile.NUMBERED:
+                continue
+
+            # flag every mine around the number, which brings its value down to 0
+            surrounding_tiles = get_surrounding_tiles(minesweeper_board, row, col)
+            for surrounding_row, surrounding_col in surrounding_tiles:
+                surrounding_tile = minesweeper_board.board[surrounding_row][surrounding_col]
+                if surrounding_tile.type == Tile.MINE and not surrounding_tile.flag_planted:
+                    minesweeper_board.plant_flag_on_tile(surrounding_row, surrounding_col)
+            assert tile.value == 0
+
+            activated_tiles = minesweeper_board.chord(row, col)
+            assert all(activated_tile.type != Tile.MINE for activated_tile in activated_tiles)
+            for surrounding_row, surrounding_col in surrounding_tiles:
+                surrounding_tile = minesweeper_board.board[surrounding_row][surrounding_col]
+                assert surrounding_tile.revealed or surrounding_tile.flag_planted
+            num_chorded += bool(activated_tiles)
+    assert num_chorded > 0
+
+
+@pytest.mark.parametrize("version", VERSIONS)
+@pytest.mark.parametrize("seed", range(10))
+def test_chord_without_flags_reveals_nothing(version, seed):
+    minesweeper_board = generate_board(version, seed)
+    minesweeper_board.make_move(8, 8)
+    num_revealed = minesweeper_board.num_tiles_revealed
+
+    # no flags are planted, so no number can be chorded (in Negative Minesweeper, positive and negative mines next to a
+    # tile can cancel its value out to 0 without any flags)
+    for row in range(minesweeper_board.board_height):
+        for col in range(minesweeper_board.board_width):
+            if minesweeper_board.board[row][col].revealed:
+                assert minesweeper_board.chord(row, col) == []
+    assert minesweeper_board.num_tiles_revealed == num_revealed
+
+
+def get_tile_state(tile):
+    return tile.type, tile.value, tile.revealed, tile.flag_planted
+
+
+@pytest.mark.parametrize("version", VERSIONS)
+@pytest.mark.parametrize("seed", range(10))
+def test_make_moves_matches_make_move(version, seed):
+    batched_board = generate_board(version, seed)
+    sequential_board = generate_board(version, seed)
+    batched_board.stats = PlayerStats(copy.deepcopy(PlayerStats.starting_player_stats))
+    sequential_board.stats = PlayerStats(copy.deepcopy(PlayerStats.starting_player_stats))
+    rng = random.Random(seed)
+
+    for _ in range(20):
+        # flags are planted on both boards, so some of the moves land on flags and are skipped
+        for _ in range(2):
+            flag_coords = (rng.randrange(16), rng.randrange(16))
+            batched_board.plant_flag_on_tile(*flag_coords)
+            sequential_board.plant_flag_on_tile(*flag_coords)
+
+        # a few of the moves are off the board, and some are repeated
+        coords = [(rng.randrange(-1, 17), rng.randrange(-1, 17)) for _ in range(rng.randrange(1, 6))]
+        coords += rng.sample(coords, len(coords) // 2)
+
+        activated_tiles = batched_board.make_moves(coords)
+        changed_tiles = set()
+        sequential_tiles = []
+        for row, col in coords:
+            if not 0 <= row < 16 or not 0 <= col < 16 or sequential_board.board[row][col].flag_planted:
+                continue
+            sequential_tiles.append(sequential_board.make_move(row, col))
+            changed_tiles.update(sequential_board.changed_tiles)
+            if sequential_tiles[-1].type in (Tile.MINE, Tile.NEGATIVE_MINE):
+                break
+
+        assert list(map(get_tile_state, activated_tiles)) == list(map(get_tile_state, sequential_tiles))
+        assert set(batched_board.changed_tiles) == changed_tiles
+        assert len(batched_board.changed_tiles) == len(changed_tiles)
+        for batched_row, sequential_row in zip(batched_board.board, sequential_board.board):
+            assert list(map(get_tile_state, batched_row)) == list(map(get_tile_state, sequential_row))
+        assert batched_board.num_tiles_revealed == sequential_board.num_tiles_revealed
+        assert batched_board.stats.get_stat(version) == sequential_board.stats.get_stat(version)
+        if any(tile.type in (Tile.MINE, Tile.NEGATIVE_MINE) for tile in activated_tiles):
+            return
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_negative_board_numbering(seed):
+    minesweeper_board = generate_board("Negative Minesweeper", seed)
+    board = minesweeper_board.board
+    for row in range(minesweeper_board.board_height):
+        for col in range(minesweeper_board.board_width):
+            if board[row][col].type in (Tile.MINE, Tile.NEGATIVE_MINE):
+                continue
+            surrounding_types = [
+                board[surrounding_row][surrounding_col].type
+                for surrounding_row, surrounding_col in get_surrounding_tiles(minesweeper_board, row, col, reach=1)
+            ]
+            assert board[row][col].value == surrounding_types.count(Tile.MINE) - surrounding_types.count(
+                Tile.NEGATIVE_MINE
+            )
@@ -0,0 +1,55 @@
+import random
+import pytest
+from MinesweeperEnv import MinesweeperEnv, VectorMinesweeperEnv
+
+NUM_ENVS = 5
+
+
+@pytest.mark.parametrize("version", ("Minesweeper", "Minesweeper V"))
+@pytest.mark.parametrize("seed", range(4))
+def test_batched_vector_env_matches_single_envs(version, seed):
+    width, height, num_mines = 8, 7, 9
+    vector_env = VectorMinesweeperEnv(NUM_ENVS, width, height, num_mines, version)
+    assert vector_env.batch is not None
+    envs = [MinesweeperEnv(width, height, num_mines, version) for _ in range(NUM_ENVS)]
+
+    # the single environments are seeded just as the vector environment seeds each new game
+    seed_rng = random.Random(seed)
+    vector_env.reset(seed)
+    observations = []
+    for env in envs:
+        observations.extend(env.reset(seed_rng.getrandbits(64)).tolist())
+    assert vector_env.observations.tolist() == observations
+
+    action_rng = random.Random(seed)
+    num_games_ended = 0
+    for _ in range(150):
+        actions = [action_rng.randrange(2 * width * height) for _ in range(NUM_ENVS)]
+        vector_observations, vector_rewards, vector_dones, vector_infos = vector_env.step(actions)
+
+        observations = []
+        for env_number, (env, action) in enumerate(zip(envs, actions)):
+            observation, reward, done, info = env.step(action)
+            assert vector_rewards[env_number] == pytest.approx(reward)
+            assert vector_dones[env_number] == done
+            final_observation = vector_infos[env_number].pop("final_observation", None)
+            assert vector_infos[env_number] == info
+            if done:
+                assert final_observation.tolist() == observation.tolist()
+                observation = env.reset(seed_rng.getrandbits(64))
+                num_games_ended += 1
+            observations.extend(observation.tolist())
+        assert vector_observations.tolist() == observations
+    assert num_games_ended > 0
+
+
+@pytest.mark.parametrize("version", ("Minesweeper", "Distance Minesweeper"))
+@pytest.mark.parametrize("invalid_action", (-1, 2 * 8 * 7))
+def test_vector_env_rejects_invalid_actions(version, invalid_action):
+    vector_env = VectorMinesweeperEnv(2, 8, 7, 9, version)
+    observations = vector_env.reset(0)
+    blank_observations = observations.tolist()
+    with pytest.raises(Exception, match="Invalid action"):
+        vector_env.step([0, invalid_action])
+    if vector_env.batch is not None:
+        assert observations.tolist() == blank_observations
@@ -0,0 +1,43 @@
+import time
+from PlayerStats import PlayerStats, TILES_REVEALED
+from StatsWriter import StatsWriter
+
+
+class FailingStats(PlayerStats):
+    """
+    Stats whose journal can't be written to until `failing` is turned off.
+    """
+
+    def __init__(self):
+        super().__init__(PlayerStats.starting_player_stats)
+        self.failing = True
+        self.journaled = []
+
+    def journal_increments(self, increments):
+        if self.failing:
+            raise OSError("disk full")
+        self.journaled.append(increments)
+
+
+def wait_for(condition):
+    deadline = time.monotonic() + 5
+    while not condition():
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+
+
+def test_failed_background_saves_are_kept_for_the_owner(capsys):
+    stats = FailingStats()
+    stats_writer = StatsWriter(stats, flush_interval=0.01)
+    stats.increment_stat("Minesweeper", TILES_REVEALED, 5)
+    stats_writer.save()
+
+    wait_for(lambda: stats_writer.last_error is not None)
+    assert str(stats_writer.last_error) == "disk full"
+    assert capsys.readouterr().out == ""
+
+    # the increments are kept and written out once the journal can be written to again
+    stats.failing = False
+    wait_for(lambda: stats_writer.last_error is None and stats.journaled)
+    stats_writer.close()
+    assert stats.journaled[0] == {("Minesweeper", TILES_REVEALED): 5}
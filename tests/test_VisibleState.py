@@ -0,0 +1,98 @@
+import random
+import pytest
+from GameController import create_minesweeper_board
+from Minesweeper.MappedTileGrid import MappedTileGrid
+from Minesweeper.MinesweeperTile import Tile
+from PlayerStats import PlayerStats
+
+VERSIONS = ("Minesweeper", "Minesweeper V", "Distance Minesweeper", "Weighted Minesweeper", "Negative Minesweeper")
+MAPPED_VERSIONS = ("Minesweeper", "Minesweeper V", "Negative Minesweeper")
+
+
+def check_visible_state(minesweeper_board):
+    visible_state = minesweeper_board.visible_state
+    for row in range(minesweeper_board.board_height):
+        for col in range(minesweeper_board.board_width):
+            tile = minesweeper_board.board[row][col]
+            assert visible_state.revealed_view[row, col] == tile.revealed
+            assert visible_state.flags_view[row, col] == (0 if tile.revealed else tile.flag_planted)
+            assert visible_state.mines_view[row, col] == (
+                (tile.type == Tile.MINE) + 2 * (tile.type == Tile.NEGATIVE_MINE) if tile.revealed else 0
+            )
+            assert visible_state.values_view[row, col] == (tile.value if tile.revealed else 0)
+
+
+def play_random_game(minesweeper_board, seed):
+    """
+    Play random reveals, flags and chords on a board until the game ends, checking its visible state after every move.
+    """
+
+    rng = random.Random(seed)
+    minesweeper_board.rng.seed(seed)
+    visible_state = minesweeper_board.track_visible_state()
+    width, height = minesweeper_board.board_width, minesweeper_board.board_height
+
+    # flags planted before the first reveal are cleared along with the rest of the board when it's generated
+    minesweeper_board.plant_flag_on_tile(0, 0)
+    check_visible_state(minesweeper_board)
+    first_click = (rng.randrange(height), rng.randrange(width))
+    minesweeper_board.board = minesweeper_board.get_random_board(first_click)
+    assert minesweeper_board.visible_state is visible_state
+    check_visible_state(minesweeper_board)
+
+    activated_tiles = [minesweeper_board.make_move(*first_click)]
+    check_visible_state(minesweeper_board)
+
+    # flagging the same tile twice takes the flag off again, or swaps it for a negative flag in Negative Minesweeper
+    hidden_tile = next(
+        (row, col) for row in range(height) for col in range(width) if not minesweeper_board.board[row][col].revealed
+    )
+    for _ in range(2):
+        minesweeper_board.plant_flag_on_tile(*hidden_tile)
+        check_visible_state(minesweeper_board)
+
+    for _ in range(200):
+        if any(tile.type in (Tile.MINE, Tile.NEGATIVE_MINE) for tile in activated_tiles):
+            minesweeper_board.reveal_all_tiles()
+            check_visible_state(minesweeper_board)
+            return
+        if minesweeper_board.board_finished():
+            return
+
+        row, col = rng.randrange(height), rng.randrange(width)
+        move = rng.random()
+        if move < 0.3:
+            minesweeper_board.plant_flag_on_tile(row, col)
+            activated_tiles = []
+        elif move < 0.4:
+            activated_tiles = minesweeper_board.chord(row, col)
+        elif move < 0.5:
+            activated_tiles = minesweeper_board.make_moves([(row, col), (rng.randrange(height), rng.randrange(width))])
+        else:
+            activated_tiles = [minesweeper_board.make_move(row, col)]
+        check_visible_state(minesweeper_board)
+
+
+@pytest.mark.parametrize("version", VERSIONS)
+@pytest.mark.parametrize("seed", range(4))
+def test_visible_state_matches_board(version, seed):
+    minesweeper_board = create_minesweeper_board(10, 9, 15, version, "medium", PlayerStats())
+    play_random_game(minesweeper_board, seed)
+
+
+@pytest.mark.parametrize("version", MAPPED_VERSIONS)
+@pytest.mark.parametrize("seed", range(4))
+def test_visible_state_matches_mapped_board(tmp_path, version, seed):
+    minesweeper_board = create_minesweeper_board(10, 9, 15, version, "medium", PlayerStats())
+    minesweeper_board.board = MappedTileGrid(str(tmp_path / "grid"), 10, 9)
+    play_random_game(minesweeper_board, seed)
+
+
+def test_visible_state_tracked_mid_game():
+    minesweeper_board = create_minesweeper_board(10, 9, 15, "Minesweeper", "medium", PlayerStats())
+    minesweeper_board.rng.seed(0)
+    minesweeper_board.board = minesweeper_board.get_random_board((4, 4))
+    minesweeper_board.make_move(4, 4)
+    minesweeper_board.plant_flag_on_tile(0, 0)
+    minesweeper_board.track_visible_state()
+    check_visible_state(minesweeper_board)